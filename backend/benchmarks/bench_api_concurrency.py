@@ -0,0 +1,93 @@
+"""
+API 동시성 벤치마크.
+
+실행 중인 API 서버에 조회 엔드포인트 요청을 동시에 보내
+동시성 단계별 처리량(req/s)과 지연시간(p50/p95/p99)을 측정합니다.
+동기 세션(get_db) ↔ 비동기 세션(get_async_db) 전환 전후 비교용.
+
+사용법:
+    uvicorn main:app --workers 1 --port 8000
+    python benchmarks/bench_api_concurrency.py --base-url http://localhost:8000 \\
+        --concurrency 1,16,64,256 --duration 15
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/complexes/?limit=50",
+    "/api/complexes/region-counts",
+    "/api/runs/?limit=50",
+    "/api/data/kb-prices?limit=100",
+    "/api/data/listings?limit=100",
+    "/api/jobs/",
+    "/api/batches/",
+]
+
+
+async def _worker(client: httpx.AsyncClient, paths: List[str], deadline: float, stats: Dict[str, list]):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            resp = await client.get(path)
+            ok = resp.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - start
+        stats["latency" if ok else "errors"].append(elapsed)
+
+
+async def run_level(base_url: str, paths: List[str], concurrency: int, duration: float) -> Dict[str, float]:
+    """동시성 한 단계 측정"""
+    stats: Dict[str, list] = {"latency": [], "errors": []}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*[_worker(client, paths, deadline, stats) for _ in range(concurrency)])
+        wall = time.perf_counter() - started
+
+    lat = sorted(stats["latency"])
+    if not lat:
+        return {"concurrency": concurrency, "rps": 0.0, "errors": len(stats["errors"])}
+
+    def pct(p: float) -> float:
+        return lat[min(len(lat) - 1, int(len(lat) * p))] * 1000
+
+    return {
+        "concurrency": concurrency,
+        "rps": len(lat) / wall,
+        "p50_ms": statistics.median(lat) * 1000,
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "errors": len(stats["errors"]),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="API concurrency benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", default="1,16,64,256", help="쉼표로 구분한 동시 요청 수")
+    parser.add_argument("--duration", type=float, default=15.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--path", action="append", help="측정할 경로 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    print(f"{'conc':>6} {'req/s':>10} {'p50(ms)':>10} {'p95(ms)':>10} {'p99(ms)':>10} {'errors':>8}")
+    for level in [int(c) for c in args.concurrency.split(",")]:
+        r = await run_level(args.base_url, paths, level, args.duration)
+        print(
+            f"{r['concurrency']:>6} {r['rps']:>10.1f} {r.get('p50_ms', 0):>10.1f} "
+            f"{r.get('p95_ms', 0):>10.1f} {r.get('p99_ms', 0):>10.1f} {r['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+"""
+단지 검색 벤치마크.
+
+별도 스키마(bench_search)에 complexes 테이블을 만들고 합성 단지를 적재한 뒤
+검색 방식별 지연시간(p50/p95)을 측정합니다.
+
+- contains (seqscan): 부분일치 조건을 trigram 인덱스 없이 실행 (인덱스 생성 전)
+- contains (trgm):    같은 조건을 trigram 인덱스로 실행
+- ranked:             부분일치 + 단어 유사도 후보(상한 complex_search_ranked_candidates)를 유사도 순 정렬
+
+사용법:
+    python benchmarks/bench_complex_search.py --rows 100000 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import MetaData, select, text  # noqa: E402
+
+from core.database import engine  # noqa: E402
+from models import Complex  # noqa: E402
+from core.config import settings  # noqa: E402
+from services.complex_search import (  # noqa: E402
+    contains_filter,
+    ranked_query,
+    trgm_index_statements,
+)
+
+SCHEMA = "bench_search"
+
+BRANDS = ["래미안", "자이", "힐스테이트", "푸르지오", "아이파크", "e편한세상", "롯데캐슬", "더샵", "센트레빌", "SK뷰"]
+SUFFIXES = ["", "퍼스티지", "센트럴", "리버파크", "파크뷰", "에듀포레", "레이크", "그랜드"]
+REGIONS = [
+    ("11680", "서울특별시 강남구", ["대치동", "개포동", "도곡동", "삼성동", "역삼동"]),
+    ("11650", "서울특별시 서초구", ["반포동", "잠원동", "서초동", "방배동"]),
+    ("11710", "서울특별시 송파구", ["잠실동", "가락동", "문정동", "신천동"]),
+    ("41135", "경기도 성남시 분당구", ["정자동", "수내동", "서현동", "이매동"]),
+    ("26350", "부산광역시 해운대구", ["우동", "중동", "좌동", "재송동"]),
+]
+
+# (검색어, 설명)
+QUERIES = [
+    ("래미안", "브랜드"),
+    ("대치동", "동 이름"),
+    ("반포 자이", "단어 조합"),
+    ("힐스테잇", "오타"),
+    ("푸르지오 리버", "부분일치"),
+    ("41135", "지역코드"),
+]
+
+
+def seed(rows: int):
+    """bench_search.complexes 생성 및 합성 데이터 적재"""
+    metadata = MetaData(schema=SCHEMA)
+    table = Complex.__table__.to_metadata(metadata)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        # trigram 인덱스는 적재 후 생성
+        table.create(conn, checkfirst=True)
+
+        rng = random.Random(42)
+        batch = []
+        for i in range(rows):
+            code, sigungu, dongs = rng.choice(REGIONS)
+            dong = rng.choice(dongs)
+            name = f"{dong.rstrip('동')}{rng.choice(BRANDS)}{rng.choice(SUFFIXES)}{'' if i % 3 else f' {i % 9 + 1}차'}"
+            batch.append({
+                "name": name,
+                "address": f"{sigungu} {dong} {rng.randint(1, 999)}",
+                "region_code": f"{code}{rng.randint(10100, 11000)}",
+                "kb_complex_id": str(100000 + i),
+                "priority": "NORMAL",
+                "is_active": True,
+                "collect_listings": True,
+            })
+            if len(batch) == 5000:
+                conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(table.insert(), batch)
+    print(f"seeded {rows} complexes into {SCHEMA}.complexes")
+
+
+def create_trgm_indexes():
+    with engine.begin() as conn:
+        for statement in trgm_index_statements(f"{SCHEMA}.complexes"):
+            conn.execute(text(statement))
+        conn.execute(text(f"ANALYZE {SCHEMA}.complexes"))
+
+
+def measure(build: Callable[[str], object], repeat: int, setup_sql: List[str]) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with engine.connect() as conn:
+        for q, _ in QUERIES:
+            timings = []
+            found = 0
+            for _ in range(repeat):
+                with conn.begin():
+                    # ORM 모델(Complex)의 complexes 테이블이 벤치마크 스키마를 가리키도록
+                    conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}, public"))
+                    for sql in setup_sql:
+                        conn.execute(text(sql))
+                    start = time.perf_counter()
+                    found = len(conn.execute(build(q)).all())
+                    timings.append(time.perf_counter() - start)
+            timings.sort()
+            results[q] = {
+                "p50_ms": statistics.median(timings) * 1000,
+                "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+                "rows": found,
+            }
+    return results
+
+
+def contains_query(q: str):
+    return select(Complex.id, Complex.name).where(contains_filter(q)).order_by(Complex.name, Complex.id).limit(50)
+
+
+def ranked_search_query(q: str):
+    return (
+        ranked_query(q, settings.complex_search_ranked_candidates)
+        .with_only_columns(Complex.id, Complex.name)
+        .limit(50)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Complex search benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="측정 후 벤치마크 스키마 유지")
+    args = parser.parse_args()
+
+    seed(args.rows)
+    threshold = f"SELECT set_config('pg_trgm.word_similarity_threshold', '{settings.complex_search_similarity_threshold}', true)"
+    before = measure(contains_query, args.repeat, [])
+    create_trgm_indexes()
+    modes_results = [
+        ("contains (seqscan)", before),
+        ("contains (trgm)", measure(contains_query, args.repeat, [])),
+        ("ranked", measure(ranked_search_query, args.repeat, [threshold])),
+    ]
+
+    print(f"{'query':<16} {'mode':<20} {'p50(ms)':>10} {'p95(ms)':>10} {'rows':>6}")
+    for q, label in QUERIES:
+        for mode, results in modes_results:
+            r = results[q]
+            print(f"{q + ' (' + label + ')':<16} {mode:<20} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['rows']:>6}")
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
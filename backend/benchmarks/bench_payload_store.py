@@ -0,0 +1,185 @@
+"""
+원문 저장소 벤치마크.
+
+KB 응답 형태의 합성 원문으로 Run 여러 번을 저장하고,
+원문 JSON을 그대로 저장할 때와 저장소(해시 중복 제거 + zstd + 학습 사전)의 저장 바이트를 비교합니다.
+
+- 시세(kb_price): 면적별 응답, Run 간 대부분 동일 (월 단위 갱신)
+- 매물(kb_listing): 단지별 매물 목록, Run마다 일부 매물만 변경
+
+사용법:
+    python benchmarks/bench_payload_store.py --complexes 300 --runs 5
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, select  # noqa: E402
+
+from core.database import SessionLocal  # noqa: E402
+from models import CrawlRun, CrawlTask, PayloadDictionary, RawPayload, RunStatus, TaskStatus  # noqa: E402
+from services.payload_store import (  # noqa: E402
+    FilesystemBackend,
+    PayloadStore,
+    train_payload_dictionary,
+)
+
+ENDPOINTS = ("bench_kb_price", "bench_kb_listing")
+
+
+def price_payload(rng: random.Random, complex_id: int, area_idx: int, run_idx: int) -> dict:
+    base = 50000 + complex_id * 37 % 90000 + area_idx * 8000
+    months = 24 + run_idx // 4  # 월 1회 갱신 → 대부분의 Run은 동일 응답
+    return {
+        "dataHeader": {"resultCode": "10000", "message": "NO_ERROR"},
+        "dataBody": {
+            "resultCode": 11000,
+            "data": {
+                "단지기본일련번호": 100000 + complex_id,
+                "면적일련번호": 200000 + complex_id * 10 + area_idx,
+                "시세": [
+                    {
+                        "시세기준년월일": f"{2023 + m // 12}{m % 12 + 1:02d}01",
+                        "매매일반거래가": base + m * 150,
+                        "매매상한가": base + m * 150 + 4000,
+                        "매매하한가": base + m * 150 - 4000,
+                        "전세일반거래가": (base + m * 150) * 6 // 10,
+                        "전세상한가": (base + m * 150) * 6 // 10 + 2500,
+                        "전세하한가": (base + m * 150) * 6 // 10 - 2500,
+                        "월세보증금": 5000,
+                        "월세금액": 120 + m,
+                    }
+                    for m in range(months)
+                ],
+                "최근실거래가": {
+                    "계약년월일": "20240315",
+                    "거래금액": base + 3000,
+                    "거래층": str(2 + complex_id % 23),
+                },
+                "매매건수": 3 + complex_id % 7,
+                "전세건수": 2 + complex_id % 5,
+                "월세건수": complex_id % 4,
+            },
+        },
+    }
+
+
+def listing_payload(rng: random.Random, complex_id: int, run_idx: int) -> dict:
+    count = 5 + complex_id % 40
+    items = []
+    for i in range(count):
+        # Run마다 10% 정도의 매물이 교체됨
+        serial = 9000000 + complex_id * 1000 + i + (run_idx if i % 10 == 0 else 0)
+        items.append({
+            "매물일련번호": serial,
+            "매물거래구분명": "매매" if i % 3 else "전세",
+            "매매가": 80000 + (serial % 97) * 500,
+            "전세가": 45000 + (serial % 89) * 300,
+            "전용면적": f"{59 + (i % 4) * 25}.97",
+            "순전용면적": f"{59 + (i % 4) * 25}.97",
+            "해당층수": f"{serial % 25 + 1}/25",
+            "매물상태구분": "1",
+            "등록년월일": f"202403{serial % 28 + 1:02d}",
+            "중개업소명": f"{rng.choice(['한빛', '대한', '미래', '행복', '으뜸'])}공인중개사사무소",
+            "매물특징내용": "남향, 역세권, 올수리, 즉시입주 가능",
+        })
+    return {"propertyList": items, "총매물건수": count}
+
+
+def collect_run(rng: random.Random, complexes: int, run_idx: int):
+    for complex_id in range(1, complexes + 1):
+        for area_idx in range(1 + complex_id % 4):
+            yield ENDPOINTS[0], price_payload(rng, complex_id, area_idx, run_idx)
+        yield ENDPOINTS[1], listing_payload(rng, complex_id, run_idx)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw payload store benchmark")
+    parser.add_argument("--complexes", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-dict", action="store_true", help="사전 학습 생략")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_payloads_")
+    backend = FilesystemBackend(root)
+    db = SessionLocal()
+    run_ids = []
+    try:
+        print(f"{'run':>4} {'payloads':>9} {'naive JSON':>12} {'stored':>10} {'ratio':>8} {'flush(ms)':>10}")
+        total_naive = total_stored = 0
+        for run_idx in range(args.runs):
+            run = CrawlRun(status=RunStatus.SUCCESS, triggered_by="benchmark")
+            db.add(run)
+            db.commit()
+            run_ids.append(run.id)
+
+            store = PayloadStore(db, backend=backend)
+            naive = 0
+            flush_seconds = 0.0
+            rng = random.Random(run_idx)
+            for endpoint, payload in collect_run(rng, args.complexes, run_idx):
+                task = CrawlTask(run_id=run.id, task_key=endpoint, status=TaskStatus.SUCCESS)
+                db.add(task)
+                db.flush()
+                naive += len(json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"))
+                store.add(task.id, payload, endpoint=endpoint)
+                if len(store) >= 200:
+                    start = time.perf_counter()
+                    store.flush()
+                    flush_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            store.flush()
+            flush_seconds += time.perf_counter() - start
+
+            stored = db.scalar(
+                select(func.coalesce(func.sum(RawPayload.size_bytes), 0))
+                .join(CrawlTask, CrawlTask.id == RawPayload.task_id)
+                .where(CrawlTask.run_id == run.id)
+            )
+            payloads = db.scalar(
+                select(func.count(RawPayload.id))
+                .join(CrawlTask, CrawlTask.id == RawPayload.task_id)
+                .where(CrawlTask.run_id == run.id)
+            )
+            total_naive += naive
+            total_stored += stored
+            print(
+                f"{run_idx + 1:>4} {payloads:>9} {naive:>12,} {stored:>10,} "
+                f"{naive / max(stored, 1):>7.0f}x {flush_seconds * 1000:>10.0f}"
+            )
+
+            # 첫 Run 이후 엔드포인트별 사전 학습 → 이후 새 원문은 사전 압축
+            if run_idx == 0 and not args.no_dict:
+                for endpoint in ENDPOINTS:
+                    train_payload_dictionary(db, endpoint, dict_size=32768)
+
+        print(f"total: naive {total_naive:,} bytes, stored {total_stored:,} bytes "
+              f"({total_naive / max(total_stored, 1):.0f}x)")
+
+        # 복원 검증
+        sample = db.execute(
+            select(RawPayload.content_hash).order_by(RawPayload.id.desc()).limit(1)
+        ).scalar()
+        restored = PayloadStore(db, backend=backend).load(sample)
+        print(f"restore check: {sample[:12]}… → {type(restored).__name__} ok")
+    finally:
+        db.rollback()
+        task_ids = select(CrawlTask.id).where(CrawlTask.run_id.in_(run_ids))
+        db.execute(delete(RawPayload).where(RawPayload.task_id.in_(task_ids)))
+        db.execute(delete(CrawlTask).where(CrawlTask.run_id.in_(run_ids)))
+        db.execute(delete(CrawlRun).where(CrawlRun.id.in_(run_ids)))
+        db.execute(delete(PayloadDictionary).where(PayloadDictionary.endpoint.in_(ENDPOINTS)))
+        db.commit()
+        db.close()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,13 @@ from connectors.base import (
     BrowserError,
     PageLoadError,
     ElementNotFoundError,
+    CollectionCancelled,
 )
 from connectors.kb_base import KBBaseConnector
 from connectors.kb_price import KBPriceConnector
 from connectors.kb_listing import KBListingConnector
 from connectors.kb_transaction import KBTransactionConnector
+from connectors.kb_transaction_history import KBTransactionHistoryConnector
 from connectors.molit_transaction import MolitTransactionConnector
 from connectors.kb_endpoints import (
     COMPLEX_SEARCH,
@@ -21,6 +23,7 @@ from connectors.kb_endpoints import (
     COMPLEX_TYPE_INFO,
     COMPLEX_PRICE,
     COMPLEX_TRANSACTION,
+    COMPLEX_TRANSACTION_YEARLY,
     COMPLEX_LISTING,
     COMPLEX_LISTING_COUNT,
     REGION_SIGUNGU,
@@ -37,16 +40,19 @@ __all__ = [
     "BrowserError",
     "PageLoadError",
     "ElementNotFoundError",
+    "CollectionCancelled",
     "KBBaseConnector",
     "KBPriceConnector",
     "KBListingConnector",
     "KBTransactionConnector",
+    "KBTransactionHistoryConnector",
     "MolitTransactionConnector",
     "COMPLEX_SEARCH",
     "COMPLEX_DETAIL",
     "COMPLEX_TYPE_INFO",
     "COMPLEX_PRICE",
     "COMPLEX_TRANSACTION",
+    "COMPLEX_TRANSACTION_YEARLY",
     "COMPLEX_LISTING",
     "COMPLEX_LISTING_COUNT",
     "REGION_SIGUNGU",
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import time
 import random
 from datetime import datetime
@@ -33,6 +33,11 @@ class RateLimitError(ConnectorError):
     pass
 
 
+class CollectionCancelled(ConnectorError):
+    """Collection stopped because its run was cancelled (raised from request_gate)"""
+    pass
+
+
 class BrowserError(ConnectorError):
     """Browser automation errors (retryable)"""
     pass
@@ -54,6 +59,9 @@ class BaseConnector(ABC):
     Provides common functionality: retry logic, rate limiting, error handling
     """
 
+    # 파싱 규칙 변경 시 올림 (저장된 원문 재파싱 대상 판별에 사용)
+    PARSER_VERSION = "1.0"
+
     def __init__(
         self,
         name: str,
@@ -66,23 +74,28 @@ class BaseConnector(ABC):
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.last_request_time: Optional[float] = None
+        # 요청 직전마다 호출되는 외부 제한 (작업 단위 분산 rate limit 등, services.job_limits)
+        self.request_gate: Optional[Callable[[], None]] = None
 
     def _wait_for_rate_limit(self):
         """Enforce rate limiting between requests"""
-        if self.last_request_time is None:
-            self.last_request_time = time.time()
-            return
+        if self.last_request_time is not None:
+            min_interval = 60.0 / self.rate_limit_per_minute
+            elapsed = time.time() - self.last_request_time
 
-        min_interval = 60.0 / self.rate_limit_per_minute
-        elapsed = time.time() - self.last_request_time
-        
-        if elapsed < min_interval:
-            sleep_time = min_interval - elapsed
-            logger.debug(f"{self.name}: Rate limit wait {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        
+            if elapsed < min_interval:
+                sleep_time = min_interval - elapsed
+                logger.debug(f"{self.name}: Rate limit wait {sleep_time:.2f}s")
+                time.sleep(sleep_time)
+
+        self._pass_request_gate()
         self.last_request_time = time.time()
 
+    def _pass_request_gate(self):
+        """외부 제한 통과 대기 (한 번의 collect 안에서 여러 요청을 보내는 커넥터는 요청마다 호출)"""
+        if self.request_gate is not None:
+            self.request_gate()
+
     def _exponential_backoff(self, attempt: int) -> float:
         """Calculate exponential backoff with jitter"""
         delay = self.base_delay * (2 ** attempt)
@@ -111,15 +124,25 @@ class BaseConnector(ABC):
         """
         pass
 
-    def collect(self, **kwargs) -> Dict[str, Any]:
+    def collect(
+        self,
+        skip_unchanged: Optional[Callable[[Any], bool]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
         """
         Main entry point: fetch + parse with retry logic
+
+        Args:
+            skip_unchanged: 원문을 받아 이전과 동일하면 True를 반환하는 함수.
+                True이면 파싱을 건너뛰고 'unchanged': True, 빈 items를 반환
+                (fetch 결과에 'unchanged': True가 있으면 커넥터 자체 사전 점검으로 간주해 동일하게 처리)
         
         Returns:
             Dict with keys:
                 - 'items': List of normalized items
                 - 'metadata': Collection metadata
                 - 'raw': Raw data (optional)
+                - 'unchanged': 이전 원문과 동일해 파싱을 건너뛰었는지 여부
         """
         for attempt in range(self.max_retries):
             try:
@@ -128,18 +151,37 @@ class BaseConnector(ABC):
                 logger.info(f"{self.name}: Fetching data (attempt {attempt + 1}/{self.max_retries})")
                 raw_result = self.fetch(**kwargs)
                 
+                metadata = {
+                    **raw_result.get('metadata', {}),
+                    'fetched_at': datetime.utcnow().isoformat(),
+                    'connector': self.name,
+                    'attempt': attempt + 1,
+                }
+                if raw_result.get('unchanged'):
+                    # 커넥터 자체 사전 점검에서 변동 없음 → 원문 없음
+                    return {
+                        'items': [],
+                        'metadata': metadata,
+                        'raw': None,
+                        'unchanged': True,
+                    }
+                if skip_unchanged is not None and skip_unchanged(raw_result['data']):
+                    logger.info(f"{self.name}: Payload unchanged, skipping parse")
+                    return {
+                        'items': [],
+                        'metadata': metadata,
+                        'raw': raw_result.get('data'),
+                        'unchanged': True,
+                    }
+
                 logger.info(f"{self.name}: Parsing data")
                 items = self.parse(raw_result['data'])
                 
                 return {
                     'items': items,
-                    'metadata': {
-                        **raw_result.get('metadata', {}),
-                        'fetched_at': datetime.utcnow().isoformat(),
-                        'connector': self.name,
-                        'attempt': attempt + 1,
-                    },
+                    'metadata': metadata,
                     'raw': raw_result.get('data'),
+                    'unchanged': False,
                 }
             
             except (NetworkError, RateLimitError, BrowserError) as e:
@@ -152,6 +194,10 @@ class BaseConnector(ABC):
                     logger.error(f"{self.name}: Max retries exceeded")
                     raise
             
+            except CollectionCancelled:
+                logger.info(f"{self.name}: Collection cancelled")
+                raise
+
             except (AuthenticationError, ParserError) as e:
                 logger.error(f"{self.name}: Non-retryable error: {e}")
                 raise
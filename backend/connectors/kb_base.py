@@ -4,11 +4,15 @@ KB부동산 전용 하이브리드 베이스 커넥터.
 전략:
 1. 먼저 httpx로 직접 API 호출 시도 (빠르고 가벼움)
 2. 연속 실패 시 Playwright 브라우저 폴백 (느리지만 확실함)
+
+HTTP 클라이언트는 기본적으로 커넥터마다 생성하고, 여러 커넥터를 연달아 쓰는 실행기는
+share_http_clients로 연결 풀을 공유할 수 있습니다 (async 클라이언트는 같은 이벤트 루프에서만).
 """
 import asyncio
 import random
 import logging
 from abc import abstractmethod
+from contextlib import contextmanager
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
@@ -55,6 +59,9 @@ class KBBaseConnector(BaseConnector):
         )
         self._db_session = db_session
         self._http_client: Optional[httpx.AsyncClient] = None
+        self._sync_http_client: Optional[httpx.Client] = None
+        # 외부에서 공유받은 클라이언트는 close()에서 닫지 않음
+        self._shares_http_clients: bool = False
         self._use_browser_fallback: bool = False
         self._consecutive_http_failures: int = 0
         self._max_http_failures_before_fallback: int = 3
@@ -81,17 +88,41 @@ class KBBaseConnector(BaseConnector):
             "webservice": "1",
         }
 
+    def http_client_options(self) -> dict:
+        """httpx 클라이언트 공통 옵션 (공유 클라이언트 생성에도 사용)"""
+        return {
+            "headers": self._get_default_headers(),
+            "timeout": 30.0,
+            "follow_redirects": True,
+            "http2": True,
+        }
+
+    def share_http_clients(
+        self,
+        async_client: Optional[httpx.AsyncClient] = None,
+        sync_client: Optional[httpx.Client] = None,
+    ):
+        """외부 HTTP 클라이언트(연결 풀) 사용. async_client는 이 커넥터의 fetch가 실행되는 이벤트 루프 전용"""
+        if async_client is not None:
+            self._http_client = async_client
+        self._sync_http_client = sync_client
+        self._shares_http_clients = True
+
     async def _get_http_client(self) -> httpx.AsyncClient:
         """HTTP 클라이언트 lazy 초기화"""
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
-                headers=self._get_default_headers(),
-                timeout=30.0,
-                follow_redirects=True,
-                http2=True,
-            )
+            self._http_client = httpx.AsyncClient(**self.http_client_options())
         return self._http_client
 
+    @contextmanager
+    def _sync_http_session(self):
+        """동기 HTTP 클라이언트 (공유 클라이언트가 있으면 그대로 사용, 없으면 이번 요청용으로 열고 닫음)"""
+        if self._sync_http_client is not None:
+            yield self._sync_http_client
+            return
+        with httpx.Client(**self.http_client_options()) as client:
+            yield client
+
     async def _fetch_via_http(self, endpoint: KBEndpoint, params: dict) -> dict:
         """httpx를 사용한 직접 API 호출"""
         client = await self._get_http_client()
@@ -267,7 +298,9 @@ class KBBaseConnector(BaseConnector):
         ...
 
     async def close(self):
-        """HTTP 클라이언트 정리"""
+        """HTTP 클라이언트 정리 (공유받은 클라이언트는 소유자가 정리)"""
+        if self._shares_http_clients:
+            return
         if self._http_client and not self._http_client.is_closed:
             await self._http_client.aclose()
             self._http_client = None
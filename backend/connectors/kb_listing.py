@@ -7,6 +7,8 @@ KB부동산에서 아파트 단지별 매물 정보를 수집합니다.
 API 흐름:
 1. GET /land-complex/complex/brif?단지기본일련번호={id} → 단지 브리프
 2. POST /land-property/propList/main (body: brif + 페이지 파라미터) → 매물 목록
+   (사전 점검: 첫 페이지 후 건수/최신 등록일이 마지막 전체 수집과 같으면 나머지 페이지 생략)
+   (증분 수집: 최신 등록순 페이지에서 이미 아는 매물만 나오면 중단)
 """
 from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
@@ -31,6 +33,21 @@ STATUS_MAP = {
 
 PAGE_SIZE = 50  # 한 페이지에 요청할 매물 수 (최대 50)
 
+_COUNT_KEYS = ("매매건수", "전세건수", "월세건수")
+
+
+def listing_probe_signature(brif_data: Dict[str, Any], first_page: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """사전 점검 지문: 거래유형별 건수 + 첫 페이지(최신 등록순) 최신 등록일/매물 ID/호가"""
+    dates = [str(item.get("등록년월일") or "") for item in first_page]
+    return {
+        "counts": [brif_data.get(key) or 0 for key in _COUNT_KEYS],
+        "newest_posted": max(dates, default=""),
+        "first_page": [
+            [item.get(key) for key in ("매물일련번호", "매매가", "최소매매가", "전세가")]
+            for item in first_page
+        ],
+    }
+
 
 class KBListingConnector(KBBaseConnector):
     """
@@ -63,15 +80,16 @@ class KBListingConnector(KBBaseConnector):
         """
         동기 2단계 fetch: brif GET → propList/main POST (전체 페이지 순회).
         async event loop 문제를 피하기 위해 동기 httpx.Client 사용.
+
+        probe(ListingProbe)가 주어지면 첫 페이지까지 받은 뒤 사전 점검을 수행하고,
+        변동이 없으면 나머지 페이지를 생략하고 'unchanged': True를 반환.
+        변동이 있으면 증분 수집: 이미 아는 매물만 있는 페이지에서 중단 (probe.complete = False).
         """
         kb_complex_id = kwargs.get("kb_complex_id") or self._resolve_kb_complex_id(kwargs["complex_id"])
+        probe = kwargs.get("probe")
+        metadata = {"method": "http_direct", "source": "kb"}
 
-        with httpx.Client(
-            headers=self._get_default_headers(),
-            http2=True,
-            timeout=30.0,
-            follow_redirects=True,
-        ) as client:
+        with self._sync_http_session() as client:
             # Step 1: GET brif
             logger.info(f"{self.name}: GET brif for complex {kb_complex_id}")
             brif_resp = client.get(COMPLEX_BRIF.url, params={"단지기본일련번호": kb_complex_id})
@@ -85,33 +103,19 @@ class KBListingConnector(KBBaseConnector):
             logger.info(f"{self.name}: {brif_data.get('단지명')} - 매매:{brif_data.get('매매건수')} 전세:{brif_data.get('전세건수')} 월세:{brif_data.get('월세건수')}")
 
             if total_listings == 0:
-                return {"data": {"propertyList": []}, "metadata": {"method": "http_direct", "source": "kb"}}
+                return {"data": {"propertyList": []}, "metadata": metadata}
 
-            # Step 2: POST propList/main (모든 페이지)
+            # Step 2: POST propList/main (모든 페이지, 증분 수집이면 중간에 중단)
             all_items = []
             total_pages = max(1, math.ceil(total_listings / PAGE_SIZE))
+            known = probe.known_prices() if probe is not None and total_pages > 1 else None
+            new_ids = set()
+            stopped_at = None
 
             for page_no in range(1, total_pages + 1):
-                post_body = {
-                    **brif_data,
-                    "페이지번호": page_no,
-                    "페이지목록수": PAGE_SIZE,
-                    "중복타입": "02",
-                    "정렬타입": "date",
-                    "매물거래구분": "",
-                    "면적일련번호": "",
-                    "전자계약여부": "0",
-                    "비대면대출여부": "0",
-                    "클린주택여부": "0",
-                    "honeyYn": "0",
-                }
-
-                prop_resp = client.post(COMPLEX_PROP_LIST.url, json=post_body)
-                if prop_resp.status_code != 200:
-                    logger.warning(f"{self.name}: propList page {page_no} HTTP {prop_resp.status_code}")
+                prop_data = self._fetch_page(client, brif_data, page_no)
+                if prop_data is None:
                     break
-
-                prop_data = prop_resp.json().get("dataBody", {}).get("data", {})
                 items = prop_data.get("propertyList", [])
                 if not items:
                     break
@@ -120,15 +124,89 @@ class KBListingConnector(KBBaseConnector):
 
                 # 서버가 알려주는 실제 총 페이지수 반영
                 server_pages = prop_data.get("페이지개수")
-                if server_pages and page_no >= int(server_pages):
+                if server_pages:
+                    total_pages = min(total_pages, int(server_pages))
+
+                # 첫 페이지로 사전 점검 → 변동 없으면 나머지 페이지 생략
+                if page_no == 1 and probe is not None and total_pages > 1:
+                    signature = listing_probe_signature(brif_data, items)
+                    if probe.unchanged(signature, remaining_pages=total_pages - 1):
+                        logger.info(
+                            f"{self.name}: {brif_data.get('단지명')} probe unchanged, "
+                            f"skipped {total_pages - 1} pages"
+                        )
+                        return {
+                            "data": None,
+                            "metadata": {**metadata, "probe": "unchanged", "requests_avoided": total_pages - 1},
+                            "unchanged": True,
+                        }
+
+                if page_no >= total_pages:
                     break
 
+                # 증분 수집: 페이지 전체가 아는 매물/같은 호가이고 건수가 맞으면 중단
+                if known is not None and self._page_known(items, known, new_ids):
+                    if probe.can_stop(total_listings, len(new_ids)):
+                        stopped_at = page_no
+                        break
+
+        if probe is not None:
+            probe.record_fetch(
+                total_listings,
+                complete=stopped_at is None,
+                requests_avoided=total_pages - stopped_at if stopped_at else 0,
+            )
+        if stopped_at:
+            metadata.update(incremental=True, requests_avoided=total_pages - stopped_at)
+            logger.info(
+                f"{self.name}: {brif_data.get('단지명')} incremental stop at page {stopped_at}/{total_pages} "
+                f"({len(new_ids)} new)"
+            )
+
         logger.info(f"{self.name}: Fetched {len(all_items)} listings for {brif_data.get('단지명')}")
         return {
             "data": {"propertyList": all_items, "총매물건수": len(all_items)},
-            "metadata": {"method": "http_direct", "source": "kb"},
+            "metadata": metadata,
+        }
+
+    def _page_known(self, items: List[dict], known: Dict[str, Any], new_ids: set) -> bool:
+        """페이지의 모든 매물이 이미 아는 ACTIVE 매물이고 호가가 같은지 (새 매물 ID는 new_ids에 누적)"""
+        unchanged = True
+        for item in items:
+            listing = self._parse_single_listing(item)
+            if listing is None:
+                continue
+            listing_id = listing["source_listing_id"]
+            if listing_id not in known:
+                new_ids.add(listing_id)
+                unchanged = False
+            elif known[listing_id] != listing["ask_price"]:
+                unchanged = False
+        return unchanged
+
+    def _fetch_page(self, client: httpx.Client, brif_data: dict, page_no: int) -> Optional[dict]:
+        """propList/main 한 페이지 (최신 등록순). 실패 시 None"""
+        post_body = {
+            **brif_data,
+            "페이지번호": page_no,
+            "페이지목록수": PAGE_SIZE,
+            "중복타입": "02",
+            "정렬타입": "date",
+            "매물거래구분": "",
+            "면적일련번호": "",
+            "전자계약여부": "0",
+            "비대면대출여부": "0",
+            "클린주택여부": "0",
+            "honeyYn": "0",
         }
 
+        self._pass_request_gate()
+        prop_resp = client.post(COMPLEX_PROP_LIST.url, json=post_body)
+        if prop_resp.status_code != 200:
+            logger.warning(f"{self.name}: propList page {page_no} HTTP {prop_resp.status_code}")
+            return None
+        return prop_resp.json().get("dataBody", {}).get("data", {})
+
     def parse(self, raw_data: Any) -> List[Dict[str, Any]]:
         """
         KB 매물 응답 파싱.
@@ -22,6 +22,8 @@ class KBPriceConnector(KBBaseConnector):
     단위: 만원 (KB API 원본 단위 그대로 저장)
     """
 
+    PARSER_VERSION = "2.2"
+
     def __init__(self, db_session=None, rate_limit_per_minute: int = 20):
         super().__init__(
             name="KBPriceConnector",
@@ -73,6 +75,7 @@ class KBPriceConnector(KBBaseConnector):
     def parse(self, raw_data: Any) -> List[Dict[str, Any]]:
         """
         KB 시세 응답 파싱.
+        시세 배열의 모든 기준일을 반환 (최신순). 같은 기준일이 여러 번 오면 첫 항목 사용.
 
         실제 응답 구조 (2026-02-08 검증 완료):
         {
@@ -111,40 +114,48 @@ class KBPriceConnector(KBBaseConnector):
             if not sise_list:
                 return []
 
-            price_info = sise_list[0] if isinstance(sise_list, list) else {}
+            # 응답에 담긴 시세 이력 전체 (기준일별 1건, 최신순)
+            points: Dict[str, Dict[str, Any]] = {}
+            for price_info in sise_list:
+                if not isinstance(price_info, dict):
+                    continue
+                point = self._parse_price_point(price_info)
+                if point["as_of_date"] is None:
+                    if len(sise_list) > 1:
+                        continue
+                    # 단건 응답에 기준일이 없으면 수집일 기준
+                    from datetime import date
+                    point["as_of_date"] = date.today().isoformat()
+                points.setdefault(point["as_of_date"], point)
+
+            return sorted(points.values(), key=lambda p: p["as_of_date"], reverse=True)
 
-            # 날짜 추출
-            as_of_date = None
-            for date_key in ["시세기준년월일", "baseDate", "as_of_date", "stdDate"]:
-                if date_key in price_info and price_info[date_key]:
-                    as_of_date = self._parse_date(str(price_info[date_key]))
-                    break
-            if as_of_date is None:
-                from datetime import date
-                as_of_date = date.today().isoformat()
+        except Exception as e:
+            raise ParserError(f"Failed to parse KB price data: {e}")
 
-            # 가격 추출 (만원 단위)
-            general_price = self._extract_price(
+    def _parse_price_point(self, price_info: dict) -> Dict[str, Any]:
+        """시세 배열 항목 1건 파싱 (기준일이 없으면 as_of_date=None)"""
+        as_of_date = None
+        for date_key in ["시세기준년월일", "baseDate", "as_of_date", "stdDate"]:
+            if date_key in price_info and price_info[date_key]:
+                as_of_date = self._parse_date(str(price_info[date_key]))
+                break
+
+        # 가격 추출 (만원 단위)
+        return {
+            "as_of_date": as_of_date,
+            "general_price": self._extract_price(
                 price_info, ["매매일반거래가", "매매거래금액", "dealAmt", "general_price"]
-            )
-            high_price = self._extract_price(
+            ),
+            "high_avg_price": self._extract_price(
                 price_info, ["매매상한가", "dealAmtUpper", "high_avg_price"]
-            )
-            low_price = self._extract_price(
+            ),
+            "low_avg_price": self._extract_price(
                 price_info, ["매매하한가", "dealAmtLower", "low_avg_price"]
-            )
-
-            return [{
-                "as_of_date": as_of_date,
-                "general_price": general_price,
-                "high_avg_price": high_price,
-                "low_avg_price": low_price,
-                "source": "kb",
-                "parser_version": "2.1",
-            }]
-
-        except Exception as e:
-            raise ParserError(f"Failed to parse KB price data: {e}")
+            ),
+            "source": "kb",
+            "parser_version": self.PARSER_VERSION,
+        }
 
     def parse_recent_transaction(self, raw_data: Any) -> Optional[Dict[str, Any]]:
         """
@@ -131,7 +131,7 @@ class KBTransactionConnector(KBBaseConnector):
                 )
 
                 # 층
-                floor = self._extract_int(item, ["floor", "층", "floorInfo"])
+                floor = self._extract_int(item, ["floor", "층", "거래층", "floorInfo"])
 
                 # 해제 여부
                 is_cancelled = self._extract_cancel_status(item)
@@ -154,7 +154,7 @@ class KBTransactionConnector(KBBaseConnector):
     def _extract_date(self, item: dict) -> Optional[str]:
         """거래 항목에서 날짜 추출"""
         # 단일 날짜 필드
-        for key in ["dealDate", "contract_date", "거래일", "계약일", "tradeDate"]:
+        for key in ["dealDate", "contract_date", "계약년월일", "거래일", "계약일", "tradeDate"]:
             if key in item and item[key]:
                 return self._parse_date(str(item[key]))
 
@@ -0,0 +1,61 @@
+"""
+KB 연도별 과거 실거래가 커넥터 (backfill 전용).
+
+vlaDealPricePastYearInq는 단지/면적별 여러 해의 실거래를 한 번에 돌려주므로,
+새로 등록된 단지의 실거래 이력을 면적당 요청 1회로 채울 수 있습니다.
+일일 수집과 요청 한도를 나누지 않도록 낮은 기본 한도(settings.backfill_rate_limit_per_minute)를 씁니다.
+"""
+from typing import Any, Dict, Iterator, List, Tuple
+import logging
+
+from core.config import settings
+from connectors.kb_endpoints import KBEndpoint, COMPLEX_TRANSACTION_YEARLY
+from connectors.kb_transaction import KBTransactionConnector
+
+logger = logging.getLogger(__name__)
+
+_DATE_KEYS = ("dealDate", "contract_date", "계약년월일", "거래일", "계약일", "tradeDate", "dealYear", "년")
+_PRICE_KEYS = ("dealAmt", "price", "거래금액", "거래가", "tradeAmt")
+
+
+class KBTransactionHistoryConnector(KBTransactionConnector):
+    """
+    KB 연도별 과거 실거래가 커넥터.
+
+    응답이 연도별 묶음이어도 거래 항목(날짜 + 가격 키가 있는 객체)만 모아 기존 실거래 파서로 처리.
+    전용면적이 없는 항목은 exclusive_m2=0.0으로 반환되며, 호출 측에서 요청한 면적으로 채움.
+    """
+
+    def __init__(self, db_session=None, rate_limit_per_minute: int = None):
+        # KBTransactionConnector.__init__은 이름이 고정이므로 KBBaseConnector 초기화를 직접 호출
+        super(KBTransactionConnector, self).__init__(
+            name="KBTransactionHistoryConnector",
+            rate_limit_per_minute=rate_limit_per_minute or settings.backfill_rate_limit_per_minute,
+            db_session=db_session,
+        )
+
+    def _build_http_params(self, **kwargs) -> Tuple[KBEndpoint, dict]:
+        """연도별 실거래가 API 파라미터 (면적 필수)"""
+        kb_complex_id, kb_area_code = self._resolve_kb_ids(kwargs["complex_id"], kwargs["area_id"])
+        params = {
+            "단지기본일련번호": kb_complex_id,
+            "면적일련번호": kb_area_code,
+            "거래유형": "1",  # 1=매매
+        }
+        return (COMPLEX_TRANSACTION_YEARLY, params)
+
+    def parse(self, raw_data: Any) -> List[Dict[str, Any]]:
+        return super().parse(list(self._iter_deals(raw_data)))
+
+    def _iter_deals(self, node: Any) -> Iterator[dict]:
+        """중첩된 응답(연도별 목록 등)에서 거래 항목만 추출"""
+        if isinstance(node, list):
+            for child in node:
+                yield from self._iter_deals(child)
+        elif isinstance(node, dict):
+            if any(k in node for k in _DATE_KEYS) and any(k in node for k in _PRICE_KEYS):
+                yield node
+                return
+            for child in node.values():
+                if isinstance(child, (list, dict)):
+                    yield from self._iter_deals(child)
@@ -1,7 +1,16 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Enum, create_engine, inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
@@ -14,10 +23,261 @@ engine = create_engine(
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _to_async_url(url: str) -> str:
+    """postgresql:// (psycopg2) URL → postgresql+asyncpg:// URL"""
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgresql", "postgres", "postgresql+psycopg2"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+# Async engine (API 조회 라우터용)
+async_engine = create_async_engine(
+    settings.async_database_url or _to_async_url(settings.database_url),
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.async_pool_size,
+    max_overflow=settings.async_max_overflow,
+)
+
+# Async session factory
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
 
+# =============================================================================
+# Read replica 라우팅
+# =============================================================================
+
+# 현재 요청 흐름이 primary에서 읽어야 하는지 (read-your-writes)
+_read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+# 쓰기 이후 primary 고정 만료 시각(epoch)을 담는 쿠키
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 복제 지연(초). 수신한 WAL을 모두 재생했으면 0.
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class _Replica:
+    """replica 하나의 엔진/세션 팩토리와 상태"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(
+            url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+            connect_args={"connect_timeout": 3},
+        )
+        self.async_engine = create_async_engine(
+            _to_async_url(url),
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=settings.async_pool_size,
+            max_overflow=settings.async_max_overflow,
+            connect_args={"timeout": 3},
+        )
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_session_factory = async_sessionmaker(
+            bind=self.async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        self.unhealthy_until = 0.0
+        self.last_checked = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    @property
+    def is_available(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    @property
+    def needs_lag_check(self) -> bool:
+        return time.monotonic() - self.last_checked >= settings.replica_health_check_interval_seconds
+
+    def mark_unhealthy(self, reason: str):
+        self.unhealthy_until = time.monotonic() + settings.replica_unhealthy_cooldown_seconds
+        logger.warning(
+            f"Replica {self.name} marked unhealthy for "
+            f"{settings.replica_unhealthy_cooldown_seconds}s: {reason}"
+        )
+
+    def record_lag(self, lag_seconds: Optional[float]):
+        self.last_checked = time.monotonic()
+        if lag_seconds is not None and lag_seconds > settings.replica_max_lag_seconds:
+            self.mark_unhealthy(f"replication lag {lag_seconds:.1f}s")
+
+
+class ReplicaRouter:
+    """healthy replica를 라운드로빈으로 선택"""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [_Replica(url) for url in urls]
+        self._next = 0
+
+    def candidates(self) -> List[_Replica]:
+        if not self.replicas:
+            return []
+        start = self._next % len(self.replicas)
+        self._next += 1
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [r for r in ordered if r.is_available]
+
+
+replica_router = ReplicaRouter(settings.replica_urls)
+
+
+def _reads_pinned_to_primary() -> bool:
+    return _read_from_primary.get() or not replica_router.replicas
+
+
+def ReadSessionLocal() -> Session:
+    """
+    조회 전용 동기 세션 (분석/집계 조회용).
+    healthy replica가 있으면 replica, 없으면 primary.
+    """
+    if not _reads_pinned_to_primary():
+        for replica in replica_router.candidates():
+            session = replica.session_factory()
+            try:
+                conn = session.connection()
+                if replica.needs_lag_check:
+                    replica.record_lag(conn.execute(_REPLICA_LAG_SQL).scalar())
+                    if not replica.is_available:
+                        session.close()
+                        continue
+                session.info["replica"] = replica
+                return session
+            except (DBAPIError, OSError) as e:
+                replica.mark_unhealthy(str(e))
+                session.close()
+    return SessionLocal()
+
+
+async def _open_async_read_session() -> AsyncSession:
+    if not _reads_pinned_to_primary():
+        for replica in replica_router.candidates():
+            session = replica.async_session_factory()
+            try:
+                conn = await session.connection()
+                if replica.needs_lag_check:
+                    replica.record_lag((await conn.execute(_REPLICA_LAG_SQL)).scalar())
+                    if not replica.is_available:
+                        await session.close()
+                        continue
+                session.info["replica"] = replica
+                return session
+            except (DBAPIError, OSError) as e:
+                replica.mark_unhealthy(str(e))
+                await session.close()
+    return AsyncSessionLocal()
+
+
+def _mark_failed_replica(session, error: DBAPIError):
+    replica = session.info.get("replica")
+    if replica is not None and error.connection_invalidated:
+        replica.mark_unhealthy(str(error))
+
+
+async def read_your_writes_middleware(request, call_next):
+    """
+    쓰기 요청(POST/PUT/PATCH/DELETE) 처리 후 일정 시간 동안
+    같은 클라이언트의 조회를 primary로 고정 (replica 복제 지연 대비).
+    """
+    sticky = False
+    until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    if until:
+        try:
+            sticky = float(until) > time.time()
+        except ValueError:
+            pass
+
+    token = _read_from_primary.set(sticky or request.method not in _SAFE_METHODS)
+    try:
+        response = await call_next(request)
+    finally:
+        _read_from_primary.reset(token)
+
+    if (
+        request.method not in _SAFE_METHODS
+        and response.status_code < 400
+        and replica_router.replicas
+        and settings.replica_sticky_seconds > 0
+    ):
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            str(time.time() + settings.replica_sticky_seconds),
+            max_age=settings.replica_sticky_seconds,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+# enum 타입에 이미 있는 값 (pg_enum)
+_ENUM_LABELS_SQL = text(
+    "SELECT e.enumlabel FROM pg_enum e JOIN pg_type t ON t.oid = e.enumtypid "
+    "WHERE t.typname = :name AND pg_type_is_visible(t.oid)"
+)
+
+
+def ensure_columns(bind_engine, table, drop_indexes: Sequence[str] = ()) -> List[str]:
+    """
+    모델에 새로 추가된 nullable 컬럼과 인덱스, enum 값을 기존 테이블에 추가.
+    (create_all은 이미 존재하는 테이블에 컬럼/인덱스/enum 값을 추가하지 않음)
+    drop_indexes: 모델에서 빠졌거나 다른 이름으로 다시 정의된 기존 인덱스 (있으면 삭제)
+    """
+    existing = {c["name"] for c in inspect(bind_engine).get_columns(table.name)}
+    missing = [c for c in table.columns if c.name not in existing]
+
+    with bind_engine.begin() as conn:
+        for column in table.columns:
+            if isinstance(column.type, Enum) and column.type.native_enum and column.name in existing:
+                # enum 클래스에 새로 추가된 값만 (enum은 이름으로 저장, 이미 있는 값은 DDL 없이 건너뜀)
+                labels = set(conn.execute(_ENUM_LABELS_SQL, {"name": column.type.name}).scalars())
+                for value in column.type.enums:
+                    if value not in labels:
+                        conn.execute(text(f"ALTER TYPE {column.type.name} ADD VALUE IF NOT EXISTS '{value}'"))
+                        logger.info(f"Added enum value {column.type.name}.{value}")
+        for column in missing:
+            if isinstance(column.type, Enum):
+                column.type.create(conn, checkfirst=True)
+            ddl_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(
+                f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {column.name} {ddl_type}"
+            ))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+        for name in drop_indexes:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    if missing:
+        logger.info(f"Added columns to {table.name}: {[c.name for c in missing]}")
+    return [c.name for c in missing]
+
+
 def get_db():
     """Dependency for FastAPI to get database session"""
     db = SessionLocal()
@@ -25,3 +285,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Dependency for FastAPI to get read-only database session (replica 우선)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    except DBAPIError as e:
+        _mark_failed_replica(db, e)
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Dependency for FastAPI to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Dependency for FastAPI to get read-only async database session (replica 우선)"""
+    db = await _open_async_read_session()
+    try:
+        yield db
+    except DBAPIError as e:
+        _mark_failed_replica(db, e)
+        raise
+    finally:
+        await db.close()
@@ -0,0 +1,136 @@
+"""
+Keyset(cursor) 페이지네이션 유틸리티
+
+정렬 키(예: (name, id), (as_of_date, id))의 마지막 값을 불투명 커서로 넘겨
+다음 페이지를 `WHERE (키) > (커서값)` 조건으로 조회합니다.
+OFFSET과 달리 깊은 페이지에서도 인덱스 범위 스캔만 수행합니다.
+
+- 커서 없이 호출하면 기존 skip/limit(OFFSET) 방식으로 동작 (호환용)
+- 모든 페이지 응답에 다음 페이지 커서를 함께 반환
+"""
+import base64
+import enum
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# 다음 페이지 커서를 담는 응답 헤더 (목록을 배열로 반환하는 엔드포인트용)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# 목록 엔드포인트의 limit 상한 (limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT))
+MAX_PAGE_LIMIT = 1000
+
+
+class CountMode(str, enum.Enum):
+    """전체 건수 계산 방식"""
+    EXACT = "exact"              # COUNT(*) (정확, 큰 테이블에서 느림)
+    APPROXIMATE = "approximate"  # 플래너 추정치 (EXPLAIN)
+    NONE = "none"                # 계산하지 않음
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(value: Any, python_type: type) -> Any:
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+class Keyset:
+    """
+    정렬 키 정의.
+
+    모든 컬럼이 같은 방향으로 정렬되어야 하며, 마지막 컬럼은 유일 키(id)여야 합니다.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+        self._signature = ",".join(c.key for c in columns)
+
+    def encode(self, row: Any) -> str:
+        payload = {
+            "k": self._signature,
+            "v": [_to_json(getattr(row, c.key)) for c in self.columns],
+        }
+        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if payload.get("k") != self._signature or len(payload["v"]) != len(self.columns):
+                raise ValueError("cursor does not match sort keys")
+            return [
+                _from_json(v, c.type.python_type)
+                for v, c in zip(payload["v"], self.columns)
+            ]
+        except (ValueError, TypeError, KeyError, json.JSONDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    def apply(self, query: Select, cursor: Optional[str], skip: int, limit: int) -> Select:
+        """정렬/커서 조건/limit 적용. 다음 페이지 존재 여부 확인을 위해 limit+1건 조회"""
+        if self.descending:
+            query = query.order_by(*[c.desc() for c in self.columns])
+        else:
+            query = query.order_by(*self.columns)
+
+        if cursor:
+            values = self.decode(cursor)
+            key = tuple_(*self.columns)
+            query = query.where(key < tuple_(*values) if self.descending else key > tuple_(*values))
+        elif skip:
+            query = query.offset(skip)
+
+        return query.limit(limit + 1)
+
+    def page(self, rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+        """limit+1건 조회 결과 → (현재 페이지, 다음 페이지 커서)"""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        if not rows:
+            return rows, None
+        return rows, self.encode(rows[-1])
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode) -> Optional[int]:
+    """필터가 적용된 조회의 전체 건수 (mode에 따라 정확/추정/생략)"""
+    if mode == CountMode.NONE:
+        return None
+
+    query = query.order_by(None)
+    if mode == CountMode.EXACT:
+        return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+    # 플래너 추정 행 수: 테이블 크기와 무관하게 통계만 읽음
+    conn = await db.connection()
+    sql = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def set_next_cursor_header(response: Response, next_cursor: Optional[str]):
+    """배열을 반환하는 목록 엔드포인트용: 다음 페이지 커서를 응답 헤더로 전달"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,44 @@
+"""
+Redis 클라이언트 (캐시/조정용).
+
+연결할 수 없으면 None을 반환해 호출 측이 대체 경로(프로세스 내 캐시, DB)를 쓰도록 합니다.
+연결 실패 후에는 일정 시간 동안 재시도하지 않습니다.
+"""
+import logging
+import time
+from typing import Optional
+
+import redis
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 연결 실패 후 재시도까지 대기 시간(초)
+_RETRY_AFTER_SECONDS = 30
+
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """공유 Redis 클라이언트 (최근 연결 실패 시 None)"""
+    global _client
+    if time.monotonic() < _unavailable_until:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+            decode_responses=True,
+        )
+    return _client
+
+
+def mark_redis_unavailable(error: Exception):
+    """Redis 오류 발생 시 호출: 잠시 Redis 경로를 건너뜀"""
+    global _unavailable_until
+    if time.monotonic() >= _unavailable_until:
+        logger.warning(f"Redis unavailable, falling back for {_RETRY_AFTER_SECONDS}s: {error}")
+    _unavailable_until = time.monotonic() + _RETRY_AFTER_SECONDS
@@ -19,6 +19,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # --- Newtech routers (graceful import) ---
@@ -34,6 +35,10 @@ try:
     app.include_router(runs_router, prefix="/api/runs", tags=["runs"])
     app.include_router(data_explorer_router, prefix="/api/data", tags=["data_explorer"])
     app.include_router(batches_router, prefix="/api/batches", tags=["batches"])
+
+    # 쓰기 직후 조회는 primary로 고정 (read replica 복제 지연 대비)
+    from core.database import read_your_writes_middleware
+    app.middleware("http")(read_your_writes_middleware)
 except Exception as e:
     import logging
     logging.getLogger(__name__).warning(
@@ -53,6 +58,65 @@ def on_startup():
         logging.getLogger(__name__).warning(
             f"Database table creation skipped (DB may not be available): {e}"
         )
+        return
+
+    try:
+        from core.database import engine
+        from services.collection_state import ensure_task_identity
+        ensure_task_identity(engine)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(
+            f"Task identity columns could not be ensured: {e}"
+        )
+
+    try:
+        from core.database import engine
+        from services.complex_search import ensure_search_indexes
+        ensure_search_indexes(engine)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(
+            f"Complex search indexes (pg_trgm) not available: {e}"
+        )
+
+    try:
+        from core.database import engine, ensure_columns
+        from models import ComplexCollectionState, CrawlRun, RawPayload
+        ensure_columns(engine, RawPayload.__table__)
+        ensure_columns(engine, ComplexCollectionState.__table__)
+        ensure_columns(engine, CrawlRun.__table__)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(
+            f"Raw payload / collection state / run columns could not be ensured: {e}"
+        )
+
+    try:
+        # 목록 keyset 페이지네이션 / 지역 코드 prefix 검색용 인덱스 (기존 테이블에는 create_all이 만들지 않음)
+        from core.database import engine, ensure_columns
+        from models import Complex, KBPrice, Listing, Transaction
+        ensure_columns(engine, Complex.__table__)
+        ensure_columns(engine, KBPrice.__table__)
+        ensure_columns(engine, Transaction.__table__)
+        # (fetched_at) → (fetched_at, id)로 바뀐 인덱스는 이름이 달라짐
+        ensure_columns(engine, Listing.__table__, drop_indexes=["idx_listing_fetched"])
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(
+            f"Complex / price / transaction / listing indexes could not be ensured: {e}"
+        )
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    try:
+        from core.database import async_engine, replica_router
+        await async_engine.dispose()
+        for replica in replica_router.replicas:
+            await replica.async_engine.dispose()
+    except Exception:
+        pass
 
 
 @app.get("/api/health")
@@ -223,5 +287,7 @@ def analyze_property(request: AnalysisRequest):
     return perform_full_analysis(
         company_name=request.company_name,
         property_address=request.property_address,
-        loan_amount=request.loan_amount
+        loan_amount=request.loan_amount,
+        complex_id=request.complex_id,
+        region_code=request.region_code,
     )
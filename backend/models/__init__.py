@@ -1,16 +1,27 @@
 """Database models package"""
 from core.database import Base
 from models.complex import Complex, Area, PriorityLevel
-from models.price_data import KBPrice, Transaction, Listing, ListingStatus
+from models.price_data import (
+    KBPrice,
+    Transaction,
+    Listing,
+    ListingStatus,
+    PriceRollupMonthly,
+    RollupLevel,
+    RollupSource,
+)
 from models.crawl import (
     CrawlJob,
     CrawlRun,
     CrawlTask,
     RawPayload,
+    PayloadDictionary,
+    ComplexCollectionState,
     JobType,
     JobStatus,
     RunStatus,
     TaskStatus,
+    TaskType,
 )
 
 __all__ = [
@@ -22,12 +33,18 @@ __all__ = [
     "Transaction",
     "Listing",
     "ListingStatus",
+    "PriceRollupMonthly",
+    "RollupLevel",
+    "RollupSource",
     "CrawlJob",
     "CrawlRun",
     "CrawlTask",
     "RawPayload",
+    "PayloadDictionary",
+    "ComplexCollectionState",
     "JobType",
     "JobStatus",
     "RunStatus",
     "TaskStatus",
+    "TaskType",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from core.database import Base
@@ -40,6 +40,14 @@ class Complex(Base):
     transactions = relationship("Transaction", back_populates="complex", cascade="all, delete-orphan")
     listings = relationship("Listing", back_populates="complex", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 지역 prefix 검색 (LIKE '11680%') 및 읍면동/시군구 집계용
+        Index("idx_complex_region_code", "region_code", postgresql_ops={"region_code": "varchar_pattern_ops"}),
+        Index("idx_complex_name_id", "name", "id"),
+        # 부분일치/유사도 검색용 trigram 인덱스는 pg_trgm이 필요하므로
+        # services.complex_search.ensure_search_indexes에서 별도 생성
+    )
+
 
 class Area(Base):
     """단지 내 면적 타입"""
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey, Index, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Enum, ForeignKey, Index, Boolean, LargeBinary
 from sqlalchemy.orm import relationship
 import enum
 from core.database import Base
@@ -41,6 +41,14 @@ class TaskStatus(str, enum.Enum):
     SKIPPED = "skipped"
 
 
+class TaskType(str, enum.Enum):
+    """태스크(수집 데이터) 유형"""
+    KB_PRICE = "kb_price"
+    KB_TRANSACTION = "kb_transaction"
+    KB_LISTING = "kb_listing"
+    KB_TRANSACTION_HISTORY = "kb_transaction_history"  # 연도별 과거 실거래 backfill
+
+
 class CrawlJob(Base):
     """수집 작업 정의"""
 
@@ -91,6 +99,7 @@ class CrawlRun(Base):
     success_count = Column(Integer, default=0, comment="성공 건수")
     failed_count = Column(Integer, default=0, comment="실패 건수")
     skipped_count = Column(Integer, default=0, comment="스킵 건수")
+    requests_avoided = Column(Integer, default=0, comment="변경 감지로 생략한 KB 요청 수")
     
     # 에러 정보
     error_summary = Column(Text, nullable=True, comment="에러 요약 (JSON)")
@@ -109,6 +118,7 @@ class CrawlRun(Base):
     __table_args__ = (
         Index("idx_run_job_status", "job_id", "status"),
         Index("idx_run_started", "started_at"),
+        Index("idx_run_created_id", "created_at", "id"),
     )
 
 
@@ -122,12 +132,18 @@ class CrawlTask(Base):
     
     # 태스크 정보
     task_key = Column(String(200), nullable=False, comment="태스크 키 (complex_id, area_id 등)")
+    task_type = Column(Enum(TaskType), nullable=True, comment="태스크 유형")
+    complex_id = Column(Integer, nullable=True, comment="대상 단지 ID")
+    area_id = Column(Integer, nullable=True, comment="대상 면적 ID (시세)")
     status = Column(Enum(TaskStatus), default=TaskStatus.PENDING, comment="태스크 상태")
     
     # 실행 정보
+    dispatched_at = Column(DateTime, nullable=True, comment="워커로 발행한 시각 (미리 기록된 태스크)")
     started_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
     retry_count = Column(Integer, default=0, comment="재시도 횟수")
+    covered_by_run_id = Column(Integer, nullable=True, comment="중복으로 건너뛴 경우 같은 대상을 수집한 Run ID")
+    dead_lettered_at = Column(DateTime, nullable=True, comment="재시도 소진/재시도 불가 실패 시각 (재실행하면 해제)")
     
     # 에러 정보
     error_type = Column(String(100), nullable=True, comment="에러 유형")
@@ -148,6 +164,45 @@ class CrawlTask(Base):
     __table_args__ = (
         Index("idx_task_run_status", "run_id", "status"),
         Index("idx_task_key", "task_key"),
+        Index("idx_task_run_id", "run_id", "id"),
+        Index("idx_task_run_complex", "run_id", "complex_id"),
+        Index("idx_task_complex_type", "complex_id", "task_type"),
+        Index("idx_task_dead_letter", "dead_lettered_at"),
+    )
+
+
+class ComplexCollectionState(Base):
+    """단지별·데이터 유형별 마지막 수집 상태 (태스크 종료 시 갱신)"""
+
+    __tablename__ = "complex_collection_state"
+
+    complex_id = Column(Integer, primary_key=True, comment="단지 ID")
+    task_type = Column(Enum(TaskType), primary_key=True, comment="태스크 유형")
+
+    # 마지막 수집
+    last_run_id = Column(Integer, ForeignKey("crawl_runs.id", ondelete="SET NULL"), nullable=True, comment="마지막 실행 ID")
+    last_task_id = Column(Integer, nullable=True, comment="마지막 태스크 ID")
+    last_status = Column(Enum(TaskStatus), nullable=True, comment="마지막 태스크 상태")
+    last_started_at = Column(DateTime, nullable=True, comment="마지막 시작 시각")
+    last_finished_at = Column(DateTime, nullable=True, comment="마지막 종료 시각")
+    last_success_at = Column(DateTime, nullable=True, comment="마지막 성공 시각")
+    last_error_message = Column(Text, nullable=True, comment="마지막 에러 메시지")
+    last_payload_hash = Column(String(64), nullable=True, comment="마지막 저장 원문 해시 (실거래/매물)")
+
+    # 수집 주기
+    last_change_at = Column(DateTime, nullable=True, comment="데이터가 마지막으로 바뀐 시각")
+    change_interval_seconds = Column(Float, nullable=True, comment="추정 변경 주기 (초, 지수이동평균)")
+    next_due_at = Column(DateTime, nullable=True, comment="다음 수집 예정 시각")
+
+    # 매물 사전 점검 (건수 + 최신 등록일)
+    probe_hash = Column(String(64), nullable=True, comment="마지막 전체 수집 시 사전 점검 해시")
+    last_full_fetch_at = Column(DateTime, nullable=True, comment="마지막 전체 페이지 수집 시각")
+    last_listing_count = Column(Integer, nullable=True, comment="마지막 수집 시 brif 매물 건수 (증분 수집 대조용)")
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_collection_state_due", "task_type", "next_due_at"),
     )
 
 
@@ -162,6 +217,9 @@ class RawPayload(Base):
     # 원문 정보
     payload_type = Column(String(50), nullable=False, comment="payload 유형 (json/html)")
     content_hash = Column(String(64), nullable=False, comment="콘텐츠 해시")
+    endpoint = Column(String(100), nullable=True, comment="수집 엔드포인트/커넥터")
+    parser_version = Column(String(20), nullable=True, comment="마지막으로 적용한 파서 버전")
+    partial = Column(Boolean, nullable=True, comment="일부만 담긴 원문 여부 (매물 증분 수집, 제거 판단에 쓰지 않음)")
     
     # 저장 위치
     storage_path = Column(String(500), nullable=True, comment="저장 경로 (S3 등)")
@@ -170,6 +228,8 @@ class RawPayload(Base):
     # 메타데이터
     size_bytes = Column(Integer, nullable=True, comment="크기 (바이트)")
     compressed = Column(Boolean, default=False, comment="압축 여부")
+    raw_size_bytes = Column(Integer, nullable=True, comment="압축 전 크기 (바이트)")
+    compression = Column(String(50), nullable=True, comment="압축 방식 (zstd, zstd-dict:{id})")
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -180,3 +240,19 @@ class RawPayload(Base):
         Index("idx_payload_hash", "content_hash"),
         Index("idx_payload_created", "created_at"),
     )
+
+
+class PayloadDictionary(Base):
+    """원문 압축용 zstd 사전 (엔드포인트별 학습)"""
+
+    __tablename__ = "payload_dictionaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    endpoint = Column(String(100), nullable=False, comment="대상 엔드포인트/커넥터")
+    dict_data = Column(LargeBinary, nullable=False, comment="zstd 사전")
+    sample_count = Column(Integer, nullable=True, comment="학습 샘플 수")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_payload_dict_endpoint", "endpoint", "id"),
+    )
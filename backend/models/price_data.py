@@ -13,6 +13,20 @@ class ListingStatus(str, enum.Enum):
     UNKNOWN = "unknown"
 
 
+class RollupLevel(str, enum.Enum):
+    """평단가 집계 단위"""
+    AREA = "area"
+    COMPLEX = "complex"
+    DONG = "dong"
+    SIGUNGU = "sigungu"
+
+
+class RollupSource(str, enum.Enum):
+    """평단가 집계 원천"""
+    KB = "kb"
+    TRANSACTION = "transaction"
+
+
 class KBPrice(Base):
     """KB 시세 스냅샷"""
 
@@ -43,6 +57,7 @@ class KBPrice(Base):
     __table_args__ = (
         Index("idx_kb_price_unique", "complex_id", "area_id", "as_of_date", unique=True),
         Index("idx_kb_price_fetched", "fetched_at"),
+        Index("idx_kb_price_date_id", "as_of_date", "id"),
     )
 
 
@@ -77,6 +92,8 @@ class Transaction(Base):
     __table_args__ = (
         Index("idx_transaction_complex_date", "complex_id", "contract_date"),
         Index("idx_transaction_unique", "complex_id", "contract_date", "price", "exclusive_m2", "floor", unique=True),
+        Index("idx_transaction_fetched", "fetched_at"),
+        Index("idx_transaction_date_id", "contract_date", "id"),
     )
 
 
@@ -112,5 +129,33 @@ class Listing(Base):
     
     __table_args__ = (
         Index("idx_listing_complex_status", "complex_id", "status"),
-        Index("idx_listing_fetched", "fetched_at"),
+        Index("idx_listing_fetched_id", "fetched_at", "id"),
+    )
+
+
+class PriceRollupMonthly(Base):
+    """월별 평단가 집계 (면적/단지/읍면동/시군구)"""
+
+    __tablename__ = "price_rollups_monthly"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 집계 버킷
+    level = Column(Enum(RollupLevel), nullable=False, comment="집계 단위")
+    bucket_key = Column(String(20), nullable=False, comment="집계 키 (area_id/complex_id/법정동코드[:10]/시군구코드[:5])")
+    source = Column(Enum(RollupSource), nullable=False, comment="원천 (KB 시세/실거래)")
+    month = Column(Date, nullable=False, comment="집계 월 (1일 기준)")
+
+    # 집계 값 (만원 단위)
+    median_price_per_m2 = Column(Float, nullable=True, comment="㎡당 중위가")
+    avg_price_per_m2 = Column(Float, nullable=True, comment="㎡당 평균가")
+    median_price_per_pyeong = Column(Float, nullable=True, comment="평당 중위가")
+    avg_price_per_pyeong = Column(Float, nullable=True, comment="평당 평균가")
+    sample_count = Column(Integer, default=0, comment="표본 수 (실거래는 거래 건수)")
+
+    # 메타데이터
+    refreshed_at = Column(DateTime, default=datetime.utcnow, comment="집계 갱신 시각")
+
+    __table_args__ = (
+        Index("idx_rollup_bucket", "level", "bucket_key", "source", "month", unique=True),
     )
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -6,6 +8,8 @@ class AnalysisRequest(BaseModel):
     company_name: str = Field(..., description="업체명")
     property_address: str = Field(..., description="담보주소")
     loan_amount: int = Field(..., gt=0, description="대출신청금액")
+    complex_id: Optional[int] = Field(None, description="수집 단지 ID (단지 검색에서 선택, 평단가 집계 조회용)")
+    region_code: Optional[str] = Field(None, description="지역코드 (법정동코드 앞자리, complex_id가 없을 때 단지 탐색 범위)")
 
     class Config:
         json_schema_extra = {
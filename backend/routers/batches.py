@@ -7,13 +7,15 @@
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from pydantic import BaseModel
 import json
 
-from core.database import get_db
+from core.database import get_db, get_async_read_db
 from models import Complex, CrawlJob, CrawlRun, JobType, JobStatus, RunStatus
+from services.job_schedule import validate_cron
 
 
 router = APIRouter()
@@ -58,26 +60,21 @@ class BatchSchema(BaseModel):
 
 
 @router.get("/", response_model=List[BatchSchema])
-def list_batches(db: Session = Depends(get_db)):
+async def list_batches(db: AsyncSession = Depends(get_async_read_db)):
     """시/도별 배치 목록 (단지 수, 스케줄, 최근 실행 포함)"""
     # 시/도별 단지 수 집계
-    rows = (
-        db.query(
-            func.substr(Complex.region_code, 1, 2).label("sido"),
-            func.count(Complex.id).label("cnt"),
-        )
-        .filter(Complex.region_code.isnot(None), Complex.is_active.is_(True))
-        .group_by("sido")
-        .all()
+    sido = func.substr(Complex.region_code, 1, 2)
+    rows = await db.execute(
+        select(sido.label("sido"), func.count(Complex.id).label("cnt"))
+        .where(Complex.region_code.isnot(None), Complex.is_active.is_(True))
+        .group_by(sido)
     )
-    count_map = {r.sido: r.cnt for r in rows}
+    count_map = {r.sido: r.cnt for r in rows.all()}
 
     # 배치용 CrawlJob 전체 조회
     jobs = (
-        db.query(CrawlJob)
-        .filter(CrawlJob.job_type == JobType.REGION_ALL)
-        .all()
-    )
+        await db.execute(select(CrawlJob).where(CrawlJob.job_type == JobType.REGION_ALL))
+    ).scalars().all()
     job_map: Dict[str, CrawlJob] = {}
     for j in jobs:
         try:
@@ -87,20 +84,35 @@ def list_batches(db: Session = Depends(get_db)):
         except (json.JSONDecodeError, TypeError):
             pass
 
+    # 배치 Job별 최근 실행 5건 (job당 쿼리 대신 window 함수 한 번)
+    runs_by_job: Dict[int, List[CrawlRun]] = {}
+    if job_map:
+        rank = (
+            func.row_number()
+            .over(partition_by=CrawlRun.job_id, order_by=CrawlRun.created_at.desc())
+            .label("rank")
+        )
+        ranked = (
+            select(CrawlRun.id, rank)
+            .where(CrawlRun.job_id.in_([j.id for j in job_map.values()]))
+            .subquery()
+        )
+        recent = await db.execute(
+            select(CrawlRun)
+            .join(ranked, CrawlRun.id == ranked.c.id)
+            .where(ranked.c.rank <= 5)
+            .order_by(CrawlRun.created_at.desc())
+        )
+        for r in recent.scalars().all():
+            runs_by_job.setdefault(r.job_id, []).append(r)
+
     result: List[BatchSchema] = []
     for sido_code, sido_name in SIDO_MAP.items():
         job = job_map.get(sido_code)
         last_runs: List[BatchRunSchema] = []
 
         if job:
-            runs = (
-                db.query(CrawlRun)
-                .filter(CrawlRun.job_id == job.id)
-                .order_by(CrawlRun.created_at.desc())
-                .limit(5)
-                .all()
-            )
-            for r in runs:
+            for r in runs_by_job.get(job.id, []):
                 last_runs.append(BatchRunSchema(
                     id=r.id,
                     status=r.status.value if hasattr(r.status, "value") else str(r.status),
@@ -129,9 +141,13 @@ def list_batches(db: Session = Depends(get_db)):
 def run_batch(
     sido_code: str,
     background_tasks: BackgroundTasks,
+    force: bool = False,
     db: Session = Depends(get_db),
 ):
-    """시/도 배치 즉시 실행 — 해당 시/도의 모든 활성 단지 수집"""
+    """
+    시/도 배치 즉시 실행 — 해당 시/도의 활성 단지 중 수집 예정 시각이 지난 단지 수집
+    (force=true면 전체 수집)
+    """
     if sido_code not in SIDO_MAP:
         raise HTTPException(status_code=400, detail=f"Invalid sido_code: {sido_code}")
 
@@ -173,7 +189,7 @@ def run_batch(
     complex_ids = [c.id for c in complexes]
 
     from services.sync_collector import collect_complex_sync
-    background_tasks.add_task(collect_complex_sync, run.id, complex_ids)
+    background_tasks.add_task(collect_complex_sync, run.id, complex_ids, force)
 
     return {
         "message": f"{SIDO_MAP[sido_code]} {len(complexes)}개 단지 수집 시작",
@@ -192,9 +208,16 @@ def update_batch_schedule(
     body: ScheduleUpdateSchema,
     db: Session = Depends(get_db),
 ):
-    """시/도 배치 스케줄 설정/수정"""
+    """
+    시/도 배치 스케줄 설정/수정 (5필드 cron, 빈 값이면 해제).
+    beat가 변경을 주기적으로 다시 읽어 반영하고, 시/도별로 시작 시각을 분산.
+    """
     if sido_code not in SIDO_MAP:
         raise HTTPException(status_code=400, detail=f"Invalid sido_code: {sido_code}")
+    try:
+        cron_schedule = validate_cron(body.cron_schedule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     job = _find_batch_job(db, sido_code)
     if not job:
@@ -206,7 +229,7 @@ def update_batch_schedule(
         )
         db.add(job)
 
-    job.cron_schedule = body.cron_schedule
+    job.cron_schedule = cron_schedule
     db.commit()
 
     return {
@@ -1,13 +1,17 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
 from pydantic import BaseModel
 
-from core.database import get_db
+from core.config import settings
+from core.database import get_db, get_async_read_db
+from core.pagination import MAX_PAGE_LIMIT, CountMode, Keyset, count_rows
 from models import Complex, Area, PriorityLevel
-from models.crawl import CrawlRun, CrawlTask, RunStatus, TaskStatus
+from models.crawl import ComplexCollectionState, CrawlRun, CrawlTask, RunStatus, TaskStatus
+from services.complex_search import SearchMode, contains_filter, ranked_filter, ranked_query, set_similarity_threshold
 
 router = APIRouter()
 
@@ -51,94 +55,120 @@ class ComplexSchema(BaseModel):
 
 class PaginatedComplexResponse(BaseModel):
     items: List[ComplexSchema]
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+_COMPLEX_KEYSET = Keyset(Complex.name, Complex.id)
 
 
 @router.get("/", response_model=PaginatedComplexResponse)
-def list_complexes(
-    skip: int = 0,
-    limit: int = 100,
+async def list_complexes(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
     region_code: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.EXACT,
+    search_mode: SearchMode = SearchMode.CONTAINS,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """단지 목록 조회 (서버 사이드 페이지네이션)"""
-    query = db.query(Complex)
+    """
+    단지 목록 조회 (서버 사이드 페이지네이션)
 
+    cursor를 넘기면 (name, id) keyset 방식으로 다음 페이지를 조회하고 skip은 무시합니다.
+    count_mode=approximate는 플래너 추정치, none은 전체 건수를 생략합니다.
+    search_mode=ranked는 오타를 허용하는 유사도 검색으로, 유사도 순 정렬이라
+    cursor 대신 skip/limit으로 페이지를 넘깁니다 (cursor를 넘기면 400).
+    """
+    ranked = bool(search) and search_mode == SearchMode.RANKED
+    if ranked and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor is not supported with search_mode=ranked; use skip/limit",
+        )
+    criteria = []
     if is_active is not None:
-        query = query.filter(Complex.is_active == is_active)
+        criteria.append(Complex.is_active == is_active)
 
     if region_code:
-        query = query.filter(Complex.region_code.like(f"{region_code}%"))
-
-    if search:
-        q = f"%{search}%"
-        query = query.filter(
-            (Complex.name.ilike(q))
-            | (Complex.address.ilike(q))
-            | (Complex.kb_complex_id.ilike(q))
-            | (Complex.region_code.ilike(q))
+        criteria.append(Complex.region_code.like(f"{region_code}%"))
+
+    query = select(Complex).where(*criteria)
+    if ranked:
+        await set_similarity_threshold(db)
+        query = query.where(ranked_filter(search))
+    elif search:
+        query = query.where(contains_filter(search))
+
+    total = await count_rows(db, query, count_mode)
+    if ranked:
+        # 후보 상한은 요청한 페이지 끝까지는 보장
+        candidates = max(settings.complex_search_ranked_candidates, skip + limit)
+        result = await db.execute(
+            ranked_query(search, candidates, *criteria)
+            .options(selectinload(Complex.areas))
+            .offset(skip)
+            .limit(limit)
         )
+        return PaginatedComplexResponse(items=result.scalars().all(), total=total)
 
-    total = query.count()
-    items = query.order_by(Complex.name).offset(skip).limit(limit).all()
-    return PaginatedComplexResponse(items=items, total=total)
+    result = await db.execute(
+        _COMPLEX_KEYSET.apply(query.options(selectinload(Complex.areas)), cursor, skip, limit)
+    )
+    items, next_cursor = _COMPLEX_KEYSET.page(result.scalars().all(), limit)
+    return PaginatedComplexResponse(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.get("/region-counts")
-def get_region_counts(db: Session = Depends(get_db)):
+async def get_region_counts(db: AsyncSession = Depends(get_async_read_db)):
     """시/도별, 시/군/구별 단지 수 조회"""
-    complexes = db.query(Complex.region_code).filter(Complex.region_code.isnot(None)).all()
-
     sido: Dict[str, int] = {}
     region: Dict[str, int] = {}
-    for (code,) in complexes:
-        if code and len(code) >= 2:
-            key = code[:2]
-            sido[key] = sido.get(key, 0) + 1
-        if code and len(code) >= 5:
-            key = code[:5]
-            region[key] = region.get(key, 0) + 1
+    for prefix_len, counts in ((2, sido), (5, region)):
+        key = func.substr(Complex.region_code, 1, prefix_len)
+        rows = await db.execute(
+            select(key, func.count(Complex.id))
+            .where(
+                Complex.region_code.isnot(None),
+                func.length(Complex.region_code) >= prefix_len,
+            )
+            .group_by(key)
+        )
+        counts.update({code: cnt for code, cnt in rows.all()})
 
     return {"sido_counts": sido, "region_counts": region}
 
 
 @router.get("/last-runs")
-def get_complex_last_runs(db: Session = Depends(get_db)):
-    """각 단지의 마지막 수집 상태를 반환"""
-    # CrawlTask.task_key에서 complex_id를 추출하여 가장 최신 run 정보를 매핑
-    # task_key format: kb_price_{complex_id}_{area_id}, kb_transaction_{complex_id}, kb_listing_{complex_id}
-    from sqlalchemy import text
-
-    # 모든 task를 가져와 complex_id별 가장 최신 run 정보를 추출
-    tasks = (
-        db.query(CrawlTask, CrawlRun)
-        .join(CrawlRun, CrawlTask.run_id == CrawlRun.id)
-        .order_by(CrawlRun.started_at.desc())
-        .all()
+async def get_complex_last_runs(db: AsyncSession = Depends(get_async_read_db)):
+    """각 단지의 마지막 수집 상태를 반환 (complex_collection_state 기반)"""
+    # 단지별로 가장 최근에 시작한 데이터 유형의 run 한 건
+    rows = await db.execute(
+        select(
+            ComplexCollectionState.complex_id,
+            CrawlRun.id,
+            CrawlRun.status,
+            CrawlRun.started_at,
+            CrawlRun.finished_at,
+        )
+        .join(CrawlRun, ComplexCollectionState.last_run_id == CrawlRun.id)
+        .distinct(ComplexCollectionState.complex_id)
+        .order_by(
+            ComplexCollectionState.complex_id,
+            ComplexCollectionState.last_started_at.desc().nulls_last(),
+        )
     )
 
     result: Dict[int, Any] = {}
-    for task, run in tasks:
-        # task_key에서 complex_id 추출
-        parts = task.task_key.split("_")
-        try:
-            # kb_price_3_1 → complex_id=3, kb_transaction_3 → complex_id=3
-            if parts[0] == "kb" and len(parts) >= 3:
-                cid = int(parts[2])
-            else:
-                continue
-        except (ValueError, IndexError):
-            continue
-
-        if cid not in result:
-            result[cid] = {
-                "run_id": run.id,
-                "status": run.status.value if hasattr(run.status, 'value') else str(run.status),
-                "started_at": run.started_at.isoformat() if run.started_at else None,
-                "finished_at": run.finished_at.isoformat() if run.finished_at else None,
-            }
+    for cid, run_id, run_status, started_at, finished_at in rows.all():
+        result[cid] = {
+            "run_id": run_id,
+            "status": run_status.value if hasattr(run_status, 'value') else str(run_status),
+            "started_at": started_at.isoformat() if started_at else None,
+            "finished_at": finished_at.isoformat() if finished_at else None,
+        }
 
     return result
 
@@ -188,10 +218,13 @@ async def get_sigungu_list(sido_code: str):
 
 
 @router.get("/{complex_id}", response_model=ComplexSchema)
-def get_complex(complex_id: int, db: Session = Depends(get_db)):
+async def get_complex(complex_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """단지 상세 조회"""
-    complex = db.query(Complex).filter(Complex.id == complex_id).first()
-    
+    complex = await db.scalar(
+        select(Complex).options(selectinload(Complex.areas)).where(Complex.id == complex_id)
+    )
+
+
     if not complex:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -280,7 +313,8 @@ def collect_complex(
     db.commit()
 
     from services.sync_collector import collect_complex_sync
-    background_tasks.add_task(collect_complex_sync, run.id, [complex_id])
+    # 사용자가 직접 지정한 수집이므로 예정 시각과 무관하게 실행
+    background_tasks.add_task(collect_complex_sync, run.id, [complex_id], True)
 
     return {
         "message": f"{complex_obj.name} 수집이 시작되었습니다",
@@ -325,7 +359,7 @@ def batch_collect_complexes(
     db.commit()
 
     from services.sync_collector import collect_complex_sync
-    background_tasks.add_task(collect_complex_sync, run.id, body.complex_ids)
+    background_tasks.add_task(collect_complex_sync, run.id, body.complex_ids, True)
 
     return {
         "message": f"{len(complexes)}개 단지 수집이 시작되었습니다",
@@ -335,22 +369,36 @@ def batch_collect_complexes(
 
 
 @router.get("/runs/{run_id}/status")
-def get_run_status(run_id: int, db: Session = Depends(get_db)):
-    """수집 실행 상태 폴링"""
-    run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+async def get_run_status(
+    run_id: int,
+    include_tasks: bool = True,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    수집 실행 상태 폴링.
+    진행률은 crawl_runs 카운터만으로 계산되며, include_tasks=false면 태스크 목록을 읽지 않습니다.
+    """
+    run = await db.get(CrawlRun, run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    tasks = db.query(CrawlTask).filter(CrawlTask.run_id == run_id).all()
+    tasks = []
+    if include_tasks:
+        tasks = (await db.execute(select(CrawlTask).where(CrawlTask.run_id == run_id))).scalars().all()
 
+    total = run.total_tasks or 0
+    done = (run.success_count or 0) + (run.failed_count or 0) + (run.skipped_count or 0)
     return {
         "run_id": run.id,
         "status": run.status.value,
         "started_at": run.started_at.isoformat() if run.started_at else None,
         "finished_at": run.finished_at.isoformat() if run.finished_at else None,
-        "total_tasks": run.total_tasks or 0,
+        "total_tasks": total,
         "success_count": run.success_count or 0,
         "failed_count": run.failed_count or 0,
+        "skipped_count": run.skipped_count or 0,
+        "requests_avoided": run.requests_avoided or 0,
+        "progress": round(done / total, 4) if total else 0.0,
         "tasks": [
             {
                 "task_key": t.task_key,
@@ -367,7 +415,7 @@ def get_run_status(run_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/discover-region")
-async def discover_region(
+def discover_region(
     region_code: str,
     db: Session = Depends(get_db),
 ):
@@ -375,14 +423,17 @@ async def discover_region(
     지역코드로 아파트 단지 자동 발견 및 등록.
 
     동기 실행 후 결과를 바로 반환합니다.
+    (발견 서비스가 동기 ORM 세션을 쓰므로 이벤트 루프를 막지 않도록
+    스레드풀에서 실행하고, KB 호출용 루프는 스레드 안에서 따로 돌립니다.)
 
     - region_code: 법정동코드 (5자리 시군구 또는 10자리 법정동)
     - 예: "11680" (강남구), "1168010100" (역삼동)
     """
+    import asyncio
     from services.complex_discovery import ComplexDiscoveryService
 
     service = ComplexDiscoveryService(db)
-    result = await service.discover_complexes(region_code)
+    result = asyncio.run(service.discover_complexes(region_code))
 
     return {
         "region_code": result["region_code"],
@@ -1,14 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import date, datetime
 import csv
 import io
 
-from core.database import get_db
-from models import KBPrice, Transaction, Listing
+from core.database import get_read_db, get_async_read_db
+from core.pagination import MAX_PAGE_LIMIT, Keyset, set_next_cursor_header
+from models import KBPrice, Transaction, Listing, PriceRollupMonthly, RollupLevel, RollupSource
+from models.response_models import PricePerPyeongTrend
 
 router = APIRouter()
 
@@ -55,73 +59,146 @@ class ListingSchema(BaseModel):
         from_attributes = True
 
 
+class PriceRollupSchema(BaseModel):
+    level: RollupLevel
+    bucket_key: str
+    source: RollupSource
+    month: date
+    median_price_per_m2: Optional[float]
+    avg_price_per_m2: Optional[float]
+    median_price_per_pyeong: Optional[float]
+    avg_price_per_pyeong: Optional[float]
+    sample_count: int
+    refreshed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+_KB_PRICE_KEYSET = Keyset(KBPrice.as_of_date, KBPrice.id, descending=True)
+_TRANSACTION_KEYSET = Keyset(Transaction.contract_date, Transaction.id, descending=True)
+_LISTING_KEYSET = Keyset(Listing.fetched_at, Listing.id, descending=True)
+
+
 @router.get("/kb-prices", response_model=List[KBPriceSchema])
-def get_kb_prices(
+async def get_kb_prices(
+    response: Response,
     complex_id: Optional[int] = None,
     area_id: Optional[int] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """KB 시세 데이터 조회"""
-    query = db.query(KBPrice)
-    
+    """KB 시세 데이터 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(KBPrice)
+
     if complex_id:
-        query = query.filter(KBPrice.complex_id == complex_id)
+        query = query.where(KBPrice.complex_id == complex_id)
     if area_id:
-        query = query.filter(KBPrice.area_id == area_id)
+        query = query.where(KBPrice.area_id == area_id)
     if from_date:
-        query = query.filter(KBPrice.as_of_date >= from_date)
+        query = query.where(KBPrice.as_of_date >= from_date)
     if to_date:
-        query = query.filter(KBPrice.as_of_date <= to_date)
-    
-    prices = query.order_by(KBPrice.as_of_date.desc()).offset(skip).limit(limit).all()
-    return prices
+        query = query.where(KBPrice.as_of_date <= to_date)
+
+    prices = await db.execute(_KB_PRICE_KEYSET.apply(query, cursor, skip, limit))
+    items, next_cursor = _KB_PRICE_KEYSET.page(prices.scalars().all(), limit)
+    set_next_cursor_header(response, next_cursor)
+    return items
 
 
 @router.get("/transactions", response_model=List[TransactionSchema])
-def get_transactions(
+async def get_transactions(
+    response: Response,
     complex_id: Optional[int] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """실거래가 데이터 조회"""
-    query = db.query(Transaction)
-    
+    """실거래가 데이터 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(Transaction)
+
     if complex_id:
-        query = query.filter(Transaction.complex_id == complex_id)
+        query = query.where(Transaction.complex_id == complex_id)
     if from_date:
-        query = query.filter(Transaction.contract_date >= from_date)
+        query = query.where(Transaction.contract_date >= from_date)
     if to_date:
-        query = query.filter(Transaction.contract_date <= to_date)
-    
-    transactions = query.order_by(Transaction.contract_date.desc()).offset(skip).limit(limit).all()
-    return transactions
+        query = query.where(Transaction.contract_date <= to_date)
+
+    transactions = await db.execute(_TRANSACTION_KEYSET.apply(query, cursor, skip, limit))
+    items, next_cursor = _TRANSACTION_KEYSET.page(transactions.scalars().all(), limit)
+    set_next_cursor_header(response, next_cursor)
+    return items
 
 
 @router.get("/listings", response_model=List[ListingSchema])
-def get_listings(
+async def get_listings(
+    response: Response,
     complex_id: Optional[int] = None,
     status: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """매물 데이터 조회"""
-    query = db.query(Listing)
-    
+    """매물 데이터 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(Listing)
+
     if complex_id:
-        query = query.filter(Listing.complex_id == complex_id)
+        query = query.where(Listing.complex_id == complex_id)
     if status:
-        query = query.filter(Listing.status == status)
-    
-    listings = query.order_by(Listing.fetched_at.desc()).offset(skip).limit(limit).all()
-    return listings
+        query = query.where(Listing.status == status)
+
+    listings = await db.execute(_LISTING_KEYSET.apply(query, cursor, skip, limit))
+    items, next_cursor = _LISTING_KEYSET.page(listings.scalars().all(), limit)
+    set_next_cursor_header(response, next_cursor)
+    return items
+
+
+@router.get("/price-rollups", response_model=List[PriceRollupSchema])
+async def get_price_rollups(
+    level: RollupLevel,
+    bucket_key: str,
+    source: RollupSource = RollupSource.KB,
+    from_month: Optional[date] = None,
+    to_month: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """월별 평단가 집계 조회 (면적/단지/읍면동/시군구)"""
+    query = select(PriceRollupMonthly).where(
+        PriceRollupMonthly.level == level,
+        PriceRollupMonthly.bucket_key == bucket_key,
+        PriceRollupMonthly.source == source,
+    )
+    if from_month:
+        query = query.where(PriceRollupMonthly.month >= from_month.replace(day=1))
+    if to_month:
+        query = query.where(PriceRollupMonthly.month <= to_month)
+
+    rollups = await db.execute(query.order_by(PriceRollupMonthly.month))
+    return rollups.scalars().all()
+
+
+@router.get("/price-per-pyeong/{complex_id}", response_model=PricePerPyeongTrend)
+def get_price_per_pyeong(
+    complex_id: int,
+    months: int = Query(3, ge=1, le=120),
+    source: RollupSource = RollupSource.KB,
+    db: Session = Depends(get_read_db),
+):
+    """단지/읍면동/시군구 평단가 추이 (집계 테이블 기반)"""
+    from services.price_rollup import get_price_per_pyeong_trend
+
+    trend = get_price_per_pyeong_trend(db, complex_id, months=months, source=source)
+    if trend is None:
+        raise HTTPException(status_code=404, detail="No price rollup data for complex")
+    return trend
 
 
 @router.get("/kb-prices/export")
@@ -130,7 +207,7 @@ def export_kb_prices_csv(
     area_id: Optional[int] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """KB 시세 데이터 CSV 내보내기"""
     query = db.query(KBPrice)
@@ -1,20 +1,28 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import datetime
 
 import json
 
-from core.database import get_db
+from core.database import get_db, get_async_read_db
+from core.pagination import MAX_PAGE_LIMIT, Keyset, set_next_cursor_header
 from models import CrawlJob, CrawlRun, JobType, JobStatus, RunStatus
+from services.job_schedule import validate_cron
 from workers.tasks import (
+    backfill_price_history,
+    backfill_transaction_history,
     run_kb_collection,
     run_region_collection,
 )
 
 router = APIRouter()
 
+_JOB_KEYSET = Keyset(CrawlJob.id)
+
 
 # Pydantic schemas
 class JobCreateSchema(BaseModel):
@@ -54,29 +62,30 @@ class JobSchema(BaseModel):
         from_attributes = True
 
 
-def _enrich_jobs_with_last_run(jobs: list, db: Session) -> list:
-    """각 Job에 최신 CrawlRun 정보를 첨부"""
-    if not jobs:
-        return []
+def _validated_cron(expr: Optional[str]) -> Optional[str]:
+    """cron_schedule 검증 (5필드, 빈 값이면 스케줄 해제)"""
+    try:
+        return validate_cron(expr)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    job_ids = [j.id for j in jobs]
-    from sqlalchemy import func
 
-    # 각 job_id별 최신 run 조회 (subquery로 max started_at)
+def _latest_runs_query(job_ids: List[int]):
+    """각 job_id별 최신 CrawlRun 조회 쿼리 (subquery로 max id)"""
     subq = (
-        db.query(
+        select(
             CrawlRun.job_id,
             func.max(CrawlRun.id).label("max_id"),
         )
-        .filter(CrawlRun.job_id.in_(job_ids))
+        .where(CrawlRun.job_id.in_(job_ids))
         .group_by(CrawlRun.job_id)
         .subquery()
     )
-    latest_runs = (
-        db.query(CrawlRun)
-        .join(subq, CrawlRun.id == subq.c.max_id)
-        .all()
-    )
+    return select(CrawlRun).join(subq, CrawlRun.id == subq.c.max_id)
+
+
+def _attach_last_run(jobs: list, latest_runs: list) -> list:
+    """각 Job에 최신 CrawlRun 정보를 첨부"""
     run_map = {r.job_id: r for r in latest_runs}
 
     result = []
@@ -91,27 +100,47 @@ def _enrich_jobs_with_last_run(jobs: list, db: Session) -> list:
     return result
 
 
+def _enrich_jobs_with_last_run(jobs: list, db: Session) -> list:
+    """각 Job에 최신 CrawlRun 정보를 첨부"""
+    if not jobs:
+        return []
+    latest_runs = db.execute(_latest_runs_query([j.id for j in jobs])).scalars().all()
+    return _attach_last_run(jobs, latest_runs)
+
+
+async def _enrich_jobs_with_last_run_async(jobs: list, db: AsyncSession) -> list:
+    """각 Job에 최신 CrawlRun 정보를 첨부 (비동기 세션)"""
+    if not jobs:
+        return []
+    latest_runs = (await db.execute(_latest_runs_query([j.id for j in jobs]))).scalars().all()
+    return _attach_last_run(jobs, latest_runs)
+
+
 @router.get("/", response_model=List[JobSchema])
-def list_jobs(
-    skip: int = 0,
-    limit: int = 100,
+async def list_jobs(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
     status_filter: Optional[JobStatus] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """수집 작업 목록 조회"""
-    query = db.query(CrawlJob)
+    """수집 작업 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(CrawlJob)
 
     if status_filter:
-        query = query.filter(CrawlJob.status == status_filter)
+        query = query.where(CrawlJob.status == status_filter)
 
-    jobs = query.offset(skip).limit(limit).all()
-    return _enrich_jobs_with_last_run(jobs, db)
+    jobs = (await db.execute(_JOB_KEYSET.apply(query, cursor, skip, limit))).scalars().all()
+    jobs, next_cursor = _JOB_KEYSET.page(jobs, limit)
+    set_next_cursor_header(response, next_cursor)
+    return await _enrich_jobs_with_last_run_async(jobs, db)
 
 
 @router.get("/{job_id}", response_model=JobSchema)
-def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """작업 상세 조회"""
-    job = db.query(CrawlJob).filter(CrawlJob.id == job_id).first()
+    job = await db.get(CrawlJob, job_id)
 
     if not job:
         raise HTTPException(
@@ -119,7 +148,7 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
             detail="Job not found"
         )
 
-    enriched = _enrich_jobs_with_last_run([job], db)
+    enriched = await _enrich_jobs_with_last_run_async([job], db)
     return enriched[0]
 
 
@@ -128,7 +157,8 @@ def create_job(
     job_data: JobCreateSchema,
     db: Session = Depends(get_db),
 ):
-    """수집 작업 생성"""
+    """수집 작업 생성 (cron_schedule이 있으면 beat가 정기 실행)"""
+    job_data.cron_schedule = _validated_cron(job_data.cron_schedule)
     job = CrawlJob(**job_data.model_dump())
     db.add(job)
     db.commit()
@@ -140,9 +170,11 @@ def create_job(
 @router.post("/create-and-run", status_code=status.HTTP_202_ACCEPTED)
 def create_and_run_job(
     job_data: JobCreateSchema,
+    force: bool = False,
     db: Session = Depends(get_db),
 ):
-    """작업 생성 + 즉시 실행"""
+    """작업 생성 + 즉시 실행 (force=true면 수집 예정 시각과 무관하게 전체 수집)"""
+    job_data.cron_schedule = _validated_cron(job_data.cron_schedule)
     job = CrawlJob(**job_data.model_dump())
     db.add(job)
     db.commit()
@@ -167,12 +199,12 @@ def create_and_run_job(
                 detail="region_all 작업에 region_code가 설정되지 않았습니다",
             )
         task = run_region_collection.delay(
-            region_code=region_code, job_id=job.id, run_id=run.id,
+            region_code=region_code, job_id=job.id, run_id=run.id, force=force,
         )
     else:
         # KB 데이터 통합 수집 (시세 + 실거래 + 매물)
         task = run_kb_collection.delay(
-            job_id=job.id, run_id=run.id, target_config=job.target_config,
+            job_id=job.id, run_id=run.id, target_config=job.target_config, force=force,
         )
 
     return {
@@ -184,8 +216,8 @@ def create_and_run_job(
 
 
 @router.post("/{job_id}/run", status_code=status.HTTP_202_ACCEPTED)
-def run_job_now(job_id: int, db: Session = Depends(get_db)):
-    """작업 즉시 실행"""
+def run_job_now(job_id: int, force: bool = False, db: Session = Depends(get_db)):
+    """작업 즉시 실행 (force=true면 수집 예정 시각과 무관하게 전체 수집)"""
     job = db.query(CrawlJob).filter(CrawlJob.id == job_id).first()
 
     if not job:
@@ -219,12 +251,12 @@ def run_job_now(job_id: int, db: Session = Depends(get_db)):
                 detail="region_all 작업에 region_code가 설정되지 않았습니다",
             )
         task = run_region_collection.delay(
-            region_code=region_code, job_id=job.id, run_id=run.id,
+            region_code=region_code, job_id=job.id, run_id=run.id, force=force,
         )
     else:
         # KB 데이터 통합 수집 (시세 + 실거래 + 매물)
         task = run_kb_collection.delay(
-            job_id=job.id, run_id=run.id, target_config=job.target_config,
+            job_id=job.id, run_id=run.id, target_config=job.target_config, force=force,
         )
 
     return {
@@ -251,6 +283,8 @@ def update_job(
         )
 
     update_dict = update_data.model_dump(exclude_unset=True)
+    if "cron_schedule" in update_dict:
+        update_dict["cron_schedule"] = _validated_cron(update_dict["cron_schedule"])
     for key, value in update_dict.items():
         setattr(job, key, value)
 
@@ -298,6 +332,7 @@ def resume_job(job_id: int, db: Session = Depends(get_db)):
 @router.post("/run-region", status_code=status.HTTP_202_ACCEPTED)
 def run_region_collection_endpoint(
     region_code: str,
+    force: bool = False,
     db: Session = Depends(get_db),
 ):
     """
@@ -305,6 +340,7 @@ def run_region_collection_endpoint(
     자동으로 CrawlJob(region_all)을 생성하여 작업 탭에서도 확인 가능.
 
     - region_code: 법정동코드 (5자리 시군구 또는 10자리)
+    - force: true면 수집 예정 시각과 무관하게 전체 수집
     """
     # 같은 region_code의 기존 region_all 작업이 있으면 재사용
     target_json = json.dumps({"region_code": region_code})
@@ -336,7 +372,7 @@ def run_region_collection_endpoint(
     db.commit()
 
     task = run_region_collection.delay(
-        region_code=region_code, job_id=job.id, run_id=run.id,
+        region_code=region_code, job_id=job.id, run_id=run.id, force=force,
     )
     return {
         "message": f"{region_code} 지역 수집이 시작되었습니다",
@@ -344,3 +380,31 @@ def run_region_collection_endpoint(
         "run_id": run.id,
         "job_id": job.id,
     }
+
+
+@router.post("/backfill-prices", status_code=status.HTTP_202_ACCEPTED)
+def backfill_prices_endpoint(region_code: Optional[str] = None):
+    """
+    시세 이력 backfill — 이력이 없는 면적만 면적당 요청 1회로 채움.
+
+    - region_code: 법정동코드 (없으면 전체 활성 단지)
+    """
+    task = backfill_price_history.delay(region_code=region_code)
+    return {
+        "message": "시세 이력 backfill이 시작되었습니다",
+        "task_id": task.id,
+    }
+
+
+@router.post("/backfill-transactions", status_code=status.HTTP_202_ACCEPTED)
+def backfill_transactions_endpoint(region_code: Optional[str] = None):
+    """
+    연도별 과거 실거래 backfill (kb_backfill 큐, 일일 수집 중에는 대기).
+
+    - region_code: 법정동코드 (없으면 전체 활성 단지)
+    """
+    task = backfill_transaction_history.delay(region_code=region_code)
+    return {
+        "message": "실거래 이력 backfill이 시작되었습니다",
+        "task_id": task.id,
+    }
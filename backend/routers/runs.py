@@ -1,23 +1,38 @@
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from pydantic import BaseModel
 from datetime import datetime
 
-from core.database import get_db
-from models import Complex, CrawlRun, CrawlTask, RunStatus, TaskStatus
+from core.database import get_async_read_db, get_db
+from core.pagination import MAX_PAGE_LIMIT, Keyset, set_next_cursor_header
+from models import Complex, CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+from services import run_cancel
+from services.run_dispatch import reset_for_resume
+from services.run_summary import summarize_run
+from services.task_retry import REPLAY_TRIGGER, REPLAYABLE_TASK_TYPES
 
 router = APIRouter()
 
+_RUN_KEYSET = Keyset(CrawlRun.created_at, CrawlRun.id, descending=True)
+_TASK_KEYSET = Keyset(CrawlTask.id)
+_DEAD_LETTER_KEYSET = Keyset(CrawlTask.dead_lettered_at, CrawlTask.id, descending=True)
+
 
 # Pydantic schemas
 class TaskSchema(BaseModel):
     id: int
     task_key: str
+    task_type: Optional[TaskType] = None
+    complex_id: Optional[int] = None
+    area_id: Optional[int] = None
     status: TaskStatus
     started_at: Optional[datetime]
     finished_at: Optional[datetime]
     retry_count: int
+    covered_by_run_id: Optional[int] = None
     items_collected: int
     items_saved: int
     error_type: Optional[str]
@@ -37,6 +52,7 @@ class RunSchema(BaseModel):
     success_count: int
     failed_count: int
     skipped_count: int
+    requests_avoided: Optional[int] = 0
     created_at: datetime
 
     class Config:
@@ -51,54 +67,77 @@ class TargetComplexSchema(BaseModel):
 
 
 class RunDetailSchema(RunSchema):
+    error_summary: Optional[str] = None  # JSON (services.run_summary)
+    quality_warnings: Optional[str] = None  # JSON
     tasks: List[TaskSchema] = []
     target_complexes: List[TargetComplexSchema] = []
 
 
-def _extract_complex_ids_from_tasks(tasks) -> List[int]:
-    """task_key에서 complex_id를 추출"""
-    cids: set[int] = set()
-    for task in tasks:
-        parts = task.task_key.split("_")
-        try:
-            if parts[0] == "kb" and len(parts) >= 3:
-                cids.add(int(parts[2]))
-        except (ValueError, IndexError):
-            continue
-    return sorted(cids)
-
-
 class RunListItemSchema(RunSchema):
     target_summary: str = ""
 
 
+class DeadLetterSchema(TaskSchema):
+    run_id: int
+    dead_lettered_at: datetime
+
+
+class DeadLetterReplaySchema(BaseModel):
+    task_ids: Optional[List[int]] = None  # 비어 있으면 필터에 맞는 dead-letter 전체 (limit까지)
+    task_type: Optional[TaskType] = None
+    error_type: Optional[str] = None
+    limit: int = 1000
+
+
 @router.get("/", response_model=List[RunListItemSchema])
-def list_runs(
-    skip: int = 0,
-    limit: int = 100,
+async def list_runs(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
     job_id: Optional[int] = None,
     status_filter: Optional[RunStatus] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """실행 이력 목록 조회"""
-    query = db.query(CrawlRun).order_by(CrawlRun.created_at.desc())
+    """실행 이력 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(CrawlRun)
 
     if job_id:
-        query = query.filter(CrawlRun.job_id == job_id)
+        query = query.where(CrawlRun.job_id == job_id)
 
     if status_filter:
-        query = query.filter(CrawlRun.status == status_filter)
+        query = query.where(CrawlRun.status == status_filter)
 
-    runs = query.offset(skip).limit(limit).all()
+    runs = (await db.execute(_RUN_KEYSET.apply(query, cursor, skip, limit))).scalars().all()
+    runs, next_cursor = _RUN_KEYSET.page(runs, limit)
+    set_next_cursor_header(response, next_cursor)
+
+    # 페이지 내 run들의 대상 단지를 한 번에 조회
+    cids_by_run: Dict[int, List[int]] = {run.id: [] for run in runs}
+    if runs:
+        rows = await db.execute(
+            select(CrawlTask.run_id, CrawlTask.complex_id)
+            .where(
+                CrawlTask.run_id.in_(list(cids_by_run)),
+                CrawlTask.complex_id.isnot(None),
+            )
+            .distinct()
+            .order_by(CrawlTask.run_id, CrawlTask.complex_id)
+        )
+        for run_id, cid in rows.all():
+            cids_by_run[run_id].append(cid)
+    all_cids = {cid for cids in cids_by_run.values() for cid in cids}
+    name_map: Dict[int, str] = {}
+    if all_cids:
+        rows = await db.execute(select(Complex.id, Complex.name).where(Complex.id.in_(all_cids)))
+        name_map = dict(rows.all())
 
     # 각 run의 대상 단지 요약 생성
     results = []
     for run in runs:
-        cids = _extract_complex_ids_from_tasks(run.tasks)
+        names = [name_map[cid] for cid in cids_by_run[run.id] if cid in name_map]
         summary = ""
-        if cids:
-            complexes = db.query(Complex).filter(Complex.id.in_(cids)).all()
-            names = [c.name for c in complexes]
+        if names:
             if len(names) <= 3:
                 summary = ", ".join(names)
             else:
@@ -111,10 +150,84 @@ def list_runs(
     return results
 
 
+@router.get("/dead-letters", response_model=List[DeadLetterSchema])
+async def list_dead_letters(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+    task_type: Optional[TaskType] = None,
+    error_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """재시도를 모두 쓰거나 재시도할 수 없는 오류로 실패한 태스크 목록 (최근 순, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(CrawlTask).where(CrawlTask.dead_lettered_at.isnot(None))
+
+    if task_type:
+        query = query.where(CrawlTask.task_type == task_type)
+
+    if error_type:
+        query = query.where(CrawlTask.error_type == error_type)
+
+    tasks = (await db.execute(_DEAD_LETTER_KEYSET.apply(query, cursor, skip, limit))).scalars().all()
+    tasks, next_cursor = _DEAD_LETTER_KEYSET.page(tasks, limit)
+    set_next_cursor_header(response, next_cursor)
+    return tasks
+
+
+@router.post("/dead-letters/replay", status_code=status.HTTP_202_ACCEPTED)
+def replay_dead_letters(body: DeadLetterReplaySchema, db: Session = Depends(get_db)):
+    """dead-letter 태스크를 새 Run으로 재실행 (꺼낸 태스크는 dead-letter 목록에서 빠짐)"""
+    if body.limit <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be positive",
+        )
+
+    query = select(CrawlTask.id).where(
+        CrawlTask.dead_lettered_at.isnot(None),
+        CrawlTask.task_type.in_(REPLAYABLE_TASK_TYPES),
+    )
+    if body.task_ids:
+        query = query.where(CrawlTask.id.in_(body.task_ids))
+    if body.task_type:
+        query = query.where(CrawlTask.task_type == body.task_type)
+    if body.error_type:
+        query = query.where(CrawlTask.error_type == body.error_type)
+
+    task_ids = db.scalars(query.order_by(CrawlTask.id).limit(body.limit)).all()
+    if not task_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No dead-lettered tasks found",
+        )
+
+    run = CrawlRun(
+        job_id=None,
+        status=RunStatus.PENDING,
+        started_at=datetime.utcnow(),
+        triggered_by=REPLAY_TRIGGER,
+    )
+    db.add(run)
+    db.commit()
+
+    from workers.tasks import replay_dead_letters_task
+    task = replay_dead_letters_task.delay(run_id=run.id, task_ids=list(task_ids))
+
+    return {
+        "message": f"{len(task_ids)}개 태스크 재실행이 시작되었습니다",
+        "run_id": run.id,
+        "task_id": task.id,
+        "count": len(task_ids),
+    }
+
+
 @router.get("/{run_id}")
-def get_run(run_id: int, db: Session = Depends(get_db)):
+async def get_run(run_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """실행 상세 조회 (태스크 + 대상 단지 포함)"""
-    run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+    run = await db.scalar(
+        select(CrawlRun).options(selectinload(CrawlRun.tasks)).where(CrawlRun.id == run_id)
+    )
 
     if not run:
         raise HTTPException(
@@ -122,10 +235,10 @@ def get_run(run_id: int, db: Session = Depends(get_db)):
             detail="Run not found"
         )
 
-    cids = _extract_complex_ids_from_tasks(run.tasks)
+    cids = sorted({t.complex_id for t in run.tasks if t.complex_id is not None})
     target_complexes = []
     if cids:
-        complexes = db.query(Complex).filter(Complex.id.in_(cids)).all()
+        complexes = (await db.execute(select(Complex).where(Complex.id.in_(cids)))).scalars().all()
         target_complexes = [
             TargetComplexSchema(
                 id=c.id, name=c.name, address=c.address, region_code=c.region_code,
@@ -138,19 +251,108 @@ def get_run(run_id: int, db: Session = Depends(get_db)):
     return detail
 
 
+@router.post("/{run_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+def resume_run(run_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    부분 성공/실패 Run 재개: 실패했거나 끝나지 않은 태스크만 같은 Run에서 다시 수집.
+    Celery 없이 수집한 Run은 같은 방식(백그라운드)으로, 나머지는 Celery로 재개.
+    """
+    try:
+        resumed = reset_for_resume(db, run_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    if resumed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Run not found"
+        )
+
+    if resumed == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No failed or unfinished tasks to resume",
+        )
+
+    result = {
+        "message": f"{resumed}개 태스크 재수집이 시작되었습니다",
+        "run_id": run_id,
+        "count": resumed,
+    }
+
+    from services.sync_collector import SYNC_TRIGGER, resume_complex_sync
+    if db.scalar(select(CrawlRun.triggered_by).where(CrawlRun.id == run_id)) == SYNC_TRIGGER:
+        db.commit()
+        background_tasks.add_task(resume_complex_sync, run_id)
+        return result
+
+    # 되돌린 태스크/Run 상태는 발행에 성공한 뒤 커밋 (발행 실패 시 Run이 RUNNING으로 남지 않도록)
+    # 워커의 재개 작업은 Run 행 잠금이 풀릴 때까지 기다리므로 커밋 전에 발행해도 안전
+    from workers.tasks import resume_run_task
+    try:
+        task = resume_run_task.delay(run_id=run_id)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Resume could not be dispatched: {e}",
+        )
+    db.commit()
+    return {**result, "task_id": task.id}
+
+
+@router.post("/{run_id}/cancel")
+def cancel_run(run_id: int, db: Session = Depends(get_db)):
+    """
+    Run 취소: 시작하지 않은 태스크는 건너뛰고, 수집 중인 태스크는 다음 KB 요청 전에 중단.
+    결과 요약은 취소 시점 기준으로 바로 기록.
+    """
+    if db.get(CrawlRun, run_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Run not found"
+        )
+
+    cancelled = run_cancel.cancel_run(db, run_id)
+    if cancelled is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Run is already finished",
+        )
+
+    summarize_run(db, run_id)
+    if cancelled.success_count:
+        # 취소 전에 저장된 시세 반영
+        from workers.tasks import refresh_price_rollups_task
+        refresh_price_rollups_task.delay(run_id=run_id)
+
+    return {
+        "message": "실행이 취소되었습니다",
+        "run_id": run_id,
+        "skipped_count": cancelled.skipped_count or 0,
+    }
+
+
 @router.get("/{run_id}/tasks", response_model=List[TaskSchema])
-def get_run_tasks(
+async def get_run_tasks(
     run_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
     status_filter: Optional[TaskStatus] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """실행의 태스크 목록 조회"""
-    query = db.query(CrawlTask).filter(CrawlTask.run_id == run_id)
-    
+    """실행의 태스크 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = select(CrawlTask).where(CrawlTask.run_id == run_id)
+
     if status_filter:
-        query = query.filter(CrawlTask.status == status_filter)
-    
-    tasks = query.offset(skip).limit(limit).all()
+        query = query.where(CrawlTask.status == status_filter)
+
+    tasks = (await db.execute(_TASK_KEYSET.apply(query, cursor, skip, limit))).scalars().all()
+    tasks, next_cursor = _TASK_KEYSET.page(tasks, limit)
+    set_next_cursor_header(response, next_cursor)
     return tasks
@@ -1,4 +1,8 @@
-from models.response_models import AnalysisData, AnalysisResponse, AIAnalysis, RightsAnalysisDetail
+import logging
+import re
+from typing import Optional
+
+from models.response_models import AnalysisData, AnalysisResponse, AIAnalysis, RightsAnalysisDetail, PricePerPyeongTrend
 from services.dummy_data import (
     generate_borrower_info,
     generate_guarantor_info,
@@ -10,6 +14,8 @@ from services.dummy_data import (
     generate_price_per_pyeong_trend
 )
 
+logger = logging.getLogger(__name__)
+
 # TODO: Claude API 연동 시 아래 주석 해제
 # from services.claude_service import ClaudeClient
 # from utils.prompts import (
@@ -19,12 +25,85 @@ from services.dummy_data import (
 # )
 
 
+# 담보주소의 읍/면/동 토큰 (예: "대치동", "종로1가"). "2동"처럼 숫자로 시작하는 건물 동 번호는 제외
+_DONG_TOKEN = re.compile(r"^[가-힣]+\d*[동읍면가]$")
+
+
+def _address_dong(property_address: str) -> Optional[str]:
+    """담보주소에서 첫 읍/면/동 토큰"""
+    for token in property_address.split():
+        if _DONG_TOKEN.match(token):
+            return token
+    return None
+
+
+def _load_price_per_pyeong_trend(
+    property_address: str,
+    complex_id: Optional[int] = None,
+    region_code: Optional[str] = None,
+) -> Optional[PricePerPyeongTrend]:
+    """
+    담보 단지의 월별 평단가 집계 추이 조회.
+
+    단지는 인덱스 컬럼으로만 찾습니다 (담보주소로 단지 테이블 전체를 훑지 않음).
+    - complex_id: 단지 검색에서 선택한 수집 단지 (PK)
+    - region_code: 지역코드 앞자리 범위(idx_complex_region_code) 안에서 주소가 담보주소에 포함되는 단지
+    - 둘 다 없으면 담보주소의 읍/면/동을 포함하는 단지(idx_complex_address_trgm) 중에서 같은 방식으로 선택
+    수집 DB를 쓸 수 없거나 단지를 찾지 못하면 None (호출 측이 더미 추이로 대체).
+    """
+    try:
+        from sqlalchemy import func, literal
+        from sqlalchemy.exc import SQLAlchemyError
+        from core.database import ReadSessionLocal
+        from models import Complex
+        from services.price_rollup import get_price_per_pyeong_trend
+    except ImportError as e:
+        logger.warning(f"Price rollup lookup unavailable: {e}")
+        return None
+
+    if complex_id is None:
+        if region_code:
+            scope = Complex.region_code.like(f"{region_code}%")
+        else:
+            dong = _address_dong(property_address)
+            if not dong:
+                return None
+            scope = Complex.address.like(f"%{dong}%")
+
+    try:
+        db = ReadSessionLocal()
+        try:
+            if complex_id is None:
+                # 범위 안에서 담보주소에 단지 주소가 포함되는 가장 긴(구체적인) 단지 선택
+                matched = (
+                    db.query(Complex.id)
+                    .filter(
+                        scope,
+                        Complex.address != "",
+                        literal(property_address).contains(Complex.address),
+                    )
+                    .order_by(func.length(Complex.address).desc())
+                    .first()
+                )
+                if not matched:
+                    return None
+                complex_id = matched.id
+            return get_price_per_pyeong_trend(db, complex_id)
+        finally:
+            db.close()
+    except SQLAlchemyError as e:
+        logger.warning(f"Price per pyeong trend lookup failed for '{property_address}': {e}")
+        return None
+
+
 def perform_full_analysis(
     company_name: str,
     property_address: str,
-    loan_amount: int
+    loan_amount: int,
+    complex_id: Optional[int] = None,
+    region_code: Optional[str] = None,
 ) -> AnalysisResponse:
-    """전체 분석 수행"""
+    """전체 분석 수행 (complex_id/region_code: 평단가 집계를 읽을 수집 단지 식별)"""
 
     # 1. 더미 데이터 생성
     borrower_info = generate_borrower_info(company_name)
@@ -39,12 +118,14 @@ def perform_full_analysis(
     # 1-2. 인근 유사 물건지 동향
     nearby_trends = generate_nearby_property_trends(property_address, property_basic_info)
 
-    # 1-3. 평단가 추이
-    price_per_pyeong = generate_price_per_pyeong_trend(
-        property_address,
-        credit_data.kb_price.estimated,
-        property_basic_info.area
-    )
+    # 1-3. 평단가 추이 (수집 DB 집계 우선, 없으면 더미)
+    price_per_pyeong = _load_price_per_pyeong_trend(property_address, complex_id, region_code)
+    if price_per_pyeong is None:
+        price_per_pyeong = generate_price_per_pyeong_trend(
+            property_address,
+            credit_data.kb_price.estimated,
+            property_basic_info.area
+        )
 
     # 2. AI 종합 의견 생성 (하드코딩)
     # LTV 산출에 필요한 값
@@ -0,0 +1,108 @@
+"""
+Run 간 중복 수집 방지 (Redis, 클러스터 전체 기준).
+
+일일 작업, 시도 batch, 단지 즉시 수집(POST /complexes/{id}/collect, batch-collect)이
+같은 단지를 동시에 수집하면 KB 요청이 두 배가 되고 같은 행에 쓰기 충돌이 납니다.
+태스크 시작 시 collect_lease:{유형}:{단지}:{면적} 키를 SET NX로 선점하고,
+
+- 선점 성공: 수집 진행
+  - 수집 중에는 collection_inflight_stale_seconds 동안 선점 유지 (워커가 죽으면 그 뒤 만료)
+  - 성공/변경 없음으로 끝나면 collection_dedup_window_seconds 동안 유지 → 그 사이 다른 Run은 다시 수집하지 않음
+  - 실패하면 즉시 해제 → 다른 Run이 다시 수집 가능
+- 선점 실패: 다른 Run이 수집 중이거나 방금 수집함 → SKIPPED, covered_by_run_id에 그 Run 기록
+- 같은 태스크가 다시 실행되면 (메시지 중복 전달) 자기 선점으로 보고 진행
+- Redis를 쓸 수 없으면 중복 확인 없이 진행
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+import redis
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.redis import get_redis, mark_redis_unavailable
+from models import CrawlTask, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# 선점 토큰이 같을 때만 만료 시간 변경(ms) / 0이면 해제
+_FINISH_LEASE = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if tonumber(ARGV[2]) > 0 then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return redis.call('DEL', KEYS[1])
+"""
+
+# 선점을 유지할 종료 상태 (실패/미완료면 해제)
+_COVERING_STATUSES = (TaskStatus.SUCCESS, TaskStatus.SKIPPED)
+
+
+def _lease_key(task: CrawlTask) -> str:
+    area = task.area_id if task.area_id is not None else "-"
+    return f"collect_lease:{task.task_type.value}:{task.complex_id}:{area}"
+
+
+def _lease_token(task: CrawlTask) -> str:
+    return f"{task.run_id}:{task.id}"
+
+
+def _covering_run_id(token: str) -> Optional[int]:
+    run_id, _, _ = token.partition(":")
+    try:
+        return int(run_id)
+    except ValueError:
+        return None
+
+
+def claim_collection(task: CrawlTask) -> Optional[int]:
+    """
+    태스크 대상 선점. 다른 Run이 이미 수집 중이거나 방금 수집했으면 그 Run ID를 반환,
+    선점했거나(자기 선점 포함) 확인할 수 없으면 None.
+    """
+    if task.task_type is None or task.complex_id is None:
+        return None
+    client = get_redis()
+    if client is None:
+        return None
+    key, token = _lease_key(task), _lease_token(task)
+    try:
+        if client.set(key, token, nx=True, ex=settings.collection_inflight_stale_seconds):
+            return None
+        holder = client.get(key)
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return None
+    # 그 사이 만료됐거나 자기 선점이면 진행
+    if holder is None or holder == token:
+        return None
+    return _covering_run_id(holder)
+
+
+def finish_collection(task: CrawlTask):
+    """태스크 종료 시 호출: 성공/변경 없음이면 중복 방지 기간만큼 유지, 실패면 해제"""
+    if task.task_type is None or task.complex_id is None:
+        return
+    client = get_redis()
+    if client is None:
+        return
+    keep_ms = (
+        settings.collection_dedup_window_seconds * 1000
+        if task.status in _COVERING_STATUSES else 0
+    )
+    try:
+        client.eval(_FINISH_LEASE, 1, _lease_key(task), _lease_token(task), keep_ms)
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+
+
+def mark_covered(db: Session, task: CrawlTask, covering_run_id: int):
+    """다른 Run이 수집한 대상 → SKIPPED로 종료 (커밋 포함)"""
+    task.status = TaskStatus.SKIPPED
+    task.covered_by_run_id = covering_run_id
+    task.finished_at = datetime.utcnow()
+    db.commit()
+    logger.info(f"Task {task.task_key} skipped: covered by run {covering_run_id}")
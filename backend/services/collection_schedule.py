@@ -0,0 +1,235 @@
+"""
+단지별 수집 주기(due-date) 스케줄러.
+
+(단지, 데이터 유형)마다 다음 수집 예정 시각(next_due_at)을 두고, 수집 Run은 예정 시각이 지난 대상만 실행합니다.
+
+- 변경 주기 추정: 실제로 데이터가 바뀐 시각(last_change_at) 사이 간격의 지수이동평균(change_interval_seconds)
+  (원문이 이전과 같으면 SKIPPED, 바뀌어 저장하면 SUCCESS → SUCCESS만 변경으로 간주)
+- 다음 수집 시각:
+  - 다음 변경 예상 시각(마지막 변경 + 추정 주기 × 0.9)까지는 기다림
+  - 예상 시각이 지났는데 바뀌지 않았으면 지난 시간의 절반씩 간격을 늘려 점검 (변동 없는 단지는 점점 드물게)
+  - 유형별 최소/최대 간격으로 제한, 실패 시 짧은 간격으로 재시도
+  - 시세는 면적별 태스크가 단지 상태 한 행을 공유 → 실패한 면적이 남아 있으면 재시도 시각보다 늦추지 않음
+- 수집 이력이 없거나 next_due_at이 비어 있으면 항상 대상
+- force=True면 예정 시각과 무관하게 전체 수집
+- 같은 Run 안에서는 단지 우선순위(HIGH → NORMAL → LOW) 순으로 발행/수집
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from core.config import settings
+from models import Complex, ComplexCollectionState, CrawlTask, PriorityLevel, TaskStatus, TaskType
+
+logger = logging.getLogger(__name__)
+
+# 변경 주기 지수이동평균 가중치 (새 관측값 비중)
+CHANGE_INTERVAL_ALPHA = 0.3
+# 다음 변경 예상 시각보다 조금 일찍 점검
+EXPECTED_CHANGE_LEAD = 0.9
+# 예상 시각이 지난 뒤 점검 간격 = 초과 시간 × 이 값
+OVERDUE_BACKOFF = 0.5
+
+
+@dataclass(frozen=True)
+class DuePolicy:
+    """데이터 유형별 수집 간격 (시간)"""
+    default_hours: float
+    min_hours: float
+    max_hours: float
+
+
+# KB 시세는 주 단위로 갱신, 매물은 수시로 바뀜
+DUE_POLICIES: Dict[TaskType, DuePolicy] = {
+    TaskType.KB_PRICE: DuePolicy(default_hours=24 * 7, min_hours=24, max_hours=24 * 14),
+    TaskType.KB_TRANSACTION: DuePolicy(default_hours=24 * 7, min_hours=24, max_hours=24 * 14),
+    TaskType.KB_LISTING: DuePolicy(default_hours=24, min_hours=12, max_hours=24 * 7),
+}
+
+_PRIORITY_RANK = {PriorityLevel.HIGH: 0, PriorityLevel.NORMAL: 1, PriorityLevel.LOW: 2}
+
+
+def by_collection_priority(complexes: Iterable[Complex]) -> List[Complex]:
+    """단지 우선순위 순으로 정렬 (우선순위가 없으면 NORMAL, 같은 순위는 기존 순서 유지)"""
+    return sorted(complexes, key=lambda c: _PRIORITY_RANK.get(c.priority, 1))
+
+
+def next_due_at(
+    policy: DuePolicy,
+    now: datetime,
+    last_change_at: Optional[datetime],
+    change_interval_seconds: Optional[float],
+) -> datetime:
+    """마지막 변경 시각과 추정 변경 주기로 다음 수집 시각 계산"""
+    expected = timedelta(seconds=change_interval_seconds or policy.default_hours * 3600)
+    if last_change_at is None:
+        wait = expected * EXPECTED_CHANGE_LEAD
+    else:
+        expected_change = last_change_at + expected * EXPECTED_CHANGE_LEAD
+        if now < expected_change:
+            wait = expected_change - now
+        else:
+            wait = (now - expected_change) * OVERDUE_BACKOFF
+
+    wait = max(wait, timedelta(hours=policy.min_hours))
+    wait = min(wait, timedelta(hours=policy.max_hours))
+    return now + wait
+
+
+def _pending_failure_retry(db: Session, task: CrawlTask, policy: DuePolicy, now: datetime) -> Optional[datetime]:
+    """
+    같은 단지/유형의 다른 대상(면적) 중 마지막 결과가 실패인 대상의 가장 이른 재시도 시각.
+    (단지 단위 유형은 태스크 자체가 전체 대상이므로 없음)
+    """
+    if task.area_id is None:
+        return None
+    later = aliased(CrawlTask)
+    failed_at = db.scalar(
+        select(func.min(CrawlTask.finished_at)).where(
+            CrawlTask.complex_id == task.complex_id,
+            CrawlTask.task_type == task.task_type,
+            CrawlTask.area_id != task.area_id,
+            CrawlTask.status == TaskStatus.FAILED,
+            CrawlTask.finished_at >= now - timedelta(hours=policy.max_hours),
+            # 그 면적의 마지막 결과인 실패만 (이후 다시 수집했으면 해소)
+            ~exists().where(
+                later.complex_id == CrawlTask.complex_id,
+                later.task_type == CrawlTask.task_type,
+                later.area_id == CrawlTask.area_id,
+                later.status.in_((TaskStatus.SUCCESS, TaskStatus.SKIPPED, TaskStatus.FAILED)),
+                later.started_at > CrawlTask.started_at,
+            ),
+        )
+    )
+    if failed_at is None:
+        return None
+    return failed_at + timedelta(hours=settings.collection_failure_retry_hours)
+
+
+def _superseded(db: Session, task: CrawlTask) -> bool:
+    """같은 대상(단지/유형/면적)을 더 늦게 시작한 태스크가 있는지"""
+    return db.scalar(
+        select(
+            exists().where(
+                CrawlTask.complex_id == task.complex_id,
+                CrawlTask.task_type == task.task_type,
+                CrawlTask.area_id.is_not_distinct_from(task.area_id),
+                CrawlTask.started_at > task.started_at,
+                CrawlTask.id != task.id,
+            )
+        )
+    )
+
+
+def schedule_next_collection(db: Session, task: CrawlTask, latest: bool = True):
+    """
+    종료된 태스크 결과로 변경 이력/추정 주기/다음 수집 시각 갱신 (커밋은 호출 측에서).
+    같은 단지의 면적별 시세 태스크가 동시에 끝날 수 있으므로 상태 행을 잠그고 계산.
+    latest=False(더 늦게 시작한 태스크가 이미 상태를 갱신함)면 실패 재시도 시각만 앞당기고 나머지는 유지.
+    """
+    policy = DUE_POLICIES.get(task.task_type)
+    if policy is None or task.complex_id is None:
+        return
+    if not latest and (task.status != TaskStatus.FAILED or _superseded(db, task)):
+        return
+
+    now = task.finished_at or datetime.utcnow()
+    state = db.execute(
+        select(
+            ComplexCollectionState.last_change_at,
+            ComplexCollectionState.change_interval_seconds,
+            ComplexCollectionState.next_due_at,
+        )
+        .where(
+            ComplexCollectionState.complex_id == task.complex_id,
+            ComplexCollectionState.task_type == task.task_type,
+        )
+        .with_for_update()
+    ).first()
+    if state is None:
+        return
+
+    last_change_at = state.last_change_at
+    change_interval = state.change_interval_seconds
+
+    if task.status == TaskStatus.FAILED:
+        due = now + timedelta(hours=settings.collection_failure_retry_hours)
+        # 다른 면적 실패 등으로 이미 더 이른 예정 시각이 잡혀 있으면 유지
+        if state.next_due_at is not None and now < state.next_due_at < due:
+            due = state.next_due_at
+    else:
+        if task.status == TaskStatus.SUCCESS:
+            # 같은 Run의 다른 면적 태스크처럼 짧은 간격의 변경은 주기 추정에서 제외
+            if last_change_at is not None:
+                observed = (now - last_change_at).total_seconds()
+                if observed >= policy.min_hours * 3600:
+                    change_interval = (
+                        observed if change_interval is None
+                        else CHANGE_INTERVAL_ALPHA * observed + (1 - CHANGE_INTERVAL_ALPHA) * change_interval
+                    )
+            last_change_at = now
+        due = next_due_at(policy, now, last_change_at, change_interval)
+        # 다른 면적이 실패한 채 남아 있으면 그 재시도 시각까지만
+        retry_at = _pending_failure_retry(db, task, policy, now)
+        if retry_at is not None and retry_at < due:
+            due = retry_at
+
+    db.execute(
+        update(ComplexCollectionState)
+        .where(
+            ComplexCollectionState.complex_id == task.complex_id,
+            ComplexCollectionState.task_type == task.task_type,
+        )
+        .values(
+            last_change_at=last_change_at,
+            change_interval_seconds=change_interval,
+            next_due_at=due,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def due_task_types(
+    db: Session,
+    complex_ids: Iterable[int],
+    task_types: Iterable[TaskType],
+    force: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[int, Set[TaskType]]:
+    """
+    단지별로 지금 수집해야 하는 데이터 유형.
+    예정 시각이 아직 오지 않은 (단지, 유형)만 제외하고 나머지는 모두 대상.
+    """
+    complex_ids = list(complex_ids)
+    task_types = list(task_types)
+    due = {cid: set(task_types) for cid in complex_ids}
+    if force or not complex_ids:
+        return due
+
+    now = now or datetime.utcnow()
+    not_due = db.execute(
+        select(ComplexCollectionState.complex_id, ComplexCollectionState.task_type).where(
+            ComplexCollectionState.task_type.in_(task_types),
+            ComplexCollectionState.next_due_at > now,
+        )
+    ).all()
+    for cid, task_type in not_due:
+        if cid in due:
+            due[cid].discard(task_type)
+
+    return {cid: types for cid, types in due.items() if types}
+
+
+def log_due_summary(scope: str, total_complexes: int, due: Dict[int, Set[TaskType]], force: bool):
+    counts: Dict[str, int] = {}
+    for types in due.values():
+        for task_type in types:
+            counts[task_type.value] = counts.get(task_type.value, 0) + 1
+    logger.info(
+        f"{scope}: {len(due)}/{total_complexes} complexes due"
+        f"{' (forced)' if force else ''} {counts}"
+    )
@@ -0,0 +1,231 @@
+"""
+단지별 마지막 수집 상태 서비스.
+
+수집 태스크가 끝날 때마다 (단지, 태스크 유형) 한 행을 upsert 하여
+"단지별 마지막 수집" 조회가 이력 크기와 무관하게 상태 테이블 한 번 읽기로 끝나도록 합니다.
+
+- 태스크 식별: CrawlTask.task_type / complex_id / area_id (task_key 문자열 파싱 없음)
+- 상태 갱신: INSERT ... ON CONFLICT DO UPDATE, 더 늦게 시작한 태스크만 덮어씀
+  (덮어쓰지 못한 과거 태스크는 다음 수집 시각을 늦추지 않음)
+- 원문이 이전과 같아 쓰기를 건너뛴 태스크(SKIPPED)도 성공 확인으로 기록 (last_success_at)
+- 변경 없음 SKIPPED는 묶음/단지 단위로 모아 여러 행 upsert 한 번으로 반영 (CollectionStateBatch)
+- Run 취소로 중단된 태스크(SKIPPED, error_type=Cancelled)는 성공도 실패도 아니므로 반영하지 않음
+- 같은 트랜잭션에서 다음 수집 예정 시각 갱신 (services.collection_schedule)
+- 기존 DB: 컬럼 추가 및 task_key 기반 이력 backfill (ensure_task_identity)
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import Integer, cast, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from core.database import ensure_columns
+from services.run_cancel import CANCELLED_ERROR_TYPE
+from models import ComplexCollectionState, CrawlTask, TaskStatus, TaskType
+from services.collection_schedule import schedule_next_collection
+
+logger = logging.getLogger(__name__)
+
+
+# 데이터 확인에 성공한 것으로 보는 상태 (SKIPPED: 원문 변경 없음)
+_CONFIRMED_STATUSES = (TaskStatus.SUCCESS, TaskStatus.SKIPPED)
+
+
+def _state_values(task: CrawlTask, payload_hash: Optional[str] = None) -> Dict[str, Any]:
+    return dict(
+        complex_id=task.complex_id,
+        task_type=task.task_type,
+        last_run_id=task.run_id,
+        last_task_id=task.id,
+        last_status=task.status,
+        last_started_at=task.started_at,
+        last_finished_at=task.finished_at,
+        last_success_at=task.finished_at if task.status in _CONFIRMED_STATUSES else None,
+        last_error_message=task.error_message,
+        last_payload_hash=payload_hash,
+        updated_at=datetime.utcnow(),
+    )
+
+
+def _state_upsert(rows: Union[Dict[str, Any], List[Dict[str, Any]]]):
+    """상태 행 upsert 문 (rows: 한 행 또는 (단지, 유형)이 겹치지 않는 여러 행)"""
+    state = ComplexCollectionState.__table__
+    stmt = pg_insert(state).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[state.c.complex_id, state.c.task_type],
+        set_={
+            "last_run_id": excluded.last_run_id,
+            "last_task_id": excluded.last_task_id,
+            "last_status": excluded.last_status,
+            "last_started_at": excluded.last_started_at,
+            "last_finished_at": excluded.last_finished_at,
+            "last_success_at": func.coalesce(excluded.last_success_at, state.c.last_success_at),
+            "last_error_message": excluded.last_error_message,
+            "last_payload_hash": func.coalesce(excluded.last_payload_hash, state.c.last_payload_hash),
+            "updated_at": excluded.updated_at,
+        },
+        # 늦게 끝난 과거 태스크가 최신 상태를 덮어쓰지 않도록
+        where=(
+            state.c.last_started_at.is_(None)
+            | (state.c.last_started_at <= excluded.last_started_at)
+        ),
+    )
+
+
+def _recordable(task: CrawlTask) -> bool:
+    # 재시도 대기 중이거나 다시 발행할 태스크(묶음 시간 초과)는 아직 종료되지 않음
+    if task.complex_id is None or task.task_type is None or task.status in (TaskStatus.RETRY, TaskStatus.PENDING):
+        return False
+    # 취소로 중단: 수집 실패로 기록하지 않고 다음 수집 예정 시각도 그대로
+    return task.error_type != CANCELLED_ERROR_TYPE
+
+
+def record_task_state(db: Session, task: CrawlTask, payload_hash: Optional[str] = None):
+    """종료된 태스크 결과를 단지별 수집 상태에 반영 (payload_hash: 저장 완료된 원문 해시)"""
+    if not _recordable(task):
+        return
+    try:
+        latest = (db.execute(_state_upsert(_state_values(task, payload_hash))).rowcount or 0) > 0
+        schedule_next_collection(db, task, latest=latest)
+        db.commit()
+    except Exception as e:
+        logger.warning(f"Collection state update failed for task {task.id}: {e}")
+        db.rollback()
+
+
+class CollectionStateBatch:
+    """
+    원문 변경 없음으로 쓰기를 건너뛴 태스크(SKIPPED)의 확인 시각 갱신을 모아 한 번에 반영.
+
+    사용법 (Celery 묶음 / 동기 수집의 단지 단위):
+        states = CollectionStateBatch(db)
+        states.record(task_record)          # 변경 없음 → 버퍼, 그 밖의 결과 → 바로 record_task_state
+        ...
+        states.flush()                      # 여러 행 upsert 한 번 + 다음 수집 시각 갱신 + 커밋
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        # (단지, 유형) → (상태 행 값, 태스크): 같은 단지의 면적별 시세는 가장 늦게 시작한 태스크만
+        self._pending: Dict[Tuple[int, TaskType], Tuple[Dict[str, Any], CrawlTask]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, task: CrawlTask, payload_hash: Optional[str] = None):
+        if payload_hash is not None or task.status != TaskStatus.SKIPPED or not _recordable(task):
+            record_task_state(self.db, task, payload_hash=payload_hash)
+            return
+        key = (task.complex_id, task.task_type)
+        values = _state_values(task)
+        current = self._pending.get(key)
+        started_at = values["last_started_at"] or datetime.min
+        if current is None or (current[0]["last_started_at"] or datetime.min) <= started_at:
+            self._pending[key] = (values, task)
+
+    def flush(self) -> int:
+        """모아 둔 확인 시각 반영, 갱신한 상태 행 수 반환 (실패 시 0)"""
+        if not self._pending:
+            return 0
+        # 동시에 끝나는 다른 묶음과 같은 순서로 행을 잠그도록 정렬
+        pending = [self._pending[key] for key in sorted(self._pending)]
+        self._pending = {}
+        state = ComplexCollectionState.__table__
+        try:
+            updated = {
+                (row.complex_id, row.task_type)
+                for row in self.db.execute(
+                    _state_upsert([values for values, _ in pending]).returning(state.c.complex_id, state.c.task_type)
+                )
+            }
+            for _, task in pending:
+                schedule_next_collection(self.db, task, latest=(task.complex_id, task.task_type) in updated)
+            self.db.commit()
+            return len(updated)
+        except Exception as e:
+            logger.warning(f"Collection state batch update failed for {len(pending)} tasks: {e}")
+            self.db.rollback()
+            return 0
+
+
+# =============================================================================
+# 기존 DB 대응 (컬럼 추가 + 이력 backfill)
+# =============================================================================
+
+def _backfill_task_identity(db: Session) -> int:
+    """task_key(kb_price_{cid}_{aid}, kb_transaction_{cid}, kb_listing_{cid}) → 구조화 컬럼"""
+    updated = 0
+    for task_type in TaskType:
+        result = db.execute(
+            update(CrawlTask)
+            .where(
+                CrawlTask.task_type.is_(None),
+                CrawlTask.task_key.op("~")(rf"^{task_type.value}_\d+(_\d+)?$"),
+            )
+            .values(
+                task_type=task_type,
+                complex_id=cast(func.split_part(CrawlTask.task_key, "_", 3), Integer),
+                area_id=cast(func.nullif(func.split_part(CrawlTask.task_key, "_", 4), ""), Integer),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount or 0
+    return updated
+
+
+def rebuild_collection_state(db: Session):
+    """태스크 이력 전체에서 단지별 수집 상태 재구성 (기존 상태 행은 유지)"""
+    partition = (CrawlTask.complex_id, CrawlTask.task_type)
+    latest = (
+        select(
+            CrawlTask.complex_id,
+            CrawlTask.task_type,
+            CrawlTask.run_id,
+            CrawlTask.id,
+            CrawlTask.status,
+            CrawlTask.started_at,
+            CrawlTask.finished_at,
+            func.max(CrawlTask.finished_at)
+            .filter(CrawlTask.status.in_(_CONFIRMED_STATUSES))
+            .over(partition_by=partition),
+            CrawlTask.error_message,
+            func.now(),
+        )
+        .where(CrawlTask.complex_id.isnot(None), CrawlTask.task_type.isnot(None))
+        .distinct(*partition)
+        .order_by(*partition, CrawlTask.started_at.desc().nulls_last(), CrawlTask.id.desc())
+    )
+    state = ComplexCollectionState.__table__
+    db.execute(
+        pg_insert(state)
+        .from_select(
+            [
+                "complex_id", "task_type", "last_run_id", "last_task_id", "last_status",
+                "last_started_at", "last_finished_at", "last_success_at",
+                "last_error_message", "updated_at",
+            ],
+            latest,
+        )
+        .on_conflict_do_nothing(index_elements=[state.c.complex_id, state.c.task_type])
+    )
+
+
+def ensure_task_identity(engine: Engine):
+    """
+    기존 crawl_tasks 테이블에 구조화 컬럼/인덱스를 추가하고 이력을 backfill.
+    (create_all은 이미 존재하는 테이블에 컬럼을 추가하지 않음)
+    """
+    added = ensure_columns(engine, CrawlTask.__table__)
+    if "task_type" not in added:
+        return
+
+    with Session(engine) as db:
+        updated = _backfill_task_identity(db)
+        if updated:
+            rebuild_collection_state(db)
+            logger.info(f"Backfilled task identity for {updated} legacy tasks")
+        db.commit()
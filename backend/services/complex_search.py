@@ -0,0 +1,183 @@
+"""
+단지 검색 (pg_trgm 기반)
+
+- contains: 기존 부분일치 검색 (ILIKE/LIKE '%q%'). 검색 컬럼마다 trigram GIN 인덱스를 사용
+- ranked: 부분일치 + 단어 유사도(오타 허용) 후보를 유사도 순으로 정렬.
+  전체 일치 건을 정렬하지 않도록 컬럼별 유사도 상위 후보(trigram GiST, `<<->` 거리순)만 뽑아 정렬
+- 5자리 이상 숫자 검색어는 코드 검색: 지역코드 앞자리 일치(법정동코드 계층) + KB 단지 ID 부분일치
+
+한글 trigram 추출은 DB locale(LC_CTYPE)이 UTF-8 계열이어야 동작합니다.
+(C locale에서는 한글이 단어 문자로 인식되지 않아 유사도 검색 후보가 나오지 않음)
+"""
+import enum
+from typing import List
+
+from sqlalchemy import func, literal, or_, select, text, union
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from core.config import settings
+from models import Complex
+
+# 주소 유사도는 단지명보다 낮은 가중치로 정렬
+ADDRESS_WEIGHT = 0.8
+
+# 검색 컬럼별 trigram GIN 인덱스 (인덱스 이름 → 컬럼).
+# contrib(pg_trgm)이 없는 DB에서도 create_all이 실패하지 않도록 모델에 두지 않고 ensure_search_indexes에서 생성
+TRGM_INDEXES = {
+    "idx_complex_name_trgm": "name",
+    "idx_complex_address_trgm": "address",
+    "idx_complex_kb_id_trgm": "kb_complex_id",
+    "idx_complex_region_trgm": "region_code",
+}
+
+# 유사도 거리순(KNN) 후보 조회용 trigram GiST 인덱스.
+# 기본 시그니처(12바이트)는 한글 trigram이 많이 겹쳐 재검사가 많으므로 크게 잡음
+TRGM_KNN_INDEXES = {
+    "idx_complex_name_trgm_knn": "name",
+    "idx_complex_address_trgm_knn": "address",
+}
+TRGM_KNN_SIGLEN = 256
+
+# 이 길이 이상의 숫자 검색어는 코드 검색 (시군구코드 5자리)
+CODE_QUERY_MIN_LENGTH = 5
+
+
+class SearchMode(str, enum.Enum):
+    """단지 검색 방식"""
+    CONTAINS = "contains"
+    RANKED = "ranked"
+
+
+def is_code_query(q: str) -> bool:
+    """지역코드(시군구 이상)/KB 단지 ID 형태의 검색어인지"""
+    return q.isdigit() and len(q) >= CODE_QUERY_MIN_LENGTH
+
+
+def _contains(column, q: str):
+    """
+    부분일치 조건. 대소문자 구분이 없는 검색어(한글/숫자)는 LIKE로 비교합니다.
+    ILIKE는 비ASCII 문자열을 행마다 소문자로 바꿔 비교해 한글 검색어에서 3배가량 느림
+    """
+    pattern = f"%{q}%"
+    if q.lower() == q.upper():
+        return column.like(pattern)
+    return column.ilike(pattern)
+
+
+def contains_filter(q: str):
+    """
+    단지명/주소/KB 단지 ID/지역코드 부분일치.
+
+    코드 형태 검색어는 지역코드 앞자리 일치 + KB 단지 ID 부분일치만 검사합니다.
+    지역코드 중간 자리 일치는 의미가 없고, 앞자리 일치는 idx_complex_region_code 범위 조건입니다.
+    """
+    if is_code_query(q):
+        return or_(
+            Complex.region_code.like(f"{q}%"),
+            _contains(Complex.kb_complex_id, q),
+        )
+    return or_(
+        _contains(Complex.name, q),
+        _contains(Complex.address, q),
+        _contains(Complex.kb_complex_id, q),
+        _contains(Complex.region_code, q),
+    )
+
+
+def ranked_filter(q: str):
+    """부분일치 또는 단어 유사도가 임계값 이상인 단지 (`col %> q` == word_similarity(q, col) > 임계값)"""
+    if is_code_query(q):
+        return contains_filter(q)
+    return or_(
+        contains_filter(q),
+        Complex.name.op("%>")(q),
+        Complex.address.op("%>")(q),
+    )
+
+
+def rank_expression(q: str):
+    """검색어와 단지의 유사도 점수 (0~1)"""
+    return func.greatest(
+        func.word_similarity(q, Complex.name),
+        func.word_similarity(q, Complex.address) * ADDRESS_WEIGHT,
+    )
+
+
+def _nearest(q: str, column, limit: int, criteria):
+    """단어 유사도가 임계값 이상인 단지 중 column 유사도 상위 limit건 (GiST 거리순 인덱스 스캔)"""
+    return (
+        select(Complex.id)
+        .where(column.op("%>")(q), *criteria)
+        .order_by(literal(q).op("<<->")(column))
+        .limit(limit)
+    )
+
+
+def ranked_query(q: str, candidates: int, *criteria) -> Select:
+    """
+    유사도 순 단지 조회 (criteria: 검색 외 필터, 정렬: 유사도 desc, name, id).
+
+    일치 건 전체의 유사도를 계산해 정렬하면 흔한 검색어(브랜드, 동 이름)에서 수백 ms가 걸리므로
+    단지명 유사도 상위, 주소 유사도 상위, (name, id) 순 부분일치 각 candidates건만 후보로 정렬합니다.
+    유사도 점수는 두 컬럼 유사도의 최댓값이므로 임계값 이상 단지의 상위 candidates건 순위는 전체 정렬과 같고,
+    임계값 미만인 부분일치 단지는 (name, id) 순 candidates건까지만 반영됩니다.
+    코드 검색어는 유사도가 의미 없으므로 부분일치 후보만 사용합니다.
+    """
+    contains = (
+        select(Complex.id)
+        .where(contains_filter(q), *criteria)
+        .order_by(Complex.name, Complex.id)
+        .limit(candidates)
+    )
+    if is_code_query(q):
+        candidate_ids = contains.subquery("candidates")
+    else:
+        candidate_ids = union(
+            _nearest(q, Complex.name, candidates, criteria),
+            _nearest(q, Complex.address, candidates, criteria),
+            contains,
+        ).subquery("candidates")
+    return (
+        select(Complex)
+        .where(Complex.id.in_(select(candidate_ids.c.id)))
+        .order_by(rank_expression(q).desc(), Complex.name, Complex.id)
+    )
+
+
+async def set_similarity_threshold(db: AsyncSession):
+    """현재 트랜잭션에 한해 word_similarity 임계값 설정"""
+    await db.execute(
+        select(
+            func.set_config(
+                "pg_trgm.word_similarity_threshold",
+                str(settings.complex_search_similarity_threshold),
+                True,
+            )
+        )
+    )
+
+
+def trgm_index_statements(table: str = Complex.__tablename__) -> List[str]:
+    """trigram 인덱스 생성 DDL (table: 스키마 포함 테이블명)"""
+    return [
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)"
+        for name, column in TRGM_INDEXES.items()
+    ] + [
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+        f"USING gist ({column} gist_trgm_ops(siglen={TRGM_KNN_SIGLEN}))"
+        for name, column in TRGM_KNN_INDEXES.items()
+    ]
+
+
+def ensure_search_indexes(engine: Engine):
+    """
+    pg_trgm 확장과 trigram 인덱스 생성 (시작 시 호출).
+    pg_trgm을 쓸 수 없으면 예외 → 호출 측은 경고만 남기고, 검색은 인덱스 없이 동작
+    (ranked 검색은 pg_trgm 함수가 필요).
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for statement in trgm_index_statements():
+            conn.execute(text(statement))
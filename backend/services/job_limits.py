@@ -0,0 +1,146 @@
+"""
+작업(CrawlJob)별 동시 실행 수 / 요청 속도 제한 (Redis, 클러스터 전체 기준).
+
+CrawlJob.max_concurrency, rate_limit_per_minute를 워커 수와 무관하게 적용합니다.
+
+- 동시 실행: job_slots:{job_id} sorted set에 (토큰, 만료 시각)으로 슬롯 임대
+  - 꽉 차 있으면 획득 실패 → 태스크는 잠시 뒤 재시도
+  - 종료 시 반납, 워커가 죽어 반납하지 못한 슬롯은 임대 만료(job_slot_lease_seconds) 후 회수
+  - 요청할 때마다 임대 연장 (오래 걸리는 매물 페이지 순회 중 만료되지 않도록)
+- 요청 속도: job_rate:{job_id}에 다음 요청 가능 시각을 예약해서 작업 전체 요청 간격을 60/분당 한도 초로 유지
+  (커넥터 인스턴스별 기본 한도는 그대로 적용, 작업 한도는 그 위의 상한)
+- backfill Run은 작업 대신 backfill 전체가 하나의 요청 한도(settings.backfill_rate_limit_per_minute)를 나눠 씀
+- Redis를 쓸 수 없으면 작업 단위 제한 없이 진행 (커넥터별 기본 한도만 적용)
+"""
+import logging
+import time
+import uuid
+from typing import Optional, Union
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.redis import get_redis, mark_redis_unavailable
+from models import CrawlJob
+
+logger = logging.getLogger(__name__)
+
+# backfill 요청 한도 Redis 키 (job_rate:backfill)
+BACKFILL_THROTTLE_KEY = "backfill"
+
+# 만료된 임대를 정리하고 빈 슬롯이 있으면 임대
+_ACQUIRE_SLOT = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[4])
+    redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])))
+    return 1
+end
+return 0
+"""
+
+# 다음 요청 가능 시각 예약, 기다려야 할 시간(ms) 반환
+_RESERVE_REQUEST = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local start = math.max(now, tonumber(redis.call('GET', KEYS[1]) or '0'))
+redis.call('SET', KEYS[1], start + interval, 'PX', start + interval - now + 1000)
+return start - now
+"""
+
+
+class JobThrottle:
+    """
+    작업 하나의 슬롯/요청 속도 제한.
+
+    사용법:
+        throttle = JobThrottle.for_job(db, job_id)
+        if throttle and not throttle.acquire_slot(): (잠시 뒤 재시도)
+        connector.request_gate = throttle.wait_for_request
+        ...
+        finally: throttle.release_slot()
+    """
+
+    def __init__(
+        self, job_id: Union[int, str], max_concurrency: Optional[int], rate_limit_per_minute: Optional[int],
+    ):
+        self.job_id = job_id
+        self.max_concurrency = max_concurrency
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.token = uuid.uuid4().hex
+        self.holding = False
+        self._slot_key = f"job_slots:{job_id}"
+        self._rate_key = f"job_rate:{job_id}"
+
+    @classmethod
+    def for_job(cls, db: Session, job_id: Optional[int]) -> Optional["JobThrottle"]:
+        """작업 설정 조회 (작업이 없거나 제한이 모두 비어 있으면 None)"""
+        if job_id is None:
+            return None
+        limits = db.execute(
+            select(CrawlJob.max_concurrency, CrawlJob.rate_limit_per_minute).where(CrawlJob.id == job_id)
+        ).first()
+        if limits is None or not (limits.max_concurrency or limits.rate_limit_per_minute):
+            return None
+        return cls(job_id, limits.max_concurrency, limits.rate_limit_per_minute)
+
+    @classmethod
+    def for_backfill(cls) -> "JobThrottle":
+        """backfill 태스크 전체가 나눠 쓰는 요청 속도 제한 (슬롯 제한 없음)"""
+        return cls(BACKFILL_THROTTLE_KEY, None, settings.backfill_rate_limit_per_minute)
+
+    def acquire_slot(self) -> bool:
+        """동시 실행 슬롯 임대 (제한이 없거나 Redis를 쓸 수 없으면 True)"""
+        if not self.max_concurrency:
+            return True
+        client = get_redis()
+        if client is None:
+            return True
+        try:
+            acquired = client.eval(
+                _ACQUIRE_SLOT, 1, self._slot_key,
+                time.time(), settings.job_slot_lease_seconds, self.max_concurrency, self.token,
+            )
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return True
+        self.holding = bool(acquired)
+        return self.holding
+
+    def release_slot(self):
+        if not self.holding:
+            return
+        self.holding = False
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.zrem(self._slot_key, self.token)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+
+    def wait_for_request(self):
+        """KB 요청 직전 호출: 작업 전체 요청 간격 유지 + 슬롯 임대 연장"""
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            if self.holding:
+                client.zadd(
+                    self._slot_key, {self.token: time.time() + settings.job_slot_lease_seconds}, xx=True,
+                )
+            if not self.rate_limit_per_minute:
+                return
+            wait_ms = client.eval(
+                _RESERVE_REQUEST, 1, self._rate_key, int(60000 / self.rate_limit_per_minute),
+            )
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return
+        if wait_ms and wait_ms > 0:
+            logger.debug(f"Job {self.job_id}: rate limit wait {wait_ms / 1000:.2f}s")
+            time.sleep(wait_ms / 1000)
@@ -0,0 +1,92 @@
+"""
+CrawlJob 정기 실행 스케줄.
+
+CrawlJob.cron_schedule(시/도 배치 스케줄 포함)을 celery beat 항목으로 변환합니다.
+실제 beat 스케줄러는 workers.beat_scheduler.DatabaseScheduler.
+
+- cron 표현식: 5필드 (분 시 일 월 요일), settings.schedule_timezone 기준
+- ACTIVE 상태이고 cron_schedule이 있는 작업만 대상
+- 같은 시각으로 설정된 작업(예: 시/도 배치 16개)이 동시에 시작하지 않도록
+  작업별 고정 오프셋(job id 해시, 0 ~ beat_stagger_window_seconds)만큼 늦춰 실행
+"""
+import hashlib
+import logging
+from typing import List, Optional, Tuple
+
+from celery.schedules import crontab
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models import CrawlJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_TRIGGER = "schedule"
+
+
+def normalize_cron(expr: Optional[str]) -> Optional[str]:
+    """공백 정리, 빈 문자열은 None (스케줄 해제)"""
+    if expr is None:
+        return None
+    expr = " ".join(expr.split())
+    return expr or None
+
+
+def parse_cron(expr: str) -> crontab:
+    """5필드 cron 표현식 → celery crontab. 잘못된 표현식이면 ValueError"""
+    fields = normalize_cron(expr)
+    parts = fields.split(" ") if fields else []
+    if len(parts) != 5:
+        raise ValueError(f"cron 표현식은 5개 필드(분 시 일 월 요일)여야 합니다: {expr!r}")
+    minute, hour, day_of_month, month_of_year, day_of_week = parts
+    try:
+        return crontab(
+            minute=minute,
+            hour=hour,
+            day_of_month=day_of_month,
+            month_of_year=month_of_year,
+            day_of_week=day_of_week,
+        )
+    except Exception as e:
+        raise ValueError(f"잘못된 cron 표현식 {expr!r}: {e}") from e
+
+
+def validate_cron(expr: Optional[str]) -> Optional[str]:
+    """API 입력 검증용: 정규화한 표현식 반환 (None이면 스케줄 해제)"""
+    expr = normalize_cron(expr)
+    if expr is not None:
+        parse_cron(expr)
+    return expr
+
+
+def stagger_offset_seconds(job_id: int) -> int:
+    """작업별 고정 시작 지연 (같은 cron이라도 작업마다 다른 시각에 시작)"""
+    window = settings.beat_stagger_window_seconds
+    if window <= 0:
+        return 0
+    digest = hashlib.sha1(f"crawl_job:{job_id}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") % window
+
+
+def load_scheduled_jobs(db: Session) -> List[Tuple[int, str, crontab]]:
+    """정기 실행 대상 작업 (job_id, cron 표현식, crontab). 잘못된 표현식은 경고 후 제외"""
+    rows = db.execute(
+        select(CrawlJob.id, CrawlJob.cron_schedule)
+        .where(
+            CrawlJob.status == JobStatus.ACTIVE,
+            CrawlJob.cron_schedule.isnot(None),
+        )
+        .order_by(CrawlJob.id)
+    ).all()
+
+    jobs = []
+    for job_id, expr in rows:
+        expr = normalize_cron(expr)
+        if expr is None:
+            continue
+        try:
+            jobs.append((job_id, expr, parse_cron(expr)))
+        except ValueError as e:
+            logger.warning(f"Job {job_id}: schedule ignored: {e}")
+    return jobs
@@ -0,0 +1,169 @@
+"""
+매물 사전 점검 (probe) / 증분 수집.
+
+전체 매물 페이지를 순회하기 전에 brif의 거래유형별 매물 건수와
+첫 페이지(최신 등록순)의 최신 등록일/매물 ID로 지문을 만들고,
+마지막 전체 수집 때와 같으면 나머지 페이지 요청을 생략합니다.
+
+- 지문 구성은 KBListingConnector의 listing_probe_signature 참고
+- 첫 페이지는 전체 수집에도 그대로 쓰이므로 점검 자체의 추가 요청은 없음
+- 한 페이지로 끝나는 단지는 생략할 요청이 없으므로 점검하지 않음
+- 지문이 같아도 마지막 전체 수집이 settings.listing_probe_max_age_hours보다 오래되면 전체 수집
+- 생략한 요청 수는 crawl_runs.requests_avoided에 누적
+
+증분 수집 (지문이 달라진 경우):
+- 최신 등록순 페이지를 받다가, 한 페이지 전체가 이미 아는 ACTIVE 매물이고 호가도 같으면 중단
+- 삭제 대조: brif 건수 == 마지막 수집 건수 + 새로 발견한 매물 수일 때만 중단 (다르면 삭제가 있었으므로 전체 수집)
+- 증분 수집에서는 안 보인 매물을 REMOVED로 바꾸지 않음, 주기적 전체 수집에서만 정리
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models import ComplexCollectionState, CrawlRun, Listing, ListingStatus, TaskType
+from services.payload_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class ListingProbe:
+    """
+    단지 하나의 매물 사전 점검/증분 수집 상태.
+
+    사용법:
+        probe = ListingProbe(db, complex_id)
+        result = connector.collect(complex_id=complex_id, probe=probe)
+        if result.get("unchanged"): ...
+        (저장 후) probe.remember()
+        probe.complete가 False면 증분 수집 → 안 보인 매물을 삭제 처리하지 않음
+    """
+
+    def __init__(self, db: Session, complex_id: int):
+        self.db = db
+        self.complex_id = complex_id
+        self.digest: Optional[str] = None
+        self.requests_avoided = 0
+        # 이번 수집 결과 (커넥터가 기록)
+        self.listing_count: Optional[int] = None
+        self.complete = True
+        self._state = None
+
+    def unchanged(self, signature: Dict[str, Any], remaining_pages: int) -> bool:
+        """지문이 마지막 전체 수집과 같고 유효 기간 안이면 True (나머지 페이지 생략)"""
+        self.digest = content_hash(signature)
+        state = self._load_state()
+        if state is None or state.probe_hash != self.digest or not self._full_fetch_fresh(state):
+            return False
+
+        self.requests_avoided = remaining_pages
+        return True
+
+    def known_prices(self) -> Optional[Dict[str, int]]:
+        """
+        증분 수집 기준 (ACTIVE 매물 ID → 호가).
+        전체 수집 주기가 지났거나 기준 건수가 없으면 None (전체 수집).
+        """
+        state = self._load_state()
+        if state is None or state.last_listing_count is None or not self._full_fetch_fresh(state):
+            return None
+        rows = self.db.execute(
+            select(Listing.source_listing_id, Listing.ask_price).where(
+                Listing.complex_id == self.complex_id,
+                Listing.status == ListingStatus.ACTIVE,
+            )
+        ).all()
+        return dict(rows)
+
+    def can_stop(self, listing_count: int, new_listings: int) -> bool:
+        """건수 대조: 새 매물 외에 늘거나 줄어든 매물이 없을 때만 True"""
+        return listing_count == self._load_state().last_listing_count + new_listings
+
+    def record_fetch(self, listing_count: int, complete: bool, requests_avoided: int = 0):
+        """커넥터가 이번 수집 결과 기록"""
+        self.listing_count = listing_count
+        self.complete = complete
+        self.requests_avoided = requests_avoided
+
+    def remember(self):
+        """수집 저장 완료 시 지문/건수 기록, 전체 수집이면 수집 시각도 갱신 (커밋 포함)"""
+        if self.digest is None and self.listing_count is None:
+            return
+        now = datetime.utcnow()
+        values = {
+            "probe_hash": self.digest,
+            "last_listing_count": self.listing_count,
+        }
+        if self.complete:
+            values["last_full_fetch_at"] = now
+        stmt = insert(ComplexCollectionState).values(
+            complex_id=self.complex_id,
+            task_type=TaskType.KB_LISTING,
+            updated_at=now,
+            **values,
+        )
+        try:
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[ComplexCollectionState.complex_id, ComplexCollectionState.task_type],
+                set_={key: getattr(stmt.excluded, key) for key in values},
+            ))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Listing probe state update failed for complex {self.complex_id}: {e}")
+
+    def _load_state(self):
+        if self._state is None:
+            self._state = self.db.execute(
+                select(
+                    ComplexCollectionState.probe_hash,
+                    ComplexCollectionState.last_full_fetch_at,
+                    ComplexCollectionState.last_listing_count,
+                ).where(
+                    ComplexCollectionState.complex_id == self.complex_id,
+                    ComplexCollectionState.task_type == TaskType.KB_LISTING,
+                )
+            ).first()
+        return self._state
+
+    @staticmethod
+    def _full_fetch_fresh(state) -> bool:
+        if state.last_full_fetch_at is None:
+            return False
+        max_age = timedelta(hours=settings.listing_probe_max_age_hours)
+        return datetime.utcnow() - state.last_full_fetch_at <= max_age
+
+
+def record_requests_avoided(db: Session, run_id: int, count: int):
+    """Run의 생략 요청 수 누적 (원자적 증가)"""
+    if count <= 0:
+        return
+    try:
+        db.execute(
+            update(CrawlRun)
+            .where(CrawlRun.id == run_id)
+            .values(requests_avoided=func.coalesce(CrawlRun.requests_avoided, 0) + count)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Run {run_id}: requests_avoided update failed: {e}")
+
+
+def touch_active_listings(db: Session, complex_id: int) -> int:
+    """
+    변경 없음(사전 점검 지문/원문 해시 일치)으로 파싱을 건너뛴 단지의 ACTIVE 매물 확인 시각 갱신 (커밋은 호출 측에서).
+    매물 행마다 비교하지 않고 단지 단위 UPDATE 한 번.
+    """
+    result = db.execute(
+        update(Listing)
+        .where(Listing.complex_id == complex_id, Listing.status == ListingStatus.ACTIVE)
+        .values(last_seen_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
@@ -0,0 +1,104 @@
+"""
+원문 해시 기반 변경 감지.
+
+(태스크 유형, 단지, 면적)별로 마지막으로 저장에 성공한 원문 해시를 기억해 두고,
+새로 받은 응답의 해시가 같으면 파싱과 DB 쓰기를 건너뜁니다.
+
+- 조회 순서: Redis → 프로세스 내 캐시 → DB
+  - DB: 시세는 최신 kb_prices.payload_hash, 실거래/매물은 complex_collection_state.last_payload_hash
+    (면적별 실거래 이력은 DB 폴백 없음)
+- 기억(remember)은 저장 커밋 이후에만 수행 (쓰기 실패 시 다음 수집에서 다시 저장)
+"""
+import logging
+from typing import Any, Dict, Optional
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.redis import get_redis, mark_redis_unavailable
+from models import ComplexCollectionState, KBPrice, TaskType
+from services.payload_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "payload_hash"
+
+# Redis를 쓸 수 없을 때의 프로세스 내 캐시
+_local_hashes: Dict[str, str] = {}
+
+
+class PayloadFingerprint:
+    """
+    태스크 하나의 원문 변경 감지.
+
+    사용법:
+        fingerprint = PayloadFingerprint(db, TaskType.KB_PRICE, complex_id, area_id)
+        result = connector.collect(..., skip_unchanged=fingerprint.matches)
+        if result.get("unchanged"): ...
+        (저장 후) fingerprint.remember()
+    """
+
+    def __init__(self, db: Session, task_type: TaskType, complex_id: int, area_id: Optional[int] = None):
+        self.db = db
+        self.task_type = task_type
+        self.complex_id = complex_id
+        self.area_id = area_id
+        self.digest: Optional[str] = None
+        self._key = f"{_KEY_PREFIX}:{task_type.value}:{complex_id}:{area_id or 0}"
+
+    def matches(self, payload: Any) -> bool:
+        """응답 해시를 계산하고 마지막 저장 해시와 같은지 반환"""
+        self.digest = content_hash(payload)
+        return self.digest == self._last_digest()
+
+    def remember(self):
+        """저장 완료된 응답 해시 기록"""
+        if self.digest is None:
+            return
+        _local_hashes[self._key] = self.digest
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.set(self._key, self.digest, ex=settings.payload_hash_ttl_seconds)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+
+    def _last_digest(self) -> Optional[str]:
+        client = get_redis()
+        if client is not None:
+            try:
+                digest = client.get(self._key)
+                if digest:
+                    return digest
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+
+        digest = _local_hashes.get(self._key)
+        if digest:
+            return digest
+
+        digest = self._stored_digest()
+        if digest:
+            _local_hashes[self._key] = digest
+        return digest
+
+    def _stored_digest(self) -> Optional[str]:
+        if self.task_type == TaskType.KB_PRICE:
+            return self.db.scalar(
+                select(KBPrice.payload_hash)
+                .where(KBPrice.complex_id == self.complex_id, KBPrice.area_id == self.area_id)
+                .order_by(KBPrice.as_of_date.desc())
+                .limit(1)
+            )
+        if self.area_id is not None:
+            # 면적별 태스크(실거래 이력)는 단지 단위 해시와 비교할 수 없음
+            return None
+        return self.db.scalar(
+            select(ComplexCollectionState.last_payload_hash).where(
+                ComplexCollectionState.complex_id == self.complex_id,
+                ComplexCollectionState.task_type == self.task_type,
+            )
+        )
@@ -0,0 +1,419 @@
+"""
+원문(raw payload) 저장소.
+
+KB 응답 원문을 콘텐츠 주소(SHA-256) 기준으로 한 번만 저장합니다.
+
+- 해시: 정규화 JSON(키 정렬, 공백 제거)의 SHA-256 → 같은 응답은 같은 해시
+- 압축: zstd (엔드포인트별 학습 사전이 있으면 사전 압축)
+- 저장 위치: 압축 후 작은 원문은 raw_payloads.inline_content, 큰 원문은 파일시스템/S3
+- 중복 제거: 이미 저장된 해시는 본문 없이 참조 행(task_id → content_hash)만 추가
+- 배치 쓰기: add()로 모은 뒤 flush() 한 번에 기존 해시 조회 1회 + INSERT 1회
+
+raw_payloads 행 하나는 태스크 하나에 대응합니다.
+본문(inline_content/storage_path)은 해시별로 최초 저장한 행에만 있고, load(hash)는 그 행을 찾아 복원합니다.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import zstandard
+from sqlalchemy import insert, or_, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models import PayloadDictionary, RawPayload
+
+logger = logging.getLogger(__name__)
+
+CODEC_ZSTD = "zstd"
+_DICT_CODEC_PREFIX = "zstd-dict:"
+
+# 사전 캐시: endpoint → (dict_id, ZstdCompressionDict), dict_id → ZstdCompressionDict
+_latest_dicts: Dict[str, Optional[Tuple[int, zstandard.ZstdCompressionDict]]] = {}
+_dicts_by_id: Dict[int, zstandard.ZstdCompressionDict] = {}
+
+
+def canonical_json_bytes(data: Any) -> bytes:
+    """해시/압축용 정규화 JSON (키 정렬, 공백 제거)"""
+    return json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    ).encode("utf-8")
+
+
+def content_hash(data: Any) -> str:
+    """원문 콘텐츠 해시 (SHA-256 hex)"""
+    return hashlib.sha256(canonical_json_bytes(data)).hexdigest()
+
+
+# =============================================================================
+# 큰 원문 저장 백엔드
+# =============================================================================
+
+class FilesystemBackend:
+    """로컬 파일시스템: {root}/ab/cd/{hash}.zst"""
+
+    scheme = "file"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.payload_store_dir
+
+    def _relative_path(self, digest: str) -> str:
+        return os.path.join(digest[:2], digest[2:4], f"{digest}.zst")
+
+    def put(self, digest: str, blob: bytes) -> str:
+        relative = self._relative_path(digest)
+        path = os.path.join(self.root, relative)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        return f"{self.scheme}://{relative}"
+
+    def get(self, storage_path: str) -> bytes:
+        relative = storage_path.split("://", 1)[1]
+        with open(os.path.join(self.root, relative), "rb") as f:
+            return f.read()
+
+
+class S3Backend:
+    """S3 호환 버킷 (MinIO 등): s3://{bucket}/payloads/ab/{hash}.zst"""
+
+    scheme = "s3"
+
+    def __init__(self):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("payload_store_backend=s3 requires boto3 (pip install boto3)") from e
+
+        self.bucket = settings.s3_bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint,
+            aws_access_key_id=settings.s3_access_key,
+            aws_secret_access_key=settings.s3_secret_key,
+        )
+
+    def put(self, digest: str, blob: bytes) -> str:
+        key = f"payloads/{digest[:2]}/{digest}.zst"
+        self.client.put_object(
+            Bucket=self.bucket, Key=key, Body=blob, ContentType="application/zstd",
+        )
+        return f"{self.scheme}://{self.bucket}/{key}"
+
+    def get(self, storage_path: str) -> bytes:
+        bucket, key = storage_path.split("://", 1)[1].split("/", 1)
+        return self.client.get_object(Bucket=bucket, Key=key)["Body"].read()
+
+
+def get_backend(name: Optional[str] = None):
+    """설정된 큰 원문 저장 백엔드 (none이면 None)"""
+    name = (name or settings.payload_store_backend).lower()
+    if name == "filesystem":
+        return FilesystemBackend()
+    if name == "s3":
+        return S3Backend()
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown payload_store_backend: {name}")
+
+
+# =============================================================================
+# 압축 사전
+# =============================================================================
+
+def _latest_dictionary(db: Session, endpoint: Optional[str]):
+    if not endpoint:
+        return None
+    if endpoint not in _latest_dicts:
+        row = db.execute(
+            select(PayloadDictionary.id, PayloadDictionary.dict_data)
+            .where(PayloadDictionary.endpoint == endpoint)
+            .order_by(PayloadDictionary.id.desc())
+            .limit(1)
+        ).first()
+        if row is None:
+            _latest_dicts[endpoint] = None
+        else:
+            zdict = zstandard.ZstdCompressionDict(row.dict_data)
+            _dicts_by_id[row.id] = zdict
+            _latest_dicts[endpoint] = (row.id, zdict)
+    return _latest_dicts[endpoint]
+
+
+def _dictionary_by_id(db: Session, dict_id: int) -> zstandard.ZstdCompressionDict:
+    if dict_id not in _dicts_by_id:
+        dict_data = db.scalar(
+            select(PayloadDictionary.dict_data).where(PayloadDictionary.id == dict_id)
+        )
+        if dict_data is None:
+            raise LookupError(f"Payload dictionary {dict_id} not found")
+        _dicts_by_id[dict_id] = zstandard.ZstdCompressionDict(dict_data)
+    return _dicts_by_id[dict_id]
+
+
+def train_payload_dictionary(
+    db: Session,
+    endpoint: str,
+    sample_limit: int = 2000,
+    dict_size: int = 112640,
+) -> Optional[int]:
+    """
+    저장된 원문 샘플로 엔드포인트별 zstd 사전 학습 후 저장.
+    이후 저장되는 원문부터 새 사전으로 압축 (기존 원문은 기록된 사전으로 계속 복원).
+    """
+    hashes = db.scalars(
+        select(RawPayload.content_hash)
+        .where(
+            RawPayload.endpoint == endpoint,
+            or_(RawPayload.inline_content.isnot(None), RawPayload.storage_path.isnot(None)),
+        )
+        .order_by(RawPayload.id.desc())
+        .limit(sample_limit)
+    ).all()
+
+    store = PayloadStore(db)
+    samples = []
+    for digest in dict.fromkeys(hashes):
+        try:
+            samples.append(canonical_json_bytes(store.load(digest)))
+        except Exception as e:
+            logger.warning(f"Skipping payload {digest} for dictionary training: {e}")
+
+    if len(samples) < 10:
+        logger.warning(f"Not enough samples to train dictionary for {endpoint}: {len(samples)}")
+        return None
+
+    zdict = zstandard.train_dictionary(dict_size, samples)
+    record = PayloadDictionary(
+        endpoint=endpoint,
+        dict_data=zdict.as_bytes(),
+        sample_count=len(samples),
+    )
+    db.add(record)
+    db.commit()
+
+    _dicts_by_id[record.id] = zdict
+    _latest_dicts[endpoint] = (record.id, zdict)
+    logger.info(f"Trained payload dictionary {record.id} for {endpoint} ({len(samples)} samples)")
+    return record.id
+
+
+def load_dictionaries(db: Session, dict_ids: Iterable[int]) -> Dict[int, bytes]:
+    """사전 id 목록 → {id: 사전 바이트} (다른 프로세스로 넘길 때 사용)"""
+    dict_ids = set(dict_ids)
+    if not dict_ids:
+        return {}
+    rows = db.execute(
+        select(PayloadDictionary.id, PayloadDictionary.dict_data)
+        .where(PayloadDictionary.id.in_(dict_ids))
+    ).all()
+    return {row.id: bytes(row.dict_data) for row in rows}
+
+
+def dictionary_id(codec: Optional[str]) -> Optional[int]:
+    """압축 방식 문자열에서 사전 id 추출 (사전 미사용이면 None)"""
+    if codec and codec.startswith(_DICT_CODEC_PREFIX):
+        return int(codec[len(_DICT_CODEC_PREFIX):])
+    return None
+
+
+def decompress_payload(
+    blob: bytes, codec: Optional[str], dictionaries: Dict[int, zstandard.ZstdCompressionDict],
+) -> Any:
+    """압축 본문 → 원문 (DB 접근 없음, 워커 프로세스에서도 사용)"""
+    dict_id = dictionary_id(codec)
+    if dict_id is not None:
+        decompressor = zstandard.ZstdDecompressor(dict_data=dictionaries[dict_id])
+    else:
+        decompressor = zstandard.ZstdDecompressor()
+    return json.loads(decompressor.decompress(blob))
+
+
+# =============================================================================
+# 저장소
+# =============================================================================
+
+class PayloadStore:
+    """
+    원문 배치 저장/조회.
+
+    사용법:
+        store = PayloadStore(db)
+        store.add(task_id, raw, endpoint="kb_price")
+        store.flush()
+    """
+
+    def __init__(self, db: Session, backend=None, inline_max_bytes: Optional[int] = None):
+        self.db = db
+        self.backend = backend if backend is not None else get_backend()
+        self.inline_max_bytes = (
+            settings.payload_inline_max_bytes if inline_max_bytes is None else inline_max_bytes
+        )
+        self._pending: List[Dict[str, Any]] = []
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(
+        self,
+        task_id: int,
+        payload: Any,
+        endpoint: Optional[str] = None,
+        parser_version: Optional[str] = None,
+        payload_type: str = "json",
+        partial: bool = False,
+    ):
+        """저장할 원문 추가 (flush 전까지 DB에 쓰지 않음). partial: 전체가 아닌 일부만 담긴 원문"""
+        if payload is None:
+            return
+        data = canonical_json_bytes(payload)
+        self._pending.append({
+            "task_id": task_id,
+            "endpoint": endpoint,
+            "parser_version": parser_version,
+            "payload_type": payload_type,
+            "partial": partial,
+            "content_hash": hashlib.sha256(data).hexdigest(),
+            "data": data,
+        })
+
+    def _compress(self, data: bytes, endpoint: Optional[str]) -> Tuple[bytes, str]:
+        latest = _latest_dictionary(self.db, endpoint)
+        if latest is not None:
+            dict_id, zdict = latest
+            compressor = zstandard.ZstdCompressor(level=settings.payload_zstd_level, dict_data=zdict)
+            return compressor.compress(data), f"{_DICT_CODEC_PREFIX}{dict_id}"
+        compressor = zstandard.ZstdCompressor(level=settings.payload_zstd_level)
+        return compressor.compress(data), CODEC_ZSTD
+
+    def flush(self) -> int:
+        """
+        모은 원문을 저장하고 추가된 행 수를 반환 (커밋 포함). 저장 실패는 수집 결과에 영향을 주지 않음:
+        원문 쓰기는 savepoint 안에서 하고 실패하면 savepoint만 되돌림 (호출 측 세션의 변경은 유지).
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        try:
+            with self.db.begin_nested():
+                rows = self._build_rows(pending)
+                self.db.execute(insert(RawPayload), rows)
+        except Exception as e:
+            logger.warning(f"Raw payload flush failed ({len(pending)} payloads): {e}")
+            return 0
+        self.db.commit()
+        return len(rows)
+
+    def _build_rows(self, pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """raw_payloads 행 목록. 아직 본문이 없는 해시만 압축해서 인라인/백엔드에 저장"""
+        hashes = {p["content_hash"] for p in pending}
+        stored = set(self.db.scalars(
+            select(RawPayload.content_hash).where(
+                RawPayload.content_hash.in_(hashes),
+                or_(RawPayload.inline_content.isnot(None), RawPayload.storage_path.isnot(None)),
+            )
+        ).all())
+
+        now = datetime.utcnow()
+        rows = []
+        for p in pending:
+            row = {
+                "task_id": p["task_id"],
+                "payload_type": p["payload_type"],
+                "content_hash": p["content_hash"],
+                "endpoint": p["endpoint"],
+                "parser_version": p["parser_version"],
+                "partial": p["partial"],
+                "storage_path": None,
+                "inline_content": None,
+                "size_bytes": 0,
+                "raw_size_bytes": len(p["data"]),
+                "compressed": True,
+                "compression": None,
+                "created_at": now,
+            }
+            if p["content_hash"] not in stored:
+                self._store_content(p, row)
+                stored.add(p["content_hash"])
+            rows.append(row)
+        return rows
+
+    def _store_content(self, pending: Dict[str, Any], row: Dict[str, Any]):
+        blob, codec = self._compress(pending["data"], pending["endpoint"])
+        row["compression"] = codec
+        row["size_bytes"] = len(blob)
+        if len(blob) <= self.inline_max_bytes or self.backend is None:
+            if self.backend is None and len(blob) > self.inline_max_bytes:
+                logger.warning(
+                    f"Payload {pending['content_hash']} ({len(blob)} bytes) stored inline: no backend configured"
+                )
+            row["inline_content"] = base64.b64encode(blob).decode("ascii")
+        else:
+            row["storage_path"] = self.backend.put(pending["content_hash"], blob)
+
+    def fetch_blobs(self, digests: Iterable[str]) -> Dict[str, Tuple[bytes, str]]:
+        """해시 목록 → {해시: (압축 본문, 압축 방식)} (조회 1회, 압축 해제는 호출 측에서)"""
+        digests = set(digests)
+        if not digests:
+            return {}
+        rows = self.db.execute(
+            select(
+                RawPayload.content_hash,
+                RawPayload.inline_content,
+                RawPayload.storage_path,
+                RawPayload.compression,
+            )
+            .where(
+                RawPayload.content_hash.in_(digests),
+                or_(RawPayload.inline_content.isnot(None), RawPayload.storage_path.isnot(None)),
+            )
+            .distinct(RawPayload.content_hash)
+            .order_by(RawPayload.content_hash, RawPayload.id)
+        ).all()
+
+        blobs = {}
+        for row in rows:
+            if row.inline_content is not None:
+                blob = base64.b64decode(row.inline_content)
+            else:
+                blob = self._backend_for(row.storage_path).get(row.storage_path)
+            blobs[row.content_hash] = (blob, row.compression or CODEC_ZSTD)
+        return blobs
+
+    def load(self, digest: str) -> Any:
+        """해시로 원문 복원"""
+        blobs = self.fetch_blobs([digest])
+        if digest not in blobs:
+            raise LookupError(f"Raw payload {digest} not found")
+        blob, codec = blobs[digest]
+        dict_id = dictionary_id(codec)
+        dictionaries = {dict_id: _dictionary_by_id(self.db, dict_id)} if dict_id else {}
+        return decompress_payload(blob, codec, dictionaries)
+
+    def _backend_for(self, storage_path: str):
+        scheme = storage_path.split("://", 1)[0]
+        if self.backend is not None and self.backend.scheme == scheme:
+            return self.backend
+        if scheme == FilesystemBackend.scheme:
+            return FilesystemBackend()
+        if scheme == S3Backend.scheme:
+            return S3Backend()
+        raise ValueError(f"Unknown storage path: {storage_path}")
+
+
+def store_raw_payload(db: Session, task_id: int, payload: Any, connector, partial: bool = False):
+    """단일 태스크 원문 저장 (Celery 태스크용)"""
+    store = PayloadStore(db)
+    store.add(
+        task_id, payload, endpoint=connector.name, parser_version=connector.PARSER_VERSION, partial=partial,
+    )
+    store.flush()
+
@@ -0,0 +1,417 @@
+"""
+월별 평단가 집계(rollup) 서비스.
+
+kb_prices / transactions 원본을 면적·단지·읍면동·시군구 단위의 월별 집계로
+미리 계산해 두고, 추이 차트와 분석은 집계 테이블의 몇 행만 읽도록 합니다.
+
+갱신 전략:
+- 수집 Run이 끝나면 해당 Run이 수집에 성공한 단지 중 새로 쓰인 행(fetched_at >= run.started_at)의
+  (단지, 월) 조합만 추려 영향받는 버킷만 재계산합니다.
+- 재계산은 버킷 단위 DELETE + INSERT ... SELECT ... ON CONFLICT DO UPDATE 한 번씩으로 처리합니다.
+  (같은 버킷을 동시에 재계산해도 먼저 커밋된 행을 갱신하므로 idx_rollup_bucket 충돌 없음)
+
+단위: 가격은 KB API 원본 단위(만원), 평 환산은 3.3058㎡.
+"""
+import logging
+import re
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, String, and_, cast, delete, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+
+from models import (
+    Area, Complex, CrawlRun, CrawlTask, KBPrice, Transaction,
+    PriceRollupMonthly, RollupLevel, RollupSource, TaskStatus,
+)
+from models.response_models import PricePerPyeongPoint, PricePerPyeongTrend
+
+logger = logging.getLogger(__name__)
+
+PYEONG_M2 = 3.3058
+
+# 읍면동/시군구 키 길이 (법정동코드 prefix)
+DONG_CODE_LEN = 10
+SIGUNGU_CODE_LEN = 5
+
+
+def _month_of(value) -> date:
+    """date/datetime → 해당 월 1일"""
+    return date(value.year, value.month, 1)
+
+
+def _month_expr(col):
+    return cast(func.date_trunc("month", col), Date)
+
+
+def _median(expr):
+    return func.percentile_cont(0.5).within_group(expr)
+
+
+# =============================================================================
+# 영향 버킷 추출
+# =============================================================================
+
+def collect_touched_buckets(
+    db: Session, since: datetime, complex_ids: Optional[Iterable[int]] = None,
+) -> Set[Tuple[int, date]]:
+    """since 이후 수집된 시세/실거래 행의 (complex_id, 월) 조합"""
+    kb_q = (
+        db.query(KBPrice.complex_id, _month_expr(KBPrice.as_of_date))
+        .filter(KBPrice.fetched_at >= since)
+    )
+    tx_q = (
+        db.query(Transaction.complex_id, _month_expr(Transaction.contract_date))
+        .filter(Transaction.fetched_at >= since)
+    )
+    if complex_ids is not None:
+        ids = list(complex_ids)
+        kb_q = kb_q.filter(KBPrice.complex_id.in_(ids))
+        tx_q = tx_q.filter(Transaction.complex_id.in_(ids))
+
+    touched: Set[Tuple[int, date]] = set()
+    for cid, month in kb_q.distinct().all() + tx_q.distinct().all():
+        if cid is not None and month is not None:
+            touched.add((cid, _month_of(month)))
+    return touched
+
+
+def _expand_buckets(
+    db: Session, touched: Set[Tuple[int, date]],
+) -> Dict[RollupLevel, Set[Tuple[str, date]]]:
+    """(단지, 월) → 레벨별 (bucket_key, 월) 목록으로 확장"""
+    complex_ids = {cid for cid, _ in touched}
+
+    region_map = {
+        cid: code
+        for cid, code in db.query(Complex.id, Complex.region_code)
+        .filter(Complex.id.in_(complex_ids))
+        .all()
+    }
+    area_map: Dict[int, List[int]] = {}
+    for area_id, cid in db.query(Area.id, Area.complex_id).filter(Area.complex_id.in_(complex_ids)).all():
+        area_map.setdefault(cid, []).append(area_id)
+
+    buckets: Dict[RollupLevel, Set[Tuple[str, date]]] = {level: set() for level in RollupLevel}
+    for cid, month in touched:
+        buckets[RollupLevel.COMPLEX].add((str(cid), month))
+        for area_id in area_map.get(cid, []):
+            buckets[RollupLevel.AREA].add((str(area_id), month))
+        code = region_map.get(cid)
+        if code:
+            buckets[RollupLevel.DONG].add((code[:DONG_CODE_LEN], month))
+            buckets[RollupLevel.SIGUNGU].add((code[:SIGUNGU_CODE_LEN], month))
+    return buckets
+
+
+# =============================================================================
+# 버킷 집계 쿼리
+# =============================================================================
+
+def _level_key_expr(level: RollupLevel, area_col, complex_col):
+    if level == RollupLevel.AREA:
+        return cast(area_col, String)
+    if level == RollupLevel.COMPLEX:
+        return cast(complex_col, String)
+    if level == RollupLevel.DONG:
+        return func.substr(Complex.region_code, 1, DONG_CODE_LEN)
+    return func.substr(Complex.region_code, 1, SIGUNGU_CODE_LEN)
+
+
+def _key_filter(level: RollupLevel, area_col, complex_col, keys: Set[str]):
+    """버킷 키 필터 (인덱스를 탈 수 있도록 원본 컬럼 기준으로 조건 구성)"""
+    if level == RollupLevel.AREA:
+        return area_col.in_([int(k) for k in keys])
+    if level == RollupLevel.COMPLEX:
+        return complex_col.in_([int(k) for k in keys])
+    return or_(*[Complex.region_code.like(f"{k}%") for k in keys])
+
+
+def _kb_select(level: RollupLevel, keys: Set[str], months: Set[date]):
+    """KB 시세(일반가) 기준 평단가 집계"""
+    pyeong = func.coalesce(Area.pyeong, Area.supply_m2 / PYEONG_M2, Area.exclusive_m2 / PYEONG_M2)
+    per_m2 = KBPrice.general_price / Area.exclusive_m2
+    per_pyeong = KBPrice.general_price / func.nullif(pyeong, 0)
+    key = _level_key_expr(level, KBPrice.area_id, KBPrice.complex_id)
+    month = _month_expr(KBPrice.as_of_date)
+
+    return (
+        select(
+            key.label("bucket_key"),
+            month.label("month"),
+            _median(per_m2),
+            func.avg(per_m2),
+            _median(per_pyeong),
+            func.avg(per_pyeong),
+            func.count(KBPrice.id),
+        )
+        .select_from(KBPrice)
+        .join(Area, Area.id == KBPrice.area_id)
+        .join(Complex, Complex.id == KBPrice.complex_id)
+        .where(
+            KBPrice.general_price.isnot(None),
+            Area.exclusive_m2 > 0,
+            KBPrice.as_of_date >= min(months),
+            KBPrice.as_of_date < _next_month(max(months)),
+            _key_filter(level, KBPrice.area_id, KBPrice.complex_id, keys),
+        )
+        .group_by(key, month)
+    )
+
+
+def _tx_select(level: RollupLevel, keys: Set[str], months: Set[date]):
+    """실거래가 기준 평단가 집계 (해제 거래 제외)"""
+    area_type = aliased(Area)
+    area_pyeong = (
+        select(func.max(func.coalesce(area_type.pyeong, area_type.supply_m2 / PYEONG_M2)))
+        .where(
+            area_type.complex_id == Transaction.complex_id,
+            area_type.exclusive_m2 == Transaction.exclusive_m2,
+        )
+        .correlate(Transaction)
+        .scalar_subquery()
+    )
+    pyeong = func.coalesce(area_pyeong, Transaction.exclusive_m2 / PYEONG_M2)
+    per_m2 = Transaction.price / Transaction.exclusive_m2
+    per_pyeong = Transaction.price / func.nullif(pyeong, 0)
+    month = _month_expr(Transaction.contract_date)
+
+    stmt = select().select_from(Transaction).join(Complex, Complex.id == Transaction.complex_id)
+    if level == RollupLevel.AREA:
+        # 실거래에는 area_id가 없으므로 (단지, 전용면적)으로 면적 타입에 매칭
+        stmt = stmt.join(
+            Area,
+            and_(
+                Area.complex_id == Transaction.complex_id,
+                Area.exclusive_m2 == Transaction.exclusive_m2,
+            ),
+        )
+        key = cast(Area.id, String)
+    else:
+        key = _level_key_expr(level, None, Transaction.complex_id)
+
+    return (
+        stmt.add_columns(
+            key.label("bucket_key"),
+            month.label("month"),
+            _median(per_m2),
+            func.avg(per_m2),
+            _median(per_pyeong),
+            func.avg(per_pyeong),
+            func.count(Transaction.id),
+        )
+        .where(
+            Transaction.is_cancelled.isnot(True),
+            Transaction.price > 0,
+            Transaction.exclusive_m2 > 0,
+            Transaction.contract_date >= min(months),
+            Transaction.contract_date < _next_month(max(months)),
+            _key_filter(level, Area.id if level == RollupLevel.AREA else None, Transaction.complex_id, keys),
+        )
+        .group_by(key, month)
+    )
+
+
+def _next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def _prev_month(month: date) -> date:
+    if month.month == 1:
+        return date(month.year - 1, 12, 1)
+    return date(month.year, month.month - 1, 1)
+
+
+_ROLLUP_VALUE_COLUMNS = (
+    "median_price_per_m2", "avg_price_per_m2",
+    "median_price_per_pyeong", "avg_price_per_pyeong",
+    "sample_count", "refreshed_at",
+)
+
+
+def _refresh_level(
+    db: Session, level: RollupLevel, source: RollupSource, pairs: Set[Tuple[str, date]],
+) -> None:
+    """레벨/원천 하나에 대해 지정된 (bucket_key, 월) 버킷을 재계산"""
+    if not pairs:
+        return
+    keys = {k for k, _ in pairs}
+    months = {m for _, m in pairs}
+    pair_list = list(pairs)
+
+    db.execute(
+        delete(PriceRollupMonthly).where(
+            PriceRollupMonthly.level == level,
+            PriceRollupMonthly.source == source,
+            tuple_(PriceRollupMonthly.bucket_key, PriceRollupMonthly.month).in_(pair_list),
+        )
+    )
+
+    agg = (_kb_select if source == RollupSource.KB else _tx_select)(level, keys, months).subquery()
+    rows = select(
+        literal(level, PriceRollupMonthly.level.type),
+        literal(source, PriceRollupMonthly.source.type),
+        agg.c.bucket_key,
+        agg.c.month,
+        *[c for c in agg.c if c.name not in ("bucket_key", "month")],
+        literal(datetime.utcnow()),
+    ).where(tuple_(agg.c.bucket_key, agg.c.month).in_(pair_list))
+
+    stmt = pg_insert(PriceRollupMonthly).from_select(
+        [
+            "level", "source", "bucket_key", "month",
+            "median_price_per_m2", "avg_price_per_m2",
+            "median_price_per_pyeong", "avg_price_per_pyeong",
+            "sample_count", "refreshed_at",
+        ],
+        rows,
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["level", "bucket_key", "source", "month"],
+        set_={name: stmt.excluded[name] for name in _ROLLUP_VALUE_COLUMNS},
+    ))
+
+
+def refresh_price_rollups(db: Session, touched: Set[Tuple[int, date]]) -> int:
+    """
+    (complex_id, 월) 조합에 영향받는 모든 집계 버킷 재계산.
+
+    Returns:
+        재계산한 버킷 수 (레벨 × 원천 기준)
+    """
+    if not touched:
+        return 0
+
+    buckets = _expand_buckets(db, touched)
+    refreshed = 0
+    for level, pairs in buckets.items():
+        for source in RollupSource:
+            _refresh_level(db, level, source, pairs)
+            refreshed += len(pairs)
+    db.commit()
+    return refreshed
+
+
+def refresh_rollups_for_run(db: Session, run_id: int) -> int:
+    """
+    수집 Run에서 갱신된 (단지, 월) 버킷만 재계산.
+    Run이 성공한 태스크의 단지로 한정 (같은 시간대에 다른 Run이 쓴 단지까지 재계산하지 않도록).
+    """
+    run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+    if not run or not run.started_at:
+        return 0
+
+    complex_ids = [
+        cid for (cid,) in db.query(CrawlTask.complex_id)
+        .filter(
+            CrawlTask.run_id == run_id,
+            CrawlTask.status == TaskStatus.SUCCESS,
+            CrawlTask.complex_id.isnot(None),
+        )
+        .distinct()
+        .all()
+    ]
+    if not complex_ids:
+        return 0
+
+    touched = collect_touched_buckets(db, run.started_at, complex_ids)
+    refreshed = refresh_price_rollups(db, touched)
+    logger.info(
+        f"Run {run_id}: price rollups refreshed "
+        f"({len(touched)} complex-months, {refreshed} buckets)"
+    )
+    return refreshed
+
+
+# =============================================================================
+# 조회
+# =============================================================================
+
+def _region_names(address: str) -> Tuple[Optional[str], Optional[str]]:
+    """주소에서 (읍면동명, 시군구명) 추출. 첫 토큰은 시/도로 간주."""
+    dong_name = sigungu_name = None
+    for token in (address or "").split()[1:]:
+        if sigungu_name is None and re.search(r"(시|군|구)$", token):
+            sigungu_name = token
+        elif sigungu_name and re.search(r"(동|읍|면|가)$", token):
+            dong_name = token
+            break
+    return dong_name, sigungu_name
+
+
+def get_price_per_pyeong_trend(
+    db: Session,
+    complex_id: int,
+    months: int = 3,
+    source: RollupSource = RollupSource.KB,
+) -> Optional[PricePerPyeongTrend]:
+    """
+    단지/읍면동/시군구 평단가 추이 (만원/평).
+    집계 테이블의 최근 months개월 행만 읽습니다.
+    """
+    complex_obj = db.query(Complex).filter(Complex.id == complex_id).first()
+    if not complex_obj:
+        return None
+
+    code = complex_obj.region_code or ""
+    bucket_filters = [(RollupLevel.COMPLEX, str(complex_obj.id))]
+    if code:
+        bucket_filters.append((RollupLevel.DONG, code[:DONG_CODE_LEN]))
+        bucket_filters.append((RollupLevel.SIGUNGU, code[:SIGUNGU_CODE_LEN]))
+
+    latest = (
+        db.query(func.max(PriceRollupMonthly.month))
+        .filter(
+            PriceRollupMonthly.level == RollupLevel.COMPLEX,
+            PriceRollupMonthly.bucket_key == str(complex_obj.id),
+            PriceRollupMonthly.source == source,
+        )
+        .scalar()
+    )
+    if latest is None:
+        return None
+    start = latest
+    for _ in range(months - 1):
+        start = _prev_month(start)
+
+    rows = (
+        db.query(PriceRollupMonthly)
+        .filter(
+            PriceRollupMonthly.source == source,
+            tuple_(PriceRollupMonthly.level, PriceRollupMonthly.bucket_key).in_(bucket_filters),
+            PriceRollupMonthly.month >= start,
+            PriceRollupMonthly.month <= latest,
+        )
+        .all()
+    )
+
+    series: Dict[date, Dict[RollupLevel, float]] = {}
+    for r in rows:
+        if r.median_price_per_pyeong is not None:
+            series.setdefault(r.month, {})[r.level] = r.median_price_per_pyeong
+
+    complex_months = sorted(m for m, v in series.items() if RollupLevel.COMPLEX in v)
+    if not complex_months:
+        return None
+
+    data = []
+    for m in complex_months:
+        values = series[m]
+        complex_price = int(values[RollupLevel.COMPLEX])
+        data.append(PricePerPyeongPoint(
+            date=m.strftime("%Y-%m"),
+            complex=complex_price,
+            dong=int(values.get(RollupLevel.DONG, complex_price)),
+            sigungu=int(values.get(RollupLevel.SIGUNGU, complex_price)),
+        ))
+
+    dong_name, sigungu_name = _region_names(complex_obj.address)
+    return PricePerPyeongTrend(
+        complex_name=complex_obj.name,
+        dong_name=dong_name or code[:DONG_CODE_LEN],
+        sigungu_name=sigungu_name or code[:SIGUNGU_CODE_LEN],
+        data=data,
+    )
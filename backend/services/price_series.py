@@ -0,0 +1,85 @@
+"""
+KB 시세 시계열 저장.
+
+BasePrcInfoNew 한 번의 응답에 담긴 시세 이력 전체를 (complex_id, area_id, as_of_date) 기준으로 upsert 합니다.
+
+- 값이 바뀐 시점만 갱신 (같은 이력을 매번 다시 쓰지 않음 → fetched_at이 바뀐 행만 평단가 집계 대상)
+- 최신 기준일 행은 payload_hash도 갱신 (원문 변경 감지의 DB 폴백이 최신 행 해시를 읽음)
+"""
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models import KBPrice
+
+logger = logging.getLogger(__name__)
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def upsert_price_series(
+    db: Session,
+    complex_id: int,
+    area_id: int,
+    items: List[Dict[str, Any]],
+    payload_hash: Optional[str] = None,
+) -> int:
+    """시세 이력 upsert (커밋은 호출 측에서). 추가/변경된 행 수를 반환"""
+    now = datetime.utcnow()
+    rows: Dict[date, dict] = {}
+    for item in items:
+        as_of_date = _as_date(item.get("as_of_date"))
+        if as_of_date is None:
+            continue
+        rows[as_of_date] = {
+            "complex_id": complex_id,
+            "area_id": area_id,
+            "as_of_date": as_of_date,
+            "general_price": item.get("general_price"),
+            "high_avg_price": item.get("high_avg_price"),
+            "low_avg_price": item.get("low_avg_price"),
+            "source": item.get("source", "kb"),
+            "fetched_at": now,
+            "payload_hash": payload_hash,
+            "parser_version": item.get("parser_version"),
+        }
+    if not rows:
+        return 0
+
+    latest = max(rows)
+    stmt = insert(KBPrice).values(list(rows.values()))
+    excluded = stmt.excluded
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[KBPrice.complex_id, KBPrice.area_id, KBPrice.as_of_date],
+            set_={
+                "general_price": excluded.general_price,
+                "high_avg_price": excluded.high_avg_price,
+                "low_avg_price": excluded.low_avg_price,
+                "fetched_at": excluded.fetched_at,
+                "payload_hash": excluded.payload_hash,
+                "parser_version": excluded.parser_version,
+            },
+            where=or_(
+                KBPrice.general_price.is_distinct_from(excluded.general_price),
+                KBPrice.high_avg_price.is_distinct_from(excluded.high_avg_price),
+                KBPrice.low_avg_price.is_distinct_from(excluded.low_avg_price),
+                and_(
+                    KBPrice.as_of_date == latest,
+                    KBPrice.payload_hash.is_distinct_from(excluded.payload_hash),
+                ),
+            ),
+        ).returning(KBPrice.id)
+    )
+    return len(result.all())
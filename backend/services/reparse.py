@@ -0,0 +1,476 @@
+"""
+원문 재파싱 파이프라인.
+
+파서 수정(PARSER_VERSION 변경) 후 재수집 없이 저장된 원문으로 이력을 보정합니다.
+KB 요청은 하지 않고 커넥터의 parse 메서드만 사용합니다.
+
+- 대상: raw_payloads (Run / 수집 기간 / 파서 버전 필터), id 순 배치 스트리밍
+- 파싱: ProcessPoolExecutor 워커가 압축 해제 + JSON 디코딩 + parse 수행
+  (배치 k를 파싱하는 동안 부모 프로세스는 배치 k-1 결과를 저장)
+- 저장: 배치마다 INSERT ... ON CONFLICT 일괄 upsert
+  - 시세: (complex_id, area_id, as_of_date) 기준 갱신
+  - 실거래: 동일 거래는 건너뜀
+  - 매물: 더 최근에 확인된 매물은 과거 원문으로 덮어쓰지 않음,
+    제거(REMOVED) 판단은 전체 페이지 원문 기준 (증분 수집 원문은 partial, 보인 매물만 갱신)
+- 완료 후 raw_payloads.parser_version 갱신, 영향받은 월별 평단가 집계 재계산
+
+Celery prefork 워커(daemon 프로세스)에서는 프로세스 풀을 만들 수 없으므로 CLI로 실행합니다:
+    python -m services.reparse --outdated
+    python -m services.reparse --run-id 123 --workers 8
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import zstandard
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from connectors import (
+    KBListingConnector, KBPriceConnector, KBTransactionConnector, KBTransactionHistoryConnector,
+)
+from models import (
+    Area, CrawlTask, KBPrice, Listing, ListingStatus, RawPayload, TaskType,
+)
+from services.payload_store import (
+    PayloadStore, decompress_payload, dictionary_id, load_dictionaries,
+)
+from services.price_rollup import refresh_price_rollups
+from services.transaction_history import insert_new_transactions
+
+logger = logging.getLogger(__name__)
+
+PARSERS = {
+    TaskType.KB_PRICE: KBPriceConnector,
+    TaskType.KB_TRANSACTION: KBTransactionConnector,
+    TaskType.KB_LISTING: KBListingConnector,
+    TaskType.KB_TRANSACTION_HISTORY: KBTransactionHistoryConnector,
+}
+
+
+# =============================================================================
+# 워커 프로세스
+# =============================================================================
+
+_worker_dictionaries: Dict[int, zstandard.ZstdCompressionDict] = {}
+_worker_connectors: Dict[str, Any] = {}
+
+
+def _init_worker(dictionaries: Dict[int, bytes]):
+    for dict_id, data in dictionaries.items():
+        _worker_dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+    for task_type, connector_cls in PARSERS.items():
+        _worker_connectors[task_type.value] = connector_cls()
+
+
+def _parse_payload(job: Tuple[str, bytes, str]) -> Dict[str, Any]:
+    """(task_type, 압축 본문, 압축 방식) → 파싱 결과. DB/네트워크 접근 없음"""
+    task_type, blob, codec = job
+    try:
+        raw = decompress_payload(blob, codec, _worker_dictionaries)
+        connector = _worker_connectors[task_type]
+        result = {"items": connector.parse(raw)}
+        if task_type == TaskType.KB_PRICE.value:
+            result["recent_transaction"] = connector.parse_recent_transaction(raw)
+        return result
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+# =============================================================================
+# 대상 조회
+# =============================================================================
+
+def _payload_filter(
+    run_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    parser_version: Optional[str] = None,
+    outdated_only: bool = False,
+) -> list:
+    conditions = [
+        CrawlTask.task_type.isnot(None),
+        CrawlTask.complex_id.isnot(None),
+    ]
+    if run_id is not None:
+        conditions.append(CrawlTask.run_id == run_id)
+    if date_from is not None:
+        conditions.append(RawPayload.created_at >= date_from)
+    if date_to is not None:
+        conditions.append(RawPayload.created_at < date_to)
+    if parser_version is not None:
+        conditions.append(RawPayload.parser_version == parser_version)
+    if outdated_only:
+        # 유형별 현재 파서 버전과 다른 원문만
+        conditions.append(or_(*[
+            (CrawlTask.task_type == task_type)
+            & RawPayload.parser_version.is_distinct_from(connector_cls.PARSER_VERSION)
+            for task_type, connector_cls in PARSERS.items()
+        ]))
+    return conditions
+
+
+def _observed_at():
+    """원문 관측 시각 (태스크 종료 시각, 없으면 원문 저장 시각)"""
+    return func.coalesce(CrawlTask.finished_at, RawPayload.created_at)
+
+
+def _payload_batches(db: Session, conditions: list, batch_size: int):
+    """id 순 keyset 배치 스트리밍"""
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(
+                RawPayload.id,
+                RawPayload.content_hash,
+                RawPayload.created_at,
+                _observed_at().label("observed_at"),
+                CrawlTask.task_type,
+                CrawlTask.complex_id,
+                CrawlTask.area_id,
+            )
+            .join(CrawlTask, CrawlTask.id == RawPayload.task_id)
+            .where(RawPayload.id > last_id, *conditions)
+            .order_by(RawPayload.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+# =============================================================================
+# 저장
+# =============================================================================
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _month(value: date) -> date:
+    return value.replace(day=1)
+
+
+class _BatchWriter:
+    """배치 파싱 결과 → 시세/실거래/매물 일괄 upsert"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.touched: Set[Tuple[int, date]] = set()
+
+    def write(self, rows: list, results: List[Dict[str, Any]], stats: Dict[str, int]):
+        prices: Dict[Tuple[int, int, date], dict] = {}
+        transactions: Dict[tuple, dict] = {}
+        listings: Dict[str, dict] = {}
+        parsed_ids: Dict[TaskType, List[int]] = {}
+
+        area_m2 = self._area_sizes({
+            r.area_id for r in rows
+            if r.task_type in (TaskType.KB_PRICE, TaskType.KB_TRANSACTION_HISTORY)
+        })
+        latest_listing_at = self._latest_listing_payloads(
+            {r.complex_id for r in rows if r.task_type == TaskType.KB_LISTING}
+        )
+
+        for row, result in zip(rows, results):
+            if "error" in result:
+                stats["failed"] += 1
+                logger.warning(f"Reparse payload {row.id} failed: {result['error']}")
+                continue
+            stats["parsed"] += 1
+            parsed_ids.setdefault(row.task_type, []).append(row.id)
+
+            if row.task_type == TaskType.KB_PRICE:
+                self._collect_prices(row, result, area_m2, prices, transactions)
+            elif row.task_type == TaskType.KB_TRANSACTION:
+                self._collect_transactions(row, result["items"], transactions)
+            elif row.task_type == TaskType.KB_TRANSACTION_HISTORY:
+                # 전용면적이 없는 과거 거래는 요청한 면적 기준
+                exclusive_m2 = area_m2.get(row.area_id)
+                items = [
+                    {**item, "exclusive_m2": item.get("exclusive_m2") or exclusive_m2}
+                    for item in result["items"]
+                ]
+                self._collect_transactions(row, [i for i in items if i["exclusive_m2"]], transactions)
+            elif row.task_type == TaskType.KB_LISTING:
+                self._collect_listings(row, result["items"], latest_listing_at, listings)
+
+        stats["prices"] += self._upsert_prices(list(prices.values()))
+        stats["transactions"] += self._insert_transactions(list(transactions.values()))
+        stats["listings"] += self._upsert_listings(list(listings.values()))
+
+        for task_type, ids in parsed_ids.items():
+            self.db.execute(
+                update(RawPayload)
+                .where(RawPayload.id.in_(ids))
+                .values(parser_version=PARSERS[task_type].PARSER_VERSION)
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+
+    def _area_sizes(self, area_ids: Set[int]) -> Dict[int, float]:
+        if not area_ids:
+            return {}
+        return dict(self.db.execute(
+            select(Area.id, Area.exclusive_m2).where(Area.id.in_(area_ids))
+        ).all())
+
+    def _latest_listing_payloads(self, complex_ids: Set[int]) -> Dict[int, datetime]:
+        """
+        단지별 가장 최근 전체 매물 원문 시각 (이보다 과거 원문에만 있는 매물은 REMOVED로 복원).
+        증분 수집 원문(partial)은 일부 페이지만 담고 있어 기준에서 제외.
+        """
+        if not complex_ids:
+            return {}
+        return dict(self.db.execute(
+            select(CrawlTask.complex_id, func.max(_observed_at()))
+            .join(RawPayload, RawPayload.task_id == CrawlTask.id)
+            .where(
+                CrawlTask.complex_id.in_(complex_ids),
+                CrawlTask.task_type == TaskType.KB_LISTING,
+                RawPayload.partial.isnot(True),
+            )
+            .group_by(CrawlTask.complex_id)
+        ).all())
+
+    def _collect_prices(self, row, result, area_m2, prices, transactions):
+        for item in result["items"]:
+            as_of_date = _as_date(item.get("as_of_date"))
+            if as_of_date is None:
+                continue
+            prices[(row.complex_id, row.area_id, as_of_date)] = {
+                "complex_id": row.complex_id,
+                "area_id": row.area_id,
+                "as_of_date": as_of_date,
+                "general_price": item.get("general_price"),
+                "high_avg_price": item.get("high_avg_price"),
+                "low_avg_price": item.get("low_avg_price"),
+                "source": item.get("source", "kb"),
+                "fetched_at": row.created_at,
+                "payload_hash": row.content_hash,
+                "parser_version": item.get("parser_version"),
+            }
+            self.touched.add((row.complex_id, _month(as_of_date)))
+
+        tx = result.get("recent_transaction")
+        exclusive_m2 = area_m2.get(row.area_id)
+        if tx and exclusive_m2 is not None:
+            self._collect_transactions(row, [{**tx, "exclusive_m2": exclusive_m2}], transactions)
+
+    def _collect_transactions(self, row, items, transactions):
+        for item in items:
+            contract_date = _as_date(item.get("contract_date"))
+            if contract_date is None or not item.get("price"):
+                continue
+            key = (row.complex_id, contract_date, item["price"], item.get("exclusive_m2"), item.get("floor"))
+            transactions[key] = {
+                "complex_id": row.complex_id,
+                "contract_date": contract_date,
+                "price": item["price"],
+                "exclusive_m2": item.get("exclusive_m2"),
+                "floor": item.get("floor"),
+                "is_cancelled": item.get("is_cancelled", False),
+                "source": "kb",
+                "fetched_at": row.created_at,
+            }
+            self.touched.add((row.complex_id, _month(contract_date)))
+
+    def _collect_listings(self, row, items, latest_listing_at, listings):
+        is_latest = row.observed_at >= latest_listing_at.get(row.complex_id, row.observed_at)
+        for item in items:
+            listings[item["source_listing_id"]] = {
+                "complex_id": row.complex_id,
+                "source_listing_id": item["source_listing_id"],
+                "ask_price": item["ask_price"],
+                "exclusive_m2": item.get("exclusive_m2"),
+                "floor": item.get("floor"),
+                "status": ListingStatus.ACTIVE if is_latest else ListingStatus.REMOVED,
+                "posted_at": item.get("posted_at"),
+                "source": "kb",
+                "fetched_at": row.observed_at,
+                "last_seen_at": row.observed_at,
+            }
+
+    def _upsert_prices(self, rows: List[dict]) -> int:
+        if not rows:
+            return 0
+        stmt = pg_insert(KBPrice).values(rows)
+        excluded = stmt.excluded
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[KBPrice.complex_id, KBPrice.area_id, KBPrice.as_of_date],
+            set_={
+                "general_price": excluded.general_price,
+                "high_avg_price": excluded.high_avg_price,
+                "low_avg_price": excluded.low_avg_price,
+                "payload_hash": excluded.payload_hash,
+                "parser_version": excluded.parser_version,
+            },
+        ))
+        return len(rows)
+
+    def _insert_transactions(self, rows: List[dict]) -> int:
+        return insert_new_transactions(self.db, rows)
+
+    def _upsert_listings(self, rows: List[dict]) -> int:
+        if not rows:
+            return 0
+        stmt = pg_insert(Listing).values(rows)
+        excluded = stmt.excluded
+        result = self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[Listing.source_listing_id],
+            set_={
+                "ask_price": excluded.ask_price,
+                "exclusive_m2": excluded.exclusive_m2,
+                "floor": excluded.floor,
+                "posted_at": excluded.posted_at,
+                "status": excluded.status,
+                "last_seen_at": excluded.last_seen_at,
+                "updated_at": datetime.utcnow(),
+            },
+            # 더 최근에 확인된 매물은 과거 원문으로 덮어쓰지 않음
+            where=Listing.last_seen_at <= excluded.last_seen_at,
+        ))
+        return result.rowcount or 0
+
+
+# =============================================================================
+# 실행
+# =============================================================================
+
+def _log_progress(stats: Dict[str, int], total: int, elapsed: float):
+    rate = stats["payloads"] / elapsed if elapsed else 0.0
+    remaining = (total - stats["payloads"]) / rate if rate else 0.0
+    logger.info(
+        f"Reparse progress: {stats['payloads']}/{total} "
+        f"({stats['payloads'] * 100 / max(total, 1):.1f}%), {rate:.0f} payloads/s, "
+        f"ETA {remaining:.0f}s (failed={stats['failed']})"
+    )
+
+
+def reparse_payloads(
+    db: Session,
+    run_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    parser_version: Optional[str] = None,
+    outdated_only: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = 500,
+    progress: Optional[Callable[[Dict[str, int], int, float], None]] = None,
+) -> Dict[str, Any]:
+    """
+    저장된 원문을 현재 파서로 다시 파싱해 시세/실거래/매물 이력을 보정.
+
+    Args:
+        run_id: 특정 Run의 원문만
+        date_from / date_to: 원문 저장 시각 범위 [from, to)
+        parser_version: 이 파서 버전으로 파싱된 원문만
+        outdated_only: 현재 파서 버전과 다른 원문만 (중단 후 재실행 시 이어서 처리)
+        workers: 파싱 프로세스 수 (기본: CPU 코어 수)
+        progress: 배치마다 호출되는 진행률 콜백 (stats, total, elapsed)
+    """
+    progress = progress or _log_progress
+    conditions = _payload_filter(run_id, date_from, date_to, parser_version, outdated_only)
+    total = db.scalar(
+        select(func.count(RawPayload.id))
+        .join(CrawlTask, CrawlTask.id == RawPayload.task_id)
+        .where(*conditions)
+    ) or 0
+
+    stats = {
+        "payloads": 0, "parsed": 0, "failed": 0, "missing": 0,
+        "prices": 0, "transactions": 0, "listings": 0,
+    }
+    if total == 0:
+        return {**stats, "total": 0, "rollup_buckets": 0, "elapsed_seconds": 0.0}
+
+    store = PayloadStore(db)
+    dictionaries = load_dictionaries(db, filter(None, (
+        dictionary_id(codec) for codec in db.scalars(select(RawPayload.compression).distinct())
+    )))
+    writer = _BatchWriter(db)
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(dictionaries,),
+    ) as pool:
+        in_flight = None
+        def finish(batch):
+            rows, results, fetched = batch
+            writer.write(rows, list(results), stats)
+            stats["payloads"] += fetched
+            progress(stats, total, time.perf_counter() - started)
+
+        for rows in _payload_batches(db, conditions, batch_size):
+            fetched = len(rows)
+            blobs = store.fetch_blobs(r.content_hash for r in rows)
+            rows = [r for r in rows if r.content_hash in blobs]
+            stats["missing"] += fetched - len(rows)
+            jobs = [(r.task_type.value, *blobs[r.content_hash]) for r in rows]
+            results = pool.map(_parse_payload, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+
+            # 현재 배치를 워커가 파싱하는 동안 이전 배치 결과 저장
+            if in_flight is not None:
+                finish(in_flight)
+            in_flight = (rows, results, fetched)
+
+        if in_flight is not None:
+            finish(in_flight)
+
+    rollup_buckets = refresh_price_rollups(db, writer.touched)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Reparse finished: {stats['parsed']}/{total} payloads in {elapsed:.1f}s "
+        f"(prices={stats['prices']}, transactions={stats['transactions']}, "
+        f"listings={stats['listings']}, failed={stats['failed']}, rollup_buckets={rollup_buckets})"
+    )
+    return {**stats, "total": total, "rollup_buckets": rollup_buckets, "elapsed_seconds": round(elapsed, 2)}
+
+
+def main():
+    import argparse
+
+    from core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="저장된 원문 재파싱 (KB 요청 없음)")
+    parser.add_argument("--run-id", type=int)
+    parser.add_argument("--date-from", type=datetime.fromisoformat, help="원문 저장 시각 (포함)")
+    parser.add_argument("--date-to", type=datetime.fromisoformat, help="원문 저장 시각 (미포함)")
+    parser.add_argument("--parser-version", help="이 파서 버전으로 파싱된 원문만")
+    parser.add_argument("--outdated", action="store_true", help="현재 파서 버전과 다른 원문만")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    db = SessionLocal()
+    try:
+        result = reparse_payloads(
+            db,
+            run_id=args.run_id,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            parser_version=args.parser_version,
+            outdated_only=args.outdated,
+            workers=args.workers,
+            batch_size=args.batch_size,
+        )
+        print(result)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # 사용법: python -m services.reparse --outdated
+    main()
@@ -0,0 +1,95 @@
+"""
+Run 취소 (협조적 중단).
+
+cancel_run 한 번으로:
+1. Run을 CANCELLED로 종료 (PENDING/RUNNING인 경우만, 조건부 UPDATE)
+2. 아직 시작하지 않은 태스크(PENDING, 재시도 대기 RETRY) → SKIPPED (error_type=Cancelled)
+   - 이미 발행된 묶음 메시지는 워커가 꺼내도 시작할 태스크가 없어 바로 끝남 (start_planned_task)
+   - Run이 RUNNING이 아니므로 window 보충 발행도 멈춤 (claim_dispatch_batch)
+3. Redis에 run_cancelled:{run_id} 표시 → 수집 중인 태스크는 다음 KB 요청 직전(매물은 페이지마다)
+   raise_if_cancelled에서 CollectionCancelled로 중단
+
+Redis를 쓸 수 없으면 수집 중인 태스크는 끝까지 진행하고, 나머지 태스크는 DB 상태로 멈춥니다.
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+import redis
+from sqlalchemy import func, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from connectors.base import CollectionCancelled
+from core.config import settings
+from core.redis import get_redis, mark_redis_unavailable
+from models import CrawlRun, CrawlTask, RunStatus, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+CANCELLED_ERROR_TYPE = "Cancelled"
+
+_CANCELLABLE_RUN_STATUSES = (RunStatus.PENDING, RunStatus.RUNNING)
+_UNSTARTED_TASK_STATUSES = (TaskStatus.PENDING, TaskStatus.RETRY)
+
+
+def _flag_key(run_id: int) -> str:
+    return f"run_cancelled:{run_id}"
+
+
+def cancel_run(db: Session, run_id: int) -> Optional[Row]:
+    """
+    Run 취소 (커밋 포함). 취소한 경우 (success_count, skipped_count)를 반환,
+    Run이 없거나 이미 끝난 경우 None.
+    """
+    now = datetime.utcnow()
+    run = db.execute(
+        update(CrawlRun)
+        .where(CrawlRun.id == run_id, CrawlRun.status.in_(_CANCELLABLE_RUN_STATUSES))
+        .values(status=RunStatus.CANCELLED, finished_at=now)
+        .returning(CrawlRun.id)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if run is None:
+        db.commit()
+        return None
+
+    skipped = db.execute(
+        update(CrawlTask)
+        .where(CrawlTask.run_id == run_id, CrawlTask.status.in_(_UNSTARTED_TASK_STATUSES))
+        .values(status=TaskStatus.SKIPPED, finished_at=now, error_type=CANCELLED_ERROR_TYPE)
+        .execution_options(synchronize_session=False)
+    ).rowcount or 0
+    counts = db.execute(
+        update(CrawlRun)
+        .where(CrawlRun.id == run_id)
+        .values(skipped_count=func.coalesce(CrawlRun.skipped_count, 0) + skipped)
+        .returning(CrawlRun.success_count, CrawlRun.skipped_count)
+        .execution_options(synchronize_session=False)
+    ).one()
+    db.commit()
+
+    # DB 반영 후 표시 (표시를 본 워커는 항상 SKIPPED 처리된 태스크 상태를 봄)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_flag_key(run_id), "1", ex=settings.collection_inflight_stale_seconds)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+
+    logger.info(f"Run {run_id} cancelled: {skipped} unstarted tasks skipped")
+    return counts
+
+
+def raise_if_cancelled(run_id: int):
+    """KB 요청 직전 호출: 취소된 Run이면 CollectionCancelled (Redis를 쓸 수 없으면 확인하지 않음)"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        cancelled = client.exists(_flag_key(run_id))
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return
+    if cancelled:
+        raise CollectionCancelled(f"Run {run_id} cancelled")
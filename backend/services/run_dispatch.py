@@ -0,0 +1,367 @@
+"""
+Run 태스크 분할 발행 (chunk + in-flight window).
+
+단지/면적마다 메시지를 한 번에 발행하지 않고,
+
+1. 수집 대상 전체를 PENDING crawl_tasks로 먼저 기록 (plan_run_tasks)
+2. 발행 중(dispatched_at 기록, 미종료)인 태스크가 settings.collection_inflight_tasks 이하가 되도록
+   PENDING 태스크를 id 순서(= 단지 우선순위 순)로 확보해서 묶음 메시지로 발행 (claim_dispatch_batch)
+3. 묶음이 끝날 때마다 빈 자리만큼 다시 확보 → broker 메시지 수/동시 DB 쓰기가 Run 크기와 무관하게 일정
+
+- 확보는 Run 행을 잠그고 수행 (동시에 끝난 묶음들이 window를 초과해서 확보하지 않도록)
+- 발행 후 collection_inflight_stale_seconds(기본 1시간 = task_time_limit)가 지나도 끝나지 않은 태스크는
+  워커가 죽은 것으로 보고 window에서 제외, 그때까지 시작하지 못한 PENDING 태스크는 다시 확보
+- 묶음 크기는 예상 KB 요청 수 × 요청 간격이 collection_chunk_max_seconds를 넘지 않게 제한 (split_by_duration)
+- 묶음이 soft time limit에 걸리면 남은 태스크를 발행 전 상태로 되돌려 새 묶음으로 발행 (release_tasks)
+- Run이 RUNNING이 아니면 (종료/취소) 더 이상 발행하지 않음
+- 묶음 수집기가 없는 유형의 태스크는 시작하지 않고 SKIPPED로 종료 (skip_planned_task)
+- 부분 성공/실패 Run 재개: 실패/멈춘 태스크만 PENDING으로 되돌려 같은 Run에서 다시 발행 (reset_for_resume)
+"""
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from connectors.kb_listing import PAGE_SIZE as LISTING_PAGE_SIZE
+from core.config import settings
+from models import ComplexCollectionState, CrawlJob, CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 INSERT로 기록할 태스크 수
+_PLAN_INSERT_BATCH = 1000
+
+_OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.RETRY)
+
+DispatchTarget = Tuple[TaskType, int, Optional[int]]
+
+# 묶음 실행 수집기가 없는 유형의 태스크 (시작하지 않고 SKIPPED로 종료)
+UNSUPPORTED_ERROR_TYPE = "UnsupportedTaskType"
+
+# KB 커넥터 기본 요청 한도 (분당, connectors.kb_base)
+_KB_REQUESTS_PER_MINUTE = 20
+
+# 마지막 매물 건수를 모르는 단지의 예상 매물 페이지 수
+_UNKNOWN_LISTING_PAGES = 4
+
+
+def task_key(task_type: TaskType, complex_id: int, area_id: Optional[int] = None) -> str:
+    """태스크 키 (kb_price_{단지}_{면적}, kb_listing_{단지} ...)"""
+    key = f"{task_type.value}_{complex_id}"
+    return f"{key}_{area_id}" if area_id is not None else key
+
+
+def plan_run_tasks(db: Session, run_id: int, targets: Iterable[DispatchTarget]) -> int:
+    """수집 대상 (유형, 단지, 면적)을 PENDING 태스크로 일괄 기록하고 기록 수를 반환 (커밋 포함)"""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "run_id": run_id,
+            "task_key": task_key(task_type, complex_id, area_id),
+            "task_type": task_type,
+            "complex_id": complex_id,
+            "area_id": area_id,
+            "status": TaskStatus.PENDING,
+            "retry_count": 0,
+            "items_collected": 0,
+            "items_saved": 0,
+            "created_at": now,
+        }
+        for task_type, complex_id, area_id in targets
+    ]
+    for start in range(0, len(rows), _PLAN_INSERT_BATCH):
+        db.execute(insert(CrawlTask), rows[start:start + _PLAN_INSERT_BATCH])
+    db.commit()
+    return len(rows)
+
+
+def claim_dispatch_batch(db: Session, run_id: int) -> Tuple[Optional[int], List[Row]]:
+    """
+    window의 빈 자리만큼 PENDING 태스크를 발행 상태로 확보 (커밋 포함).
+    발행 후 collection_inflight_stale_seconds가 지나도 시작되지 않은 PENDING 태스크(강제 종료된 묶음의 나머지,
+    유실된 메시지)도 다시 확보 (메시지가 뒤늦게 전달돼도 start_planned_task가 한 번만 시작).
+    (Run의 job_id, 확보한 (id, complex_id, task_type) 목록)을 반환. Run이 RUNNING이 아니면 빈 목록.
+    """
+    run = db.execute(
+        select(CrawlRun.id, CrawlRun.job_id)
+        .where(CrawlRun.id == run_id, CrawlRun.status == RunStatus.RUNNING)
+        .with_for_update()
+    ).first()
+    if run is None:
+        db.commit()
+        return None, []
+
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.collection_inflight_stale_seconds)
+    in_flight = db.scalar(
+        select(func.count(CrawlTask.id)).where(
+            CrawlTask.run_id == run_id,
+            CrawlTask.status.in_(_OPEN_STATUSES),
+            CrawlTask.dispatched_at >= stale_before,
+        )
+    )
+    free = settings.collection_inflight_tasks - in_flight
+    if free <= 0:
+        db.commit()
+        return run.job_id, []
+
+    pending = (
+        select(CrawlTask.id)
+        .where(
+            CrawlTask.run_id == run_id,
+            CrawlTask.status == TaskStatus.PENDING,
+            CrawlTask.dispatched_at.is_(None) | (CrawlTask.dispatched_at < stale_before),
+        )
+        .order_by(CrawlTask.id)
+        .limit(free)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    claimed = db.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id.in_(pending))
+        .values(dispatched_at=now)
+        .returning(CrawlTask.id, CrawlTask.complex_id, CrawlTask.task_type)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return run.job_id, sorted(claimed, key=lambda row: row.id)
+
+
+def _seconds_per_request(db: Session, job_id: Optional[int], rate_limit_per_minute: Optional[int] = None) -> float:
+    """
+    묶음 하나가 KB 요청 사이에 기다리는 예상 시간(초). 작업 요청 한도는 동시에 실행 중인 묶음들이 나눠 씀.
+    rate_limit_per_minute: Run 전체에 걸리는 요청 한도 (backfill Run)
+    """
+    rate = float(_KB_REQUESTS_PER_MINUTE)
+    if rate_limit_per_minute:
+        rate = min(rate, float(rate_limit_per_minute))
+    if job_id is not None:
+        job = db.execute(
+            select(CrawlJob.max_concurrency, CrawlJob.rate_limit_per_minute).where(CrawlJob.id == job_id)
+        ).first()
+        if job is not None and job.rate_limit_per_minute:
+            rate = min(rate, job.rate_limit_per_minute / max(job.max_concurrency or 1, 1))
+    return 60.0 / max(rate, 1.0)
+
+
+def estimate_task_seconds(
+    db: Session, job_id: Optional[int], claimed: List[Row], rate_limit_per_minute: Optional[int] = None,
+) -> Dict[int, float]:
+    """
+    확보한 태스크별 예상 소요 시간(초) = 예상 KB 요청 수 × 요청 간격.
+    시세/실거래(이력 포함)는 요청 1회, 매물은 brif + 마지막 매물 건수 기준 전체 페이지 수 (증분 수집 생략 전 최대치).
+    """
+    listing_complexes = {row.complex_id for row in claimed if row.task_type == TaskType.KB_LISTING}
+    listing_counts: Dict[int, Optional[int]] = {}
+    if listing_complexes:
+        listing_counts = dict(db.execute(
+            select(ComplexCollectionState.complex_id, ComplexCollectionState.last_listing_count).where(
+                ComplexCollectionState.complex_id.in_(listing_complexes),
+                ComplexCollectionState.task_type == TaskType.KB_LISTING,
+            )
+        ).all())
+
+    interval = _seconds_per_request(db, job_id, rate_limit_per_minute)
+    estimates = {}
+    for row in claimed:
+        requests = 1
+        if row.task_type == TaskType.KB_LISTING:
+            count = listing_counts.get(row.complex_id)
+            pages = _UNKNOWN_LISTING_PAGES if count is None else max(1, math.ceil(count / LISTING_PAGE_SIZE))
+            requests += pages
+        estimates[row.id] = requests * interval
+    return estimates
+
+
+def split_by_duration(task_ids: List[int], estimates: Dict[int, float]) -> List[List[int]]:
+    """
+    태스크를 순서대로 묶음으로 나눔: collection_chunk_size개 이하,
+    예상 소요 시간 합이 collection_chunk_max_seconds 이하 (혼자 상한을 넘는 태스크는 단독 묶음).
+    """
+    chunk_size = max(settings.collection_chunk_size, 1)
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    elapsed = 0.0
+    for task_id in task_ids:
+        seconds = estimates.get(task_id, 0.0)
+        if current and (len(current) >= chunk_size or elapsed + seconds > settings.collection_chunk_max_seconds):
+            chunks.append(current)
+            current, elapsed = [], 0.0
+        current.append(task_id)
+        elapsed += seconds
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def release_tasks(db: Session, task_ids: List[int], running_task_id: Optional[int] = None) -> int:
+    """
+    묶음이 끝내지 못한 PENDING 태스크를 발행 전 상태로 되돌림 (커밋 포함, 다음 claim_dispatch_batch가 다시 확보).
+    running_task_id: 이 묶음이 시작한 뒤 끝내지 못한 태스크 (RUNNING이어도 되돌림).
+    그 밖에 이미 시작/종료된 태스크는 그대로. 되돌린 태스크 수를 반환.
+    """
+    if not task_ids:
+        return 0
+    releasable = CrawlTask.status == TaskStatus.PENDING
+    if running_task_id is not None:
+        releasable = releasable | ((CrawlTask.id == running_task_id) & (CrawlTask.status == TaskStatus.RUNNING))
+    released = db.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id.in_(task_ids), releasable)
+        .values(
+            status=TaskStatus.PENDING,
+            dispatched_at=None,
+            started_at=None,
+            finished_at=None,
+            error_type=None,
+            error_message=None,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount or 0
+    db.commit()
+    return released
+
+
+def runs_with_stale_dispatch(db: Session) -> List[int]:
+    """발행 후 collection_inflight_stale_seconds가 지나도 시작되지 않은 PENDING 태스크가 남은 RUNNING Run id 목록"""
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.collection_inflight_stale_seconds)
+    stale = (
+        select(CrawlTask.id)
+        .where(
+            CrawlTask.run_id == CrawlRun.id,
+            CrawlTask.status == TaskStatus.PENDING,
+            CrawlTask.dispatched_at < stale_before,
+        )
+        .exists()
+    )
+    return list(db.scalars(
+        select(CrawlRun.id).where(CrawlRun.status == RunStatus.RUNNING, stale).order_by(CrawlRun.id)
+    ))
+
+
+def start_planned_task(db: Session, task_id: int) -> Optional[CrawlTask]:
+    """발행된 PENDING/RETRY 태스크를 RUNNING으로 전환 (이미 시작/종료된 태스크면 None, 중복 전달 대비)"""
+    started = db.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id == task_id, CrawlTask.status.in_((TaskStatus.PENDING, TaskStatus.RETRY)))
+        .values(status=TaskStatus.RUNNING, started_at=datetime.utcnow())
+        .returning(CrawlTask.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    if started is None:
+        return None
+    return db.get(CrawlTask, task_id, populate_existing=True)
+
+
+def planned_task_types(db: Session, task_ids: List[int]) -> Dict[int, TaskType]:
+    """묶음 태스크의 유형 (시작 전에 실행할 수집기가 있는지 확인용)"""
+    return dict(db.execute(select(CrawlTask.id, CrawlTask.task_type).where(CrawlTask.id.in_(task_ids))).all())
+
+
+def skip_planned_task(db: Session, task_id: int, error_type: str, message: str) -> bool:
+    """
+    시작하지 않을 PENDING/RETRY 태스크를 SKIPPED로 종료 (커밋 포함).
+    종료시켰으면 True (Run 카운터 반영은 호출 측, record_task_result), 이미 시작/종료됐으면 False.
+    """
+    skipped = db.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id == task_id, CrawlTask.status.in_((TaskStatus.PENDING, TaskStatus.RETRY)))
+        .values(
+            status=TaskStatus.SKIPPED,
+            finished_at=datetime.utcnow(),
+            error_type=error_type,
+            error_message=message[:500],
+        )
+        .returning(CrawlTask.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    return skipped is not None
+
+
+# 재개할 수 있는 Run 상태 (RUNNING: 워커 종료 등으로 멈춘 Run)
+_RESUMABLE_RUN_STATUSES = (RunStatus.PARTIAL, RunStatus.FAILED, RunStatus.RUNNING)
+
+
+def reset_for_resume(db: Session, run_id: int) -> Optional[int]:
+    """
+    Run 재개: 실패했거나 멈춘 태스크만 같은 Run의 PENDING 태스크로 되돌리고 Run을 RUNNING으로 전환.
+    커밋은 호출 측 (Run 행 잠금을 유지한 채 재개 작업을 발행하고, 발행에 실패하면 롤백).
+
+    - FAILED (dead-letter 포함) → PENDING, failed_count에서 제외
+    - 미종료(PENDING/RUNNING/RETRY)인데 마지막 발행/시작 후 collection_inflight_stale_seconds가 지난 태스크 → PENDING
+      (묶음 안에서 늦게 시작한 태스크는 시작 시각 기준, 카운터에 반영된 적 없으므로 카운터 변경 없음)
+    - 아직 발행되지 않은 PENDING 태스크는 그대로 발행 대상
+    - 성공/건너뜀 태스크와 카운터는 유지 → 이후 발행/종료 처리는 일반 Run과 동일 (claim_dispatch_batch)
+    실행할 태스크 수를 반환. Run이 없으면 None, 재개할 수 없는 상태면 ValueError.
+    """
+    run = db.execute(
+        select(CrawlRun.id, CrawlRun.status, CrawlRun.total_tasks)
+        .where(CrawlRun.id == run_id)
+        .with_for_update()
+    ).first()
+    if run is None:
+        db.commit()
+        return None
+    if run.status not in _RESUMABLE_RUN_STATUSES or not run.total_tasks:
+        db.commit()
+        raise ValueError(f"Run {run_id} ({run.status.value}) has no failed or unfinished tasks to resume")
+
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.collection_inflight_stale_seconds)
+    # 큐에서 기다리다 늦게 시작한 태스크를 발행 시각만 보고 되돌리지 않도록 더 늦은 쪽 기준
+    last_activity = func.coalesce(
+        func.greatest(CrawlTask.dispatched_at, CrawlTask.started_at), CrawlTask.created_at,
+    )
+    stalled = (
+        CrawlTask.status.in_(_OPEN_STATUSES)
+        & ~((CrawlTask.status == TaskStatus.PENDING) & CrawlTask.dispatched_at.is_(None))
+        & (last_activity < stale_before)
+    )
+    failed = db.scalar(
+        select(func.count(CrawlTask.id)).where(CrawlTask.run_id == run_id, CrawlTask.status == TaskStatus.FAILED)
+    )
+    reset = db.execute(
+        update(CrawlTask)
+        .where(CrawlTask.run_id == run_id, (CrawlTask.status == TaskStatus.FAILED) | stalled)
+        .values(
+            status=TaskStatus.PENDING,
+            dispatched_at=None,
+            started_at=None,
+            finished_at=None,
+            retry_count=0,
+            error_type=None,
+            error_message=None,
+            error_traceback=None,
+            dead_lettered_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount or 0
+    waiting = db.scalar(
+        select(func.count(CrawlTask.id)).where(
+            CrawlTask.run_id == run_id,
+            CrawlTask.status == TaskStatus.PENDING,
+            CrawlTask.dispatched_at.is_(None),
+        )
+    )
+    if not waiting:
+        db.commit()
+        return 0
+
+    db.execute(
+        update(CrawlRun)
+        .where(CrawlRun.id == run_id)
+        .values(
+            status=RunStatus.RUNNING,
+            finished_at=None,
+            failed_count=func.greatest(func.coalesce(CrawlRun.failed_count, 0) - failed, 0),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    logger.info(f"Run {run_id}: resuming {waiting} tasks ({failed} failed, {reset - failed} stalled reset)")
+    return waiting
@@ -0,0 +1,100 @@
+"""
+Run 진행률 집계 서비스.
+
+태스크가 끝날 때마다 crawl_runs 카운터를 원자적으로 1 증가시키고
+(UPDATE ... SET success_count = success_count + 1 RETURNING),
+완료 수가 total_tasks에 도달하면 RUNNING → 최종 상태 전환을 조건부 UPDATE 한 번으로 수행합니다.
+
+- 태스크 수와 무관하게 태스크당 O(1) (crawl_tasks 재조회 없음)
+- 최종 상태 전환은 `WHERE status = RUNNING` 조건으로 정확히 한 번만 성공
+- 진행률은 crawl_runs 한 행만 읽으면 됨
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, cast, func, literal, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from models import CrawlRun, RunStatus, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+_COUNTER_COLUMNS = {
+    TaskStatus.SUCCESS: CrawlRun.success_count,
+    TaskStatus.FAILED: CrawlRun.failed_count,
+    TaskStatus.SKIPPED: CrawlRun.skipped_count,
+}
+
+
+def _done_expr():
+    return (
+        func.coalesce(CrawlRun.success_count, 0)
+        + func.coalesce(CrawlRun.failed_count, 0)
+        + func.coalesce(CrawlRun.skipped_count, 0)
+    )
+
+
+def try_finalize_run(db: Session, run_id: int) -> Optional[Row]:
+    """
+    완료 수가 total_tasks 이상이면 Run을 SUCCESS/FAILED/PARTIAL로 종료.
+    종료 전환을 수행한 호출에만 (status, success_count, failed_count, skipped_count)를 반환.
+    """
+    status_type = CrawlRun.status.type
+    final_status = cast(
+        case(
+            (func.coalesce(CrawlRun.failed_count, 0) == 0, literal(RunStatus.SUCCESS, status_type)),
+            (func.coalesce(CrawlRun.success_count, 0) == 0, literal(RunStatus.FAILED, status_type)),
+            else_=literal(RunStatus.PARTIAL, status_type),
+        ),
+        status_type,
+    )
+    row = db.execute(
+        update(CrawlRun)
+        .where(
+            CrawlRun.id == run_id,
+            CrawlRun.status == RunStatus.RUNNING,
+            CrawlRun.total_tasks > 0,
+            _done_expr() >= CrawlRun.total_tasks,
+        )
+        .values(status=final_status, finished_at=datetime.utcnow())
+        .returning(
+            CrawlRun.status,
+            CrawlRun.success_count,
+            CrawlRun.failed_count,
+            CrawlRun.skipped_count,
+        )
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    db.commit()
+
+    if row is not None:
+        logger.info(
+            f"Run {run_id} finalized: {row.status.value} "
+            f"(success={row.success_count}, failed={row.failed_count}, skipped={row.skipped_count})"
+        )
+    return row
+
+
+def record_task_result(db: Session, run_id: int, status: TaskStatus) -> Optional[Row]:
+    """
+    종료된 태스크 1건을 Run 카운터에 반영하고, 마지막 태스크면 Run을 종료.
+    이 호출이 Run을 종료시킨 경우에만 종료 결과 행을 반환.
+    """
+    column = _COUNTER_COLUMNS.get(status)
+    if column is None:
+        return None
+
+    progress = db.execute(
+        update(CrawlRun)
+        .where(CrawlRun.id == run_id)
+        .values({column: func.coalesce(column, 0) + 1})
+        .returning(CrawlRun.total_tasks, _done_expr().label("done"))
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    db.commit()
+
+    if progress is None or not progress.total_tasks or progress.done < progress.total_tasks:
+        return None
+    return try_finalize_run(db, run_id)
@@ -0,0 +1,121 @@
+"""
+Run 종료 후 결과 요약.
+
+Run이 종료 상태로 전환된 직후 한 번만 호출되어(workers.tasks.finalize_run_task, 동기 수집은 직접 호출)
+crawl_tasks를 (유형, 상태, 에러 유형)별로 한 번에 집계하고 crawl_runs에 JSON으로 기록합니다.
+
+- error_summary: 실패 건수, 유형/에러별 건수와 대표 메시지
+- quality_warnings:
+  - empty_result: 성공했지만 수집 건수가 0인 태스크 (응답 형식 변경/차단 의심)
+  - high_failure_rate: 유형별 실패 비율이 QUALITY_FAILURE_RATE 이상
+  - unfinished: Run 종료 시점에 끝나지 않은 태스크 (취소/워커 종료)
+  - cancelled: Run 취소로 시작하지 않고 건너뛰었거나 수집 중 중단된 태스크
+- 다시 호출해도 같은 결과 (멱등)
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+
+from models import CrawlRun, CrawlTask, TaskStatus
+from services.run_cancel import CANCELLED_ERROR_TYPE
+
+logger = logging.getLogger(__name__)
+
+# 유형별 실패 비율이 이 값 이상이면 품질 경고
+QUALITY_FAILURE_RATE = 0.2
+# 에러별 대표 메시지 길이
+_SAMPLE_MESSAGE_LENGTH = 200
+
+_UNFINISHED = (TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.RETRY)
+
+
+def _type_name(task_type) -> str:
+    return task_type.value if task_type is not None else "unknown"
+
+
+def summarize_run(db: Session, run_id: int) -> Dict[str, Any]:
+    """Run 태스크 결과 집계 → error_summary / quality_warnings 기록 (커밋 포함)"""
+    rows = db.execute(
+        select(
+            CrawlTask.task_type,
+            CrawlTask.status,
+            CrawlTask.error_type,
+            func.count(CrawlTask.id).label("tasks"),
+            func.count(CrawlTask.id).filter(
+                and_(CrawlTask.status == TaskStatus.SUCCESS, func.coalesce(CrawlTask.items_collected, 0) == 0)
+            ).label("empty"),
+            func.coalesce(func.sum(CrawlTask.items_collected), 0).label("items_collected"),
+            func.coalesce(func.sum(CrawlTask.items_saved), 0).label("items_saved"),
+            func.min(func.left(CrawlTask.error_message, _SAMPLE_MESSAGE_LENGTH)).label("sample"),
+        )
+        .where(CrawlTask.run_id == run_id)
+        .group_by(CrawlTask.task_type, CrawlTask.status, CrawlTask.error_type)
+    ).all()
+
+    by_type: Dict[str, Dict[str, int]] = {}
+    errors: List[Dict[str, Any]] = []
+    unfinished = 0
+    cancelled = 0
+    for row in rows:
+        type_name = _type_name(row.task_type)
+        stats = by_type.setdefault(
+            type_name, {"tasks": 0, "failed": 0, "empty": 0, "items_collected": 0, "items_saved": 0},
+        )
+        stats["tasks"] += row.tasks
+        stats["empty"] += row.empty
+        stats["items_collected"] += row.items_collected
+        stats["items_saved"] += row.items_saved
+        if row.status == TaskStatus.FAILED:
+            stats["failed"] += row.tasks
+            errors.append({
+                "task_type": type_name,
+                "error_type": row.error_type or "Unknown",
+                "count": row.tasks,
+                "sample": row.sample,
+            })
+        elif row.status in _UNFINISHED:
+            unfinished += row.tasks
+        elif row.status == TaskStatus.SKIPPED and row.error_type == CANCELLED_ERROR_TYPE:
+            cancelled += row.tasks
+
+    errors.sort(key=lambda e: e["count"], reverse=True)
+    failed_total = sum(e["count"] for e in errors)
+    error_summary: Optional[Dict[str, Any]] = (
+        {"failed": failed_total, "errors": errors} if failed_total else None
+    )
+
+    warnings: List[Dict[str, Any]] = []
+    for type_name, stats in sorted(by_type.items()):
+        if stats["empty"]:
+            warnings.append({"code": "empty_result", "task_type": type_name, "count": stats["empty"]})
+        if stats["tasks"] and stats["failed"] / stats["tasks"] >= QUALITY_FAILURE_RATE:
+            warnings.append({
+                "code": "high_failure_rate",
+                "task_type": type_name,
+                "failed": stats["failed"],
+                "tasks": stats["tasks"],
+            })
+    if unfinished:
+        warnings.append({"code": "unfinished", "count": unfinished})
+    if cancelled:
+        warnings.append({"code": "cancelled", "count": cancelled})
+
+    quality: Optional[Dict[str, Any]] = {"by_type": by_type, "warnings": warnings} if by_type else None
+
+    db.execute(
+        update(CrawlRun)
+        .where(CrawlRun.id == run_id)
+        .values(
+            error_summary=json.dumps(error_summary, ensure_ascii=False) if error_summary else None,
+            quality_warnings=json.dumps(quality, ensure_ascii=False) if quality else None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if warnings or failed_total:
+        logger.info(f"Run {run_id} summary: {failed_total} failed, warnings={[w['code'] for w in warnings]}")
+    return {"error_summary": error_summary, "quality_warnings": quality}
@@ -3,24 +3,50 @@ Celery 없이 직접 수집을 실행하는 동기 수집 서비스.
 
 개발/데모 환경에서 Celery 워커 없이도 수집이 동작하도록 합니다.
 FastAPI의 BackgroundTasks로 실행됩니다.
+
+단지 단위로 settings.sync_collector_workers개 스레드가 나눠 수집합니다.
+- 워커마다 DB 세션/원문 저장·수집 상태 버퍼/이벤트 루프 + async HTTP 클라이언트 (async 클라이언트는 루프 전용)
+- 동기 HTTP 클라이언트(매물 페이지 순회)와 KB 요청 간격 제한은 Run 전체가 공유
+- Run 카운터는 태스크마다 원자적으로 갱신 (services.run_progress), 마지막 태스크를 끝낸 워커가 종료 처리
+- 이 서비스로 수집한 Run은 triggered_by=SYNC_TRIGGER, 재개(resume)도 Celery 없이 이 서비스로 실행
 """
 import asyncio
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple, Type
 
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from core.config import settings
 from core.database import SessionLocal
 from models import (
     Complex, Area, CrawlRun, CrawlTask,
-    KBPrice, Transaction, Listing, ListingStatus,
-    RunStatus, TaskStatus,
+    Transaction, Listing, ListingStatus,
+    RunStatus, TaskStatus, TaskType,
 )
-from connectors import KBPriceConnector, KBTransactionConnector, KBListingConnector
+from connectors import KBBaseConnector, KBPriceConnector, KBListingConnector
+from services.collection_schedule import by_collection_priority, due_task_types, log_due_summary
+from services.collection_dedup import claim_collection, finish_collection, mark_covered
+from services.collection_state import CollectionStateBatch, record_task_state
+from services.listing_probe import ListingProbe, record_requests_avoided, touch_active_listings
+from services.payload_fingerprint import PayloadFingerprint
+from services.payload_store import PayloadStore
+from services.price_series import upsert_price_series
+from services.run_dispatch import task_key as planned_task_key
+from services.run_progress import record_task_result, try_finalize_run
+from services.run_summary import summarize_run
+from services.task_retry import mark_dead_letter
 
 logger = logging.getLogger(__name__)
 
+SYNC_TRIGGER = "sync"
+
 
 def _ensure_areas(db: Session, complex_obj: Complex) -> List[Area]:
     """단지에 면적 정보가 없으면 KB API에서 자동 조회"""
@@ -92,44 +118,74 @@ def _ensure_areas(db: Session, complex_obj: Complex) -> List[Area]:
         return []
 
 
-def _collect_price(db: Session, run_id: int, complex_id: int, area_id: int) -> dict:
-    """단일 면적 KB 시세 수집"""
-    task_key = f"kb_price_{complex_id}_{area_id}"
+def _start_task(
+    worker: "_SyncWorker", task_type: TaskType, complex_id: int, area_id: Optional[int] = None,
+) -> Optional[CrawlTask]:
+    """
+    태스크 시작 기록 (RUNNING). 재개한 Run이면 되돌려 둔 PENDING 태스크를 시작하고,
+    이미 다른 곳에서 시작했으면 None.
+    """
+    db = worker.db
+    key = planned_task_key(task_type, complex_id, area_id)
+    if worker.resume:
+        task_id = db.execute(
+            update(CrawlTask)
+            .where(
+                CrawlTask.run_id == worker.run_id,
+                CrawlTask.task_key == key,
+                CrawlTask.status == TaskStatus.PENDING,
+            )
+            .values(status=TaskStatus.RUNNING, started_at=datetime.utcnow())
+            .returning(CrawlTask.id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        db.commit()
+        if task_id is None:
+            return None
+        return db.get(CrawlTask, task_id, populate_existing=True)
+
     task_record = CrawlTask(
-        run_id=run_id, task_key=task_key,
+        run_id=worker.run_id, task_key=key,
+        task_type=task_type, complex_id=complex_id, area_id=area_id,
         status=TaskStatus.RUNNING, started_at=datetime.utcnow(),
     )
     db.add(task_record)
     db.commit()
+    return task_record
 
-    try:
-        connector = KBPriceConnector(db_session=db)
-        result = connector.collect(complex_id=complex_id, area_id=area_id)
 
-        items_saved = 0
-        for item in result["items"]:
-            existing = db.query(KBPrice).filter(
-                KBPrice.complex_id == complex_id,
-                KBPrice.area_id == area_id,
-                KBPrice.as_of_date == item["as_of_date"],
-            ).first()
+def _collect_price(worker: "_SyncWorker", complex_id: int, area_id: int) -> Optional[dict]:
+    """단일 면적 KB 시세 수집 (시작할 태스크가 없으면 None)"""
+    db, run_id, payload_store = worker.db, worker.run_id, worker.payload_store
+    task_record = _start_task(worker, TaskType.KB_PRICE, complex_id, area_id)
+    if task_record is None:
+        return None
+    task_key = task_record.task_key
+    covering_run_id = claim_collection(task_record)
+    if covering_run_id is not None:
+        mark_covered(db, task_record, covering_run_id)
+        return {"status": "skipped", "reason": "duplicate", "covered_by_run_id": covering_run_id}
 
-            if existing:
-                existing.general_price = item["general_price"]
-                existing.high_avg_price = item["high_avg_price"]
-                existing.low_avg_price = item["low_avg_price"]
-                existing.fetched_at = datetime.utcnow()
-            else:
-                db.add(KBPrice(
-                    complex_id=complex_id, area_id=area_id,
-                    as_of_date=item["as_of_date"],
-                    general_price=item["general_price"],
-                    high_avg_price=item["high_avg_price"],
-                    low_avg_price=item["low_avg_price"],
-                    source=item["source"],
-                    fetched_at=datetime.utcnow(),
-                ))
-            items_saved += 1
+    try:
+        connector = worker.connector(KBPriceConnector)
+        fingerprint = PayloadFingerprint(db, TaskType.KB_PRICE, complex_id, area_id)
+        result = connector.collect(
+            complex_id=complex_id, area_id=area_id, skip_unchanged=fingerprint.matches,
+        )
+        payload_store.add(
+            task_record.id, result.get("raw"),
+            endpoint=connector.name, parser_version=connector.PARSER_VERSION,
+        )
+        if result["unchanged"]:
+            task_record.status = TaskStatus.SKIPPED
+            task_record.finished_at = datetime.utcnow()
+            db.commit()
+            worker.states.record(task_record)
+            logger.info(f"[sync] {task_key}: payload unchanged, skipped")
+            return {"status": "skipped", "reason": "unchanged"}
+
+        # 응답에 담긴 시세 이력 전체 upsert
+        items_saved = upsert_price_series(db, complex_id, area_id, result["items"], fingerprint.digest)
 
         # 최근 실거래가 추출
         raw_data = result.get("raw")
@@ -156,11 +212,13 @@ def _collect_price(db: Session, run_id: int, complex_id: int, area_id: int) -> d
                     items_saved += 1
 
         db.commit()
+        fingerprint.remember()
         task_record.status = TaskStatus.SUCCESS
         task_record.items_collected = len(result["items"])
         task_record.items_saved = items_saved
         task_record.finished_at = datetime.utcnow()
         db.commit()
+        record_task_state(db, task_record)
         logger.info(f"[sync] {task_key}: {items_saved} items saved")
         return {"status": "success", "items": items_saved}
 
@@ -174,26 +232,55 @@ def _collect_price(db: Session, run_id: int, complex_id: int, area_id: int) -> d
         task_record.error_type = type(e).__name__
         task_record.error_message = str(e)[:500]
         task_record.finished_at = datetime.utcnow()
+        mark_dead_letter(task_record)
         try:
             db.commit()
         except Exception:
             pass
+        record_task_state(db, task_record)
         return {"status": "failed", "error": str(e)}
 
+    finally:
+        finish_collection(task_record)
 
-def _collect_listing(db: Session, run_id: int, complex_id: int) -> dict:
-    """단일 단지 KB 매물 수집"""
-    task_key = f"kb_listing_{complex_id}"
-    task_record = CrawlTask(
-        run_id=run_id, task_key=task_key,
-        status=TaskStatus.RUNNING, started_at=datetime.utcnow(),
-    )
-    db.add(task_record)
-    db.commit()
+
+def _collect_listing(worker: "_SyncWorker", complex_id: int) -> Optional[dict]:
+    """단일 단지 KB 매물 수집 (시작할 태스크가 없으면 None)"""
+    db, run_id, payload_store = worker.db, worker.run_id, worker.payload_store
+    task_record = _start_task(worker, TaskType.KB_LISTING, complex_id)
+    if task_record is None:
+        return None
+    task_key = task_record.task_key
+    covering_run_id = claim_collection(task_record)
+    if covering_run_id is not None:
+        mark_covered(db, task_record, covering_run_id)
+        return {"status": "skipped", "reason": "duplicate", "covered_by_run_id": covering_run_id}
 
     try:
-        connector = KBListingConnector(db_session=db)
-        result = connector.collect(complex_id=complex_id)
+        connector = worker.connector(KBListingConnector)
+        fingerprint = PayloadFingerprint(db, TaskType.KB_LISTING, complex_id)
+        probe = ListingProbe(db, complex_id)
+        result = connector.collect(complex_id=complex_id, skip_unchanged=fingerprint.matches, probe=probe)
+        # 증분 수집 원문은 일부 페이지만 담김 (재파싱 시 매물 제거 판단에서 제외)
+        payload_store.add(
+            task_record.id, result.get("raw"),
+            endpoint=connector.name, parser_version=connector.PARSER_VERSION,
+            partial=not probe.complete,
+        )
+        record_requests_avoided(db, run_id, probe.requests_avoided)
+        if result["unchanged"]:
+            task_record.status = TaskStatus.SKIPPED
+            task_record.finished_at = datetime.utcnow()
+            # 파싱은 건너뛰어도 매물이 그대로 게시 중임은 확인됨
+            touch_active_listings(db, complex_id)
+            db.commit()
+            worker.states.record(task_record)
+            if result["metadata"].get("probe") == "unchanged":
+                logger.info(f"[sync] {task_key}: listing probe unchanged, skipped")
+                return {"status": "skipped", "reason": "probe_unchanged"}
+            probe.remember()
+            logger.info(f"[sync] {task_key}: payload unchanged, skipped")
+            return {"status": "skipped", "reason": "unchanged"}
 
         saved_count = 0
         seen_ids = set()
@@ -220,8 +307,8 @@ def _collect_listing(db: Session, run_id: int, complex_id: int) -> dict:
                 ))
             saved_count += 1
 
-        # 이번에 안 보인 기존 ACTIVE → REMOVED
-        if seen_ids:
+        # 이번에 안 보인 기존 ACTIVE → REMOVED (전체 수집일 때만)
+        if seen_ids and probe.complete:
             stale = db.query(Listing).filter(
                 Listing.complex_id == complex_id,
                 Listing.status == ListingStatus.ACTIVE,
@@ -230,13 +317,23 @@ def _collect_listing(db: Session, run_id: int, complex_id: int) -> dict:
             for s in stale:
                 s.status = ListingStatus.REMOVED
                 s.status_updated_at = datetime.utcnow()
+        elif seen_ids:
+            # 증분 수집: 건수 대조로 삭제가 없음이 확인됨 → 나머지 ACTIVE도 확인 시각 갱신
+            db.query(Listing).filter(
+                Listing.complex_id == complex_id,
+                Listing.status == ListingStatus.ACTIVE,
+                Listing.source_listing_id.notin_(seen_ids),
+            ).update({Listing.last_seen_at: datetime.utcnow()}, synchronize_session=False)
 
         db.commit()
+        fingerprint.remember()
+        probe.remember()
         task_record.status = TaskStatus.SUCCESS
         task_record.items_collected = len(result["items"])
         task_record.items_saved = saved_count
         task_record.finished_at = datetime.utcnow()
         db.commit()
+        record_task_state(db, task_record, payload_hash=fingerprint.digest)
         logger.info(f"[sync] {task_key}: {saved_count} listings saved")
         return {"status": "success", "items": saved_count}
 
@@ -250,17 +347,194 @@ def _collect_listing(db: Session, run_id: int, complex_id: int) -> dict:
         task_record.error_type = type(e).__name__
         task_record.error_message = str(e)[:500]
         task_record.finished_at = datetime.utcnow()
+        mark_dead_letter(task_record)
         try:
             db.commit()
         except Exception:
             pass
+        record_task_state(db, task_record)
         return {"status": "failed", "error": str(e)}
 
+    finally:
+        finish_collection(task_record)
+
+
+_RESULT_STATUSES = {
+    "success": TaskStatus.SUCCESS,
+    "skipped": TaskStatus.SKIPPED,
+}
+
+
+def _task_status(result: dict) -> TaskStatus:
+    return _RESULT_STATUSES.get(result["status"], TaskStatus.FAILED)
+
+
+def _run_cancelled(db: Session, run_id: int) -> bool:
+    return db.query(CrawlRun.status).filter(CrawlRun.id == run_id).scalar() == RunStatus.CANCELLED
+
+
+class _RequestPacer:
+    """워커 스레드가 공유하는 KB 요청 간격 제한 (다음 요청 가능 시각을 예약하고 그때까지 대기)"""
+
+    def __init__(self, rate_limit_per_minute: int):
+        self.interval = 60.0 / rate_limit_per_minute if rate_limit_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _SyncWorker:
+    """수집 워커 스레드 하나의 자원 (DB 세션, 원문 저장/수집 상태 버퍼, 이벤트 루프 + async HTTP 클라이언트)"""
+
+    def __init__(self, run_id: int, sync_client: httpx.Client, pacer: _RequestPacer, resume: bool = False):
+        self.run_id = run_id
+        self.resume = resume
+        self.db = SessionLocal()
+        self.payload_store = PayloadStore(self.db)
+        self.states = CollectionStateBatch(self.db)
+        self.sync_client = sync_client
+        self.pacer = pacer
+        # 커넥터 fetch가 이 루프에서 실행되도록 스레드 기본 루프로 지정 (async 클라이언트 연결 재사용)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.async_client: Optional[httpx.AsyncClient] = None
+
+    def connector(self, connector_cls: Type[KBBaseConnector]) -> KBBaseConnector:
+        """워커 세션/공유 HTTP 클라이언트/요청 간격 제한을 쓰는 커넥터"""
+        connector = connector_cls(db_session=self.db)
+        if self.async_client is None:
+            self.async_client = httpx.AsyncClient(**connector.http_client_options())
+        connector.share_http_clients(async_client=self.async_client, sync_client=self.sync_client)
+        connector.request_gate = self.pacer.wait
+        return connector
+
+    def close(self):
+        try:
+            if self.async_client is not None:
+                self.loop.run_until_complete(self.async_client.aclose())
+        except Exception as e:
+            logger.warning(f"[sync] Run {self.run_id}: HTTP client close failed: {e}")
+        finally:
+            asyncio.set_event_loop(None)
+            self.loop.close()
+            self.db.close()
+
 
-def collect_complex_sync(run_id: int, complex_ids: List[int]):
+# (단지 ID, 시세 수집 면적 ID 목록, 매물 수집 여부)
+_ComplexWork = Tuple[int, List[int], bool]
+
+
+def _collect_concurrently(run_id: int, work: List[_ComplexWork], resume: bool = False) -> Optional[Row]:
+    """
+    단지 목록을 워커 스레드들이 나눠 수집 (우선순위 순서대로 꺼냄).
+    태스크마다 Run 카운터를 갱신하고, Run을 종료시킨 경우 종료 결과 행을 반환.
+    resume=True면 새 태스크를 만들지 않고 되돌려 둔 PENDING 태스크를 수집.
+    """
+    if not work:
+        return None
+    pending: "queue.Queue[_ComplexWork]" = queue.Queue()
+    for item in work:
+        pending.put(item)
+    finalized: List[Row] = []
+    pacer = _RequestPacer(settings.sync_collector_rate_limit_per_minute)
+
+    def record(worker: _SyncWorker, result: Optional[dict]):
+        if result is None:
+            return
+        done = record_task_result(worker.db, run_id, _task_status(result))
+        if done is not None:
+            finalized.append(done)
+
+    def run_worker(sync_client: httpx.Client):
+        worker = _SyncWorker(run_id, sync_client, pacer, resume)
+        try:
+            while True:
+                try:
+                    complex_id, area_ids, with_listing = pending.get_nowait()
+                except queue.Empty:
+                    return
+                # 취소된 Run이면 남은 단지는 수집하지 않음 (services.run_cancel)
+                if _run_cancelled(worker.db, run_id):
+                    logger.info(f"[sync] Run {run_id} cancelled, stopping worker")
+                    return
+                try:
+                    # 시세 수집 (면적별)
+                    for area_id in area_ids:
+                        record(worker, _collect_price(worker, complex_id, area_id))
+                    # 매물 수집
+                    if with_listing:
+                        record(worker, _collect_listing(worker, complex_id))
+                    # 원문과 변경 없음 태스크의 수집 상태는 단지 단위로 모아서 저장
+                    worker.payload_store.flush()
+                    worker.states.flush()
+                except Exception as e:
+                    logger.exception(f"[sync] Run {run_id}: complex {complex_id} failed: {e}")
+                    worker.db.rollback()
+        finally:
+            worker.states.flush()
+            worker.close()
+
+    workers = max(1, min(settings.sync_collector_workers, len(work)))
+    with httpx.Client(**KBListingConnector().http_client_options()) as sync_client:
+        threads = [
+            threading.Thread(target=run_worker, args=(sync_client,), name=f"sync-run-{run_id}-{i}")
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return finalized[0] if finalized else None
+
+
+def _after_run(db: Session, run_id: int, finalized: Optional[Row]):
+    """Run 종료 후처리 (종료 전환을 수행한 경우 한 번): 에러/품질 요약, 평단가 집계 재계산"""
+    if finalized is None:
+        return
+    try:
+        summarize_run(db, run_id)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[sync] Run {run_id}: run summary failed: {e}")
+
+    # 이번 Run에서 갱신된 (단지, 월) 버킷만 평단가 집계 재계산
+    if finalized.success_count:
+        try:
+            from services.price_rollup import refresh_rollups_for_run
+            refresh_rollups_for_run(db, run_id)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"[sync] Run {run_id}: price rollup refresh failed: {e}")
+
+
+def _mark_crashed(db: Session, run_id: int, error: Exception):
+    logger.exception(f"[sync] Run {run_id} crashed: {error}")
+    try:
+        db.rollback()
+        run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+        if run:
+            run.status = RunStatus.FAILED
+            run.finished_at = datetime.utcnow()
+            run.error_summary = str(error)[:500]
+            db.commit()
+    except Exception:
+        pass
+
+
+def collect_complex_sync(run_id: int, complex_ids: List[int], force: bool = False):
     """
     Celery 없이 동기적으로 수집을 실행.
     별도 스레드(BackgroundTasks)에서 호출됨.
+    수집 예정 시각이 지난 (단지, 유형)만 수집 (force=True면 전체).
     """
     db = SessionLocal()
     try:
@@ -268,8 +542,12 @@ def collect_complex_sync(run_id: int, complex_ids: List[int]):
         if not run:
             logger.error(f"Run {run_id} not found")
             return
+        if run.status == RunStatus.CANCELLED:
+            logger.info(f"[sync] Run {run_id} cancelled before start")
+            return
         run.status = RunStatus.RUNNING
         run.started_at = datetime.utcnow()
+        run.triggered_by = SYNC_TRIGGER
         db.commit()
 
         complexes = db.query(Complex).filter(Complex.id.in_(complex_ids)).all()
@@ -279,62 +557,73 @@ def collect_complex_sync(run_id: int, complex_ids: List[int]):
             db.commit()
             return
 
+        due = due_task_types(
+            db, [c.id for c in complexes], (TaskType.KB_PRICE, TaskType.KB_LISTING), force=force,
+        )
+        log_due_summary(f"[sync] Run {run_id}", len(complexes), due, force)
+
         # 총 태스크 수 계산
         total_tasks = 0
         complex_areas = []
-        for c in complexes:
-            areas = c.areas or _ensure_areas(db, c)
-            complex_areas.append((c, areas))
-            total_tasks += len(areas) + 1  # 시세(면적별) + 매물(1)
+        # 우선순위 높은 단지부터 수집
+        for c in by_collection_priority(complexes):
+            task_types = due.get(c.id)
+            if not task_types:
+                continue
+            areas = (c.areas or _ensure_areas(db, c)) if TaskType.KB_PRICE in task_types else []
+            with_listing = TaskType.KB_LISTING in task_types
+            complex_areas.append((c.id, [a.id for a in areas], with_listing))
+            total_tasks += len(areas) + int(with_listing)  # 시세(면적별) + 매물(1)
 
         run.total_tasks = total_tasks
+        if total_tasks == 0:
+            # 수집할 대상이 없으면 바로 종료
+            run.status = RunStatus.SUCCESS
+            run.finished_at = datetime.utcnow()
         db.commit()
 
-        success_count = 0
-        failed_count = 0
-
-        for c, areas in complex_areas:
-            # 시세 수집 (면적별)
-            for area in areas:
-                result = _collect_price(db, run_id, c.id, area.id)
-                if result["status"] == "success":
-                    success_count += 1
-                else:
-                    failed_count += 1
-
-            # 매물 수집
-            result = _collect_listing(db, run_id, c.id)
-            if result["status"] == "success":
-                success_count += 1
-            else:
-                failed_count += 1
+        # 워커 스레드들이 단지 단위로 나눠 수집, 태스크마다 Run 카운터 갱신 (진행률 실시간 조회)
+        finalized = _collect_concurrently(run_id, complex_areas)
+        _after_run(db, run_id, finalized)
+    except Exception as e:
+        _mark_crashed(db, run_id, e)
+    finally:
+        db.close()
 
-        # 완료 처리
-        run.success_count = success_count
-        run.failed_count = failed_count
-        run.finished_at = datetime.utcnow()
-        if failed_count == 0:
-            run.status = RunStatus.SUCCESS
-        elif success_count == 0:
-            run.status = RunStatus.FAILED
-        else:
-            run.status = RunStatus.PARTIAL
-        db.commit()
 
-        logger.info(
-            f"[sync] Run {run_id} complete: {run.status.value} "
-            f"(success={success_count}, failed={failed_count})"
-        )
+def resume_complex_sync(run_id: int):
+    """
+    재개한 Run(services.run_dispatch.reset_for_resume)의 PENDING 태스크를 Celery 없이 수집.
+    별도 스레드(BackgroundTasks)에서 호출됨. 카운터/종료 처리는 일반 수집과 동일.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(CrawlTask.task_type, CrawlTask.complex_id, CrawlTask.area_id)
+            .where(
+                CrawlTask.run_id == run_id,
+                CrawlTask.status == TaskStatus.PENDING,
+                CrawlTask.task_type.in_((TaskType.KB_PRICE, TaskType.KB_LISTING)),
+            )
+            .order_by(CrawlTask.id)  # 기록 순서 = 단지 우선순위 순
+        ).all()
+        area_ids: Dict[int, List[int]] = {}
+        listing_ids: Set[int] = set()
+        for row in rows:
+            area_ids.setdefault(row.complex_id, [])
+            if row.task_type == TaskType.KB_LISTING:
+                listing_ids.add(row.complex_id)
+            elif row.area_id is not None:
+                area_ids[row.complex_id].append(row.area_id)
+        work = [(cid, aids, cid in listing_ids) for cid, aids in area_ids.items()]
+        logger.info(f"[sync] Run {run_id}: resuming {len(rows)} tasks over {len(work)} complexes")
+
+        finalized = _collect_concurrently(run_id, work, resume=True)
+        if finalized is None:
+            # 시작할 태스크가 없었던 경우 (다른 곳에서 먼저 처리)
+            finalized = try_finalize_run(db, run_id)
+        _after_run(db, run_id, finalized)
     except Exception as e:
-        logger.exception(f"[sync] Run {run_id} crashed: {e}")
-        try:
-            run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
-            if run:
-                run.status = RunStatus.FAILED
-                run.finished_at = datetime.utcnow()
-                run.error_summary = str(e)[:500]
-                db.commit()
-        except Exception:
-            pass
+        _mark_crashed(db, run_id, e)
     finally:
         db.close()
@@ -0,0 +1,75 @@
+"""
+태스크 단위 재시도 / dead-letter.
+
+워커에서는 커넥터 내부 재시도(time.sleep 대기)를 끄고, 재시도할 수 있는 오류면
+태스크를 RETRY로 두고 countdown을 걸어 다시 발행합니다 (대기 중에는 워커 슬롯을 잡지 않음).
+
+- 재시도 대상: RateLimitError, BrowserError, NetworkError (오류 유형별 기본 간격 × 2^재시도 횟수, 상한 + jitter)
+- 재시도 횟수: CrawlTask.retry_count, settings.collection_task_max_retries까지
+- 재시도할 수 없거나 횟수를 모두 쓴 실패 → FAILED + dead_lettered_at 기록 (dead-letter)
+- dead-letter 재실행: take_dead_letters로 대상을 꺼내 새 Run에 다시 기록 (같은 태스크를 두 번 꺼내지 않음)
+"""
+import random
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from connectors.base import BrowserError, NetworkError, RateLimitError
+from core.config import settings
+from models import CrawlTask, TaskType
+from services.run_dispatch import DispatchTarget
+
+REPLAY_TRIGGER = "replay"
+
+# 오류 유형별 첫 재시도 간격(초) (앞에서부터 먼저 일치하는 유형 적용)
+_RETRY_BASE_SECONDS = (
+    (RateLimitError, 60.0),
+    (BrowserError, 30.0),
+    (NetworkError, 10.0),
+)
+
+# 재실행할 수 있는 태스크 유형 (미리 기록된 태스크 묶음으로 실행되는 수집)
+REPLAYABLE_TASK_TYPES = (TaskType.KB_PRICE, TaskType.KB_TRANSACTION, TaskType.KB_LISTING)
+
+
+def retry_delay(error: BaseException, retry_count: int) -> Optional[float]:
+    """다시 실행할 오류면 다음 실행까지 대기 시간(초), 재시도할 수 없거나 횟수를 모두 썼으면 None"""
+    if retry_count >= settings.collection_task_max_retries:
+        return None
+    for error_class, base_seconds in _RETRY_BASE_SECONDS:
+        if isinstance(error, error_class):
+            delay = min(base_seconds * (2 ** retry_count), settings.collection_retry_max_seconds)
+            # 같은 시각에 실패한 태스크들이 동시에 다시 요청하지 않도록 절반은 무작위
+            return delay / 2 + random.uniform(0, delay / 2)
+    return None
+
+
+def take_dead_letters(db: Session, task_ids: Sequence[int]) -> List[DispatchTarget]:
+    """
+    dead-letter 태스크를 꺼내 재실행 대상 (유형, 단지, 면적) 목록을 반환 (커밋은 호출 측).
+    이미 꺼낸 태스크는 제외, 같은 대상은 한 번만.
+    """
+    if not task_ids:
+        return []
+    rows = db.execute(
+        update(CrawlTask)
+        .where(
+            CrawlTask.id.in_(list(task_ids)),
+            CrawlTask.dead_lettered_at.isnot(None),
+            CrawlTask.task_type.in_(REPLAYABLE_TASK_TYPES),
+        )
+        .values(dead_lettered_at=None)
+        .returning(CrawlTask.id, CrawlTask.task_type, CrawlTask.complex_id, CrawlTask.area_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    targets = {}
+    for row in sorted(rows, key=lambda r: r.id):
+        targets.setdefault((row.task_type, row.complex_id, row.area_id), None)
+    return list(targets)
+
+
+def mark_dead_letter(task: CrawlTask):
+    """최종 실패 태스크를 dead-letter로 기록 (커밋은 호출 측)"""
+    task.dead_lettered_at = datetime.utcnow()
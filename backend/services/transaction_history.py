@@ -0,0 +1,69 @@
+"""
+실거래 이력 저장 / backfill 레인 조정.
+
+- insert_new_transactions: 자연키(단지, 계약일, 거래가, 전용면적) 기준으로 기존 거래를 제외하고 일괄 INSERT
+  (층이 없는 거래는 유니크 인덱스로 걸러지지 않으므로 먼저 조회해서 제외)
+- daily_collection_active: backfill 태스크가 일일 수집과 요청 한도를 다투지 않도록
+  진행 중인 일반 수집 Run이 있는지 확인
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models import CrawlRun, RunStatus, Transaction
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_TRIGGER = "backfill"
+
+# 이보다 오래 RUNNING인 Run은 멈춘 것으로 보고 backfill을 막지 않음
+_STALE_RUN_HOURS = 6
+
+
+def insert_new_transactions(db: Session, rows: List[dict]) -> int:
+    """기존에 없는 거래만 INSERT (커밋은 호출 측에서). 추가된 행 수를 반환"""
+    if not rows:
+        return 0
+    keys = {(r["complex_id"], r["contract_date"], r["price"], r["exclusive_m2"]) for r in rows}
+    existing = set(db.execute(
+        select(
+            Transaction.complex_id, Transaction.contract_date,
+            Transaction.price, Transaction.exclusive_m2,
+        ).where(
+            tuple_(
+                Transaction.complex_id, Transaction.contract_date,
+                Transaction.price, Transaction.exclusive_m2,
+            ).in_(keys)
+        )
+    ).all())
+    rows = [
+        r for r in rows
+        if (r["complex_id"], r["contract_date"], r["price"], r["exclusive_m2"]) not in existing
+    ]
+    if not rows:
+        return 0
+    result = db.execute(
+        insert(Transaction).values(rows).on_conflict_do_nothing(
+            index_elements=[
+                Transaction.complex_id, Transaction.contract_date, Transaction.price,
+                Transaction.exclusive_m2, Transaction.floor,
+            ],
+        )
+    )
+    return result.rowcount or 0
+
+
+def daily_collection_active(db: Session) -> bool:
+    """backfill이 아닌 수집 Run이 진행 중인지"""
+    since = datetime.utcnow() - timedelta(hours=_STALE_RUN_HOURS)
+    return db.scalar(
+        select(CrawlRun.id).where(
+            CrawlRun.status == RunStatus.RUNNING,
+            CrawlRun.started_at >= since,
+            or_(CrawlRun.triggered_by.is_(None), CrawlRun.triggered_by != BACKFILL_TRIGGER),
+        ).limit(1)
+    ) is not None
@@ -0,0 +1,115 @@
+"""
+테스트 공통 fixture.
+
+DATABASE_URL의 PostgreSQL에 테이블을 만들고(create_all) 테스트마다 만든 Run/태스크/원문 행을 지웁니다.
+DB에 연결할 수 없으면 DB를 쓰는 테스트는 건너뜁니다.
+테스트 의존성: pip install -r requirements-dev.txt
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakeredis  # noqa: E402
+from sqlalchemy import delete, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+import core.redis  # noqa: E402
+from core.database import SessionLocal, engine  # noqa: E402
+from models import Base, CrawlRun, CrawlTask, RawPayload, RunStatus, TaskStatus  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    try:
+        Base.metadata.create_all(bind=engine)
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    return engine
+
+
+@pytest.fixture
+def db(db_engine):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_tasks(db):
+    """테스트용 Run 하나와 태스크 n개를 만들고 태스크 id 목록을 반환 (테스트 후 원문 행까지 삭제)"""
+    run_ids = []
+
+    def factory(n: int, task_key: str = "test_task"):
+        run = CrawlRun(status=RunStatus.RUNNING, triggered_by="test")
+        db.add(run)
+        db.flush()
+        run_ids.append(run.id)
+        tasks = [CrawlTask(run_id=run.id, task_key=f"{task_key}_{i}", status=TaskStatus.RUNNING) for i in range(n)]
+        db.add_all(tasks)
+        db.commit()
+        return [task.id for task in tasks]
+
+    yield factory
+
+    db.rollback()
+    task_ids = select(CrawlTask.id).where(CrawlTask.run_id.in_(run_ids))
+    db.execute(delete(RawPayload).where(RawPayload.task_id.in_(task_ids)))
+    db.execute(delete(CrawlTask).where(CrawlTask.run_id.in_(run_ids)))
+    db.execute(delete(CrawlRun).where(CrawlRun.id.in_(run_ids)))
+    db.commit()
+
+
+@pytest.fixture
+def make_run(db):
+    """
+    테스트용 Run 하나와 태스크들을 만들고 (run_id, 태스크 id 목록)을 반환.
+    tasks: CrawlTask 컬럼 값 dict 목록 (task_key 생략 가능), run_fields: CrawlRun 컬럼 값.
+    """
+    run_ids = []
+
+    def factory(tasks, **run_fields):
+        run_fields.setdefault("status", RunStatus.RUNNING)
+        run_fields.setdefault("triggered_by", "test")
+        run_fields.setdefault("total_tasks", len(tasks))
+        run = CrawlRun(**run_fields)
+        db.add(run)
+        db.flush()
+        run_ids.append(run.id)
+        records = [
+            CrawlTask(run_id=run.id, **{"task_key": f"test_task_{i}", "retry_count": 0, **fields})
+            for i, fields in enumerate(tasks)
+        ]
+        db.add_all(records)
+        db.commit()
+        return run.id, [record.id for record in records]
+
+    yield factory
+
+    db.rollback()
+    task_ids = select(CrawlTask.id).where(CrawlTask.run_id.in_(run_ids))
+    db.execute(delete(RawPayload).where(RawPayload.task_id.in_(task_ids)))
+    db.execute(delete(CrawlTask).where(CrawlTask.run_id.in_(run_ids)))
+    db.execute(delete(CrawlRun).where(CrawlRun.id.in_(run_ids)))
+    db.commit()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """공유 Redis 클라이언트를 프로세스 내 fakeredis로 교체"""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(core.redis, "_client", client)
+    monkeypatch.setattr(core.redis, "_unavailable_until", 0.0)
+    return client
+
+
+@pytest.fixture
+def eager_celery(fake_redis):
+    """Celery 태스크를 발행 대신 바로 실행 (apply_async/delay → 같은 프로세스)"""
+    from workers.celery_app import celery_app
+
+    celery_app.conf.task_always_eager = True
+    yield celery_app
+    celery_app.conf.task_always_eager = False
@@ -0,0 +1,73 @@
+"""
+Run 간 중복 수집 방지 테스트: 같은 대상의 선점(lease)이 Run 사이에서 공유되고 종료 상태에 따라 유지/해제되는지.
+"""
+import workers.tasks as tasks
+from core.config import settings
+from models import CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+from services.collection_dedup import _lease_key, claim_collection, finish_collection
+
+TARGET = {"task_type": TaskType.KB_PRICE, "complex_id": 1, "area_id": 1, "status": TaskStatus.PENDING}
+
+
+def two_runs(db, make_run):
+    """같은 대상을 가진 Run 두 개 → (Run A 태스크, Run B 태스크)"""
+    _, (first_id,) = make_run([TARGET])
+    _, (second_id,) = make_run([TARGET])
+    return db.get(CrawlTask, first_id), db.get(CrawlTask, second_id)
+
+
+def test_lease_is_shared_across_runs(db, make_run, fake_redis):
+    first, second = two_runs(db, make_run)
+
+    assert claim_collection(first) is None
+    # 수집 중인 대상 → 다른 Run은 선점한 Run ID를 받음, 같은 태스크 재실행(중복 전달)은 진행
+    assert claim_collection(second) == first.run_id
+    assert claim_collection(first) is None
+    assert 0 < fake_redis.ttl(_lease_key(first)) <= settings.collection_inflight_stale_seconds
+
+    # 다른 Run의 종료 처리는 선점을 건드리지 않음
+    second.status = TaskStatus.FAILED
+    finish_collection(second)
+    assert claim_collection(second) == first.run_id
+
+
+def test_success_keeps_lease_for_dedup_window_and_failure_releases(db, make_run, fake_redis):
+    first, second = two_runs(db, make_run)
+
+    assert claim_collection(first) is None
+    first.status = TaskStatus.SUCCESS
+    finish_collection(first)
+    assert 0 < fake_redis.ttl(_lease_key(first)) <= settings.collection_dedup_window_seconds
+    assert claim_collection(second) == first.run_id
+
+    fake_redis.delete(_lease_key(first))
+    assert claim_collection(first) is None
+    first.status = TaskStatus.FAILED
+    finish_collection(first)
+    # 실패하면 바로 해제 → 다른 Run이 다시 수집
+    assert fake_redis.get(_lease_key(first)) is None
+    assert claim_collection(second) is None
+
+
+def test_chunk_skips_target_collected_by_another_run(db, make_run, eager_celery, monkeypatch):
+    first, second = two_runs(db, make_run)
+    calls = []
+
+    def collector(db, task_record, throttle, states=None):
+        calls.append(task_record.id)
+        return {"status": "success"}
+
+    monkeypatch.setattr(tasks, "_CHUNK_COLLECTORS", {TaskType.KB_PRICE: collector})
+    assert claim_collection(first) is None
+
+    result = tasks.collect_task_chunk.apply(kwargs={"run_id": second.run_id, "task_ids": [second.id]}).get()
+
+    assert result["skipped"] == 1
+    assert calls == []
+    db.expire_all()
+    task = db.get(CrawlTask, second.id)
+    assert task.status == TaskStatus.SKIPPED
+    assert task.covered_by_run_id == first.run_id
+    run = db.get(CrawlRun, second.run_id)
+    assert run.status == RunStatus.SUCCESS
+    assert run.skipped_count == 1
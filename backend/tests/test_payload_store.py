@@ -0,0 +1,119 @@
+"""
+원문 저장소(services.payload_store) 왕복 테스트: 파일시스템 백엔드 + 실제 DB.
+"""
+import os
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+
+from models import CrawlRun, CrawlTask, PayloadDictionary, RawPayload
+from services import payload_store
+from services.payload_store import FilesystemBackend, PayloadStore, content_hash, train_payload_dictionary
+
+
+def listing_payload(complex_id: int, variant: int = 0) -> dict:
+    return {
+        "propertyList": [
+            {
+                "매물일련번호": 9000000 + complex_id * 100 + i,
+                "매매가": 80000 + (i + variant) * 500,
+                "전용면적": f"{59 + (i % 4) * 25}.97",
+                "해당층수": f"{i % 25 + 1}/25",
+                "중개업소명": "한빛공인중개사사무소",
+                "매물특징내용": "남향, 역세권, 올수리, 즉시입주 가능",
+            }
+            for i in range(20)
+        ],
+        "총매물건수": 20,
+    }
+
+
+@pytest.fixture
+def endpoint(db):
+    """테스트마다 다른 엔드포인트 (사전 캐시/사전 행 분리)"""
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    yield name
+    payload_store._latest_dicts.pop(name, None)
+    db.rollback()
+    db.execute(delete(PayloadDictionary).where(PayloadDictionary.endpoint == name))
+    db.commit()
+
+
+def stored_files(root) -> list:
+    return [os.path.join(d, f) for d, _, files in os.walk(root) for f in files]
+
+
+def test_same_content_is_stored_once(db, make_tasks, endpoint, tmp_path):
+    task_ids = make_tasks(3)
+    store = PayloadStore(db, backend=FilesystemBackend(str(tmp_path)), inline_max_bytes=0)
+    payload = listing_payload(1)
+    store.add(task_ids[0], payload, endpoint=endpoint)
+    store.add(task_ids[1], dict(reversed(list(payload.items()))), endpoint=endpoint)  # 키 순서만 다름
+    store.add(task_ids[2], listing_payload(2), endpoint=endpoint)
+
+    assert store.flush() == 3
+
+    rows = db.execute(
+        select(RawPayload.task_id, RawPayload.content_hash, RawPayload.storage_path)
+        .where(RawPayload.task_id.in_(task_ids))
+        .order_by(RawPayload.task_id)
+    ).all()
+    assert [row.content_hash for row in rows] == [content_hash(payload)] * 2 + [content_hash(listing_payload(2))]
+    # 본문은 해시별 최초 행에만, 같은 해시의 다음 행은 참조만
+    assert rows[0].storage_path is not None and rows[1].storage_path is None
+    assert len(stored_files(tmp_path)) == 2
+
+    # 다음 flush에서도 이미 저장된 해시는 다시 쓰지 않음
+    more = make_tasks(1)
+    store.add(more[0], payload, endpoint=endpoint)
+    assert store.flush() == 1
+    assert db.scalar(select(RawPayload.storage_path).where(RawPayload.task_id == more[0])) is None
+    assert len(stored_files(tmp_path)) == 2
+
+    assert PayloadStore(db, backend=FilesystemBackend(str(tmp_path))).load(content_hash(payload)) == payload
+
+
+def test_dictionary_compressed_payload_round_trips(db, make_tasks, endpoint, tmp_path):
+    backend = FilesystemBackend(str(tmp_path))
+    samples = make_tasks(30)
+    store = PayloadStore(db, backend=backend)
+    for i, task_id in enumerate(samples):
+        store.add(task_id, listing_payload(i), endpoint=endpoint)
+    store.flush()
+
+    dict_id = train_payload_dictionary(db, endpoint, dict_size=4096)
+    assert dict_id is not None
+
+    task_id = make_tasks(1)[0]
+    payload = listing_payload(500, variant=3)
+    store = PayloadStore(db, backend=backend, inline_max_bytes=0)
+    store.add(task_id, payload, endpoint=endpoint)
+    store.flush()
+
+    row = db.execute(
+        select(RawPayload.compression, RawPayload.storage_path).where(RawPayload.task_id == task_id)
+    ).one()
+    assert row.compression == f"zstd-dict:{dict_id}"
+    assert row.storage_path is not None
+
+    # 프로세스 캐시 없이 DB의 사전으로 복원
+    payload_store._latest_dicts.pop(endpoint, None)
+    payload_store._dicts_by_id.pop(dict_id, None)
+    assert PayloadStore(db, backend=backend).load(content_hash(payload)) == payload
+
+
+def test_failed_flush_keeps_caller_changes(db, make_tasks, endpoint, tmp_path):
+    task_id = make_tasks(1)[0]
+    run = db.get(CrawlTask, task_id).run
+    run.error_summary = "caller change"  # 호출 측이 아직 커밋하지 않은 변경
+
+    store = PayloadStore(db, backend=FilesystemBackend(str(tmp_path)))
+    store.add(task_id, listing_payload(1), endpoint=endpoint)
+    store.add(-1, listing_payload(2), endpoint=endpoint)  # 없는 태스크 → FK 위반
+    assert store.flush() == 0
+    assert len(store) == 0
+
+    db.expire_all()
+    assert db.get(CrawlRun, run.id).error_summary == "caller change"
+    assert db.scalar(select(RawPayload.id).where(RawPayload.task_id == task_id)) is None
@@ -0,0 +1,76 @@
+"""
+Run 취소 테스트 (services.run_cancel): 수집 중인 묶음이 다음 KB 요청 전에 멈추고 남은 태스크가 시작되지 않는지.
+"""
+import pytest
+from sqlalchemy import select
+
+import workers.tasks as tasks
+from connectors import KBTransactionHistoryConnector
+from connectors.base import CollectionCancelled
+from core.database import SessionLocal
+from models import CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+from services.run_cancel import CANCELLED_ERROR_TYPE, cancel_run, raise_if_cancelled
+
+
+def history_tasks(n: int) -> list:
+    return [
+        {"task_type": TaskType.KB_TRANSACTION_HISTORY, "complex_id": 1, "area_id": area_id, "status": TaskStatus.PENDING}
+        for area_id in range(1, n + 1)
+    ]
+
+
+def test_cancel_stops_running_chunk_before_next_request(db, make_run, eager_celery, monkeypatch):
+    run_id, task_ids = make_run(history_tasks(3))
+    cancelled = []
+    sent = []
+
+    def cancel_then_gate(self):
+        # 첫 KB 요청 직전에 API에서 취소가 들어온 상황
+        if not cancelled:
+            cancelled.append(run_id)
+            session = SessionLocal()
+            try:
+                assert cancel_run(session, run_id) is not None
+            finally:
+                session.close()
+        self._pass_request_gate()
+
+    def fetch(self, **kwargs):
+        raise AssertionError("cancelled run must not send KB requests")
+
+    monkeypatch.setattr(KBTransactionHistoryConnector, "_wait_for_rate_limit", cancel_then_gate)
+    monkeypatch.setattr(KBTransactionHistoryConnector, "fetch", fetch)
+    monkeypatch.setattr(tasks.collect_task_chunk, "apply_async", lambda **kw: sent.append(kw))
+
+    result = tasks.collect_task_chunk.apply(kwargs={"run_id": run_id, "task_ids": task_ids}).get()
+
+    assert result["cancelled"] == 1
+    assert result["not_started"] == 2
+    # 취소는 실패가 아니므로 재시도 메시지/dead-letter 없음
+    assert sent == []
+    db.expire_all()
+    rows = db.scalars(select(CrawlTask).where(CrawlTask.run_id == run_id).order_by(CrawlTask.id)).all()
+    assert [row.status for row in rows] == [TaskStatus.SKIPPED] * 3
+    assert [row.error_type for row in rows] == [CANCELLED_ERROR_TYPE] * 3
+    assert all(row.dead_lettered_at is None for row in rows)
+    assert rows[0].started_at is not None
+    assert rows[1].started_at is None and rows[2].started_at is None
+    run = db.get(CrawlRun, run_id)
+    assert run.status == RunStatus.CANCELLED
+    assert run.skipped_count == 3
+
+
+def test_cancel_only_applies_to_unfinished_runs(db, make_run, fake_redis):
+    run_id, (task_id,) = make_run(history_tasks(1))
+
+    counts = cancel_run(db, run_id)
+
+    assert counts.skipped_count == 1
+    with pytest.raises(CollectionCancelled):
+        raise_if_cancelled(run_id)
+    db.expire_all()
+    assert db.get(CrawlTask, task_id).status == TaskStatus.SKIPPED
+    # 이미 끝난 Run은 다시 취소되지 않고 카운터도 그대로
+    assert cancel_run(db, run_id) is None
+    db.expire_all()
+    assert db.get(CrawlRun, run_id).skipped_count == 1
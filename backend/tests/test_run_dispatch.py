@@ -0,0 +1,87 @@
+"""
+Run 태스크 분할 발행 테스트 (services.run_dispatch + workers.tasks 묶음 실행).
+"""
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy import delete, select
+
+import workers.tasks as tasks
+from core.config import settings
+from models import Area, Complex, CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+from workers.celery_app import BACKFILL_QUEUE
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """발행한 묶음 메시지 (실제로 발행하지 않음)"""
+    messages = []
+    monkeypatch.setattr(tasks.collect_task_chunk, "apply_async", lambda **kw: messages.append(kw))
+    return messages
+
+
+@pytest.fixture
+def complex_with_areas(db):
+    complex_obj = Complex(name="dispatch-test", address="서울 테스트구 1")
+    db.add(complex_obj)
+    db.flush()
+    db.add_all([Area(complex_id=complex_obj.id, exclusive_m2=40.0 + i) for i in range(6)])
+    db.commit()
+    yield complex_obj.id
+
+    db.rollback()
+    run_ids = db.scalars(select(CrawlTask.run_id).where(CrawlTask.complex_id == complex_obj.id).distinct()).all()
+    db.execute(delete(CrawlTask).where(CrawlTask.run_id.in_(run_ids)))
+    db.execute(delete(CrawlRun).where(CrawlRun.id.in_(run_ids)))
+    db.execute(delete(Area).where(Area.complex_id == complex_obj.id))
+    db.execute(delete(Complex).where(Complex.id == complex_obj.id))
+    db.commit()
+
+
+def test_backfill_dispatches_chunks_within_inflight_window(db, complex_with_areas, fake_redis, sent, monkeypatch):
+    monkeypatch.setattr(settings, "collection_inflight_tasks", 4)
+    monkeypatch.setattr(settings, "collection_chunk_size", 2)
+
+    result = tasks.backfill_price_history.apply(kwargs={"complex_ids": [complex_with_areas]}).get()
+
+    assert result["total_tasks"] == 6
+    # 대상 6개 중 window(4)만큼만 2개씩 묶어 kb_backfill 큐로
+    assert [len(message["kwargs"]["task_ids"]) for message in sent] == [2, 2]
+    assert {message["queue"] for message in sent} == {BACKFILL_QUEUE}
+    dispatched = db.scalars(
+        select(CrawlTask.dispatched_at.isnot(None)).where(CrawlTask.run_id == result["run_id"]).order_by(CrawlTask.id)
+    ).all()
+    assert dispatched == [True] * 4 + [False] * 2
+
+
+def test_chunk_releases_unfinished_tasks_on_soft_time_limit(db, make_run, fake_redis, sent, monkeypatch):
+    run_id, task_ids = make_run(
+        [{"task_type": TaskType.KB_PRICE, "complex_id": 1, "area_id": i, "status": TaskStatus.PENDING} for i in range(3)],
+    )
+    calls = []
+
+    def collector(db, task_record, throttle, states=None):
+        calls.append(task_record.id)
+        if len(calls) == 2:
+            raise SoftTimeLimitExceeded()
+        task_record.status = TaskStatus.SUCCESS
+        task_record.finished_at = task_record.started_at
+        db.commit()
+        tasks._finalize_run_if_complete(db, task_record.run_id, task_record.status)
+        return {"status": "success"}
+
+    monkeypatch.setitem(tasks._CHUNK_COLLECTORS, TaskType.KB_PRICE, collector)
+
+    result = tasks.collect_task_chunk.apply(kwargs={"run_id": run_id, "task_ids": task_ids}).get()
+
+    assert result["success"] == 1
+    assert result["released"] == 2
+    db.expire_all()
+    first, running, waiting = (db.get(CrawlTask, task_id) for task_id in task_ids)
+    assert first.status == TaskStatus.SUCCESS
+    # 실행 중이던 태스크와 남은 태스크는 PENDING으로 되돌려 새 묶음으로 다시 발행
+    assert running.status == waiting.status == TaskStatus.PENDING
+    assert running.started_at is None
+    assert sorted(i for message in sent for i in message["kwargs"]["task_ids"]) == task_ids[1:]
+    run = db.get(CrawlRun, run_id)
+    assert run.status == RunStatus.RUNNING
+    assert run.success_count == 1
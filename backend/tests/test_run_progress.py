@@ -0,0 +1,72 @@
+"""
+Run 진행률 집계 테스트: 여러 워커가 동시에 결과를 반영해도 카운터가 빠지지 않고 Run 종료는 한 번만 일어나는지.
+"""
+import threading
+from collections import Counter
+
+from core.database import SessionLocal
+from models import CrawlRun, RunStatus, TaskStatus
+from services.run_progress import record_task_result, try_finalize_run
+
+WORKERS = 8
+TASKS_PER_WORKER = 5
+
+
+def test_concurrent_results_count_every_task_and_finalize_once(db, make_run):
+    total = WORKERS * TASKS_PER_WORKER
+    run_id, _ = make_run([], total_tasks=total)
+    statuses = [TaskStatus.SUCCESS, TaskStatus.FAILED, TaskStatus.SKIPPED]
+    # 워커별로 반영할 결과 (세 상태가 섞이도록)
+    plan = [[statuses[(index + i) % len(statuses)] for i in range(TASKS_PER_WORKER)] for index in range(WORKERS)]
+    barrier = threading.Barrier(WORKERS)
+    finalized = []
+    errors = []
+
+    def worker(index: int):
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            for status in plan[index]:
+                row = record_task_result(session, run_id, status)
+                if row is not None:
+                    finalized.append(row)
+        except Exception as e:  # 스레드 예외는 pytest로 전달되지 않으므로 모아서 검사
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db.expire_all()
+    run = db.get(CrawlRun, run_id)
+    expected = Counter(status for results in plan for status in results)
+    assert (run.success_count, run.failed_count, run.skipped_count) == (
+        expected[TaskStatus.SUCCESS],
+        expected[TaskStatus.FAILED],
+        expected[TaskStatus.SKIPPED],
+    )
+
+    # 마지막 결과를 반영한 호출 하나만 종료 결과를 받음
+    assert len(finalized) == 1
+    assert finalized[0].status == RunStatus.PARTIAL
+    assert run.status == RunStatus.PARTIAL
+    assert run.finished_at is not None
+
+
+def test_finalize_is_noop_until_done_and_after_finalized(db, make_run):
+    run_id, _ = make_run([], total_tasks=2)
+
+    assert record_task_result(db, run_id, TaskStatus.SUCCESS) is None
+    assert try_finalize_run(db, run_id) is None
+
+    row = record_task_result(db, run_id, TaskStatus.SUCCESS)
+    assert row is not None and row.status == RunStatus.SUCCESS
+    # 이미 종료된 Run은 다시 전환되지 않음
+    assert try_finalize_run(db, run_id) is None
+    db.expire_all()
+    assert db.get(CrawlRun, run_id).status == RunStatus.SUCCESS
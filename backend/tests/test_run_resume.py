@@ -0,0 +1,51 @@
+"""
+Run 재개/묶음 실행 테스트: 재개한 태스크가 실행되지 못해 Run이 RUNNING에 머무르지 않는지.
+"""
+from sqlalchemy import select
+
+import workers.tasks as tasks
+from models import CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+from services.run_dispatch import UNSUPPORTED_ERROR_TYPE, reset_for_resume
+from services.transaction_history import BACKFILL_TRIGGER
+from workers.celery_app import BACKFILL_QUEUE
+
+
+def test_chunk_skips_task_without_collector_and_finalizes_run(db, make_run, eager_celery, monkeypatch):
+    run_id, (task_id,) = make_run(
+        [{"task_type": TaskType.KB_TRANSACTION_HISTORY, "complex_id": 1, "area_id": 1, "status": TaskStatus.PENDING}],
+    )
+    monkeypatch.setattr(tasks, "_CHUNK_COLLECTORS", {})
+
+    result = tasks.collect_task_chunk.apply(kwargs={"run_id": run_id, "task_ids": [task_id]}).get()
+
+    assert result["skipped"] == 1
+    db.expire_all()
+    task = db.get(CrawlTask, task_id)
+    assert task.status == TaskStatus.SKIPPED
+    assert task.error_type == UNSUPPORTED_ERROR_TYPE
+    run = db.get(CrawlRun, run_id)
+    assert run.status == RunStatus.SUCCESS
+    assert run.skipped_count == 1
+
+
+def test_resumed_backfill_run_dispatches_to_backfill_queue(db, make_run, fake_redis, monkeypatch):
+    run_id, task_ids = make_run(
+        [
+            {"task_type": TaskType.KB_PRICE, "complex_id": 1, "area_id": area_id, "status": TaskStatus.FAILED}
+            for area_id in (1, 2)
+        ],
+        status=RunStatus.PARTIAL,
+        triggered_by=BACKFILL_TRIGGER,
+        failed_count=2,
+    )
+    sent = []
+    monkeypatch.setattr(tasks.collect_task_chunk, "apply_async", lambda **kw: sent.append(kw))
+
+    assert reset_for_resume(db, run_id) == 2
+    db.commit()
+    assert tasks._top_up_run(db, run_id) == 2
+
+    assert {message["queue"] for message in sent} == {BACKFILL_QUEUE}
+    assert sorted(i for message in sent for i in message["kwargs"]["task_ids"]) == task_ids
+    statuses = db.scalars(select(CrawlTask.status).where(CrawlTask.run_id == run_id)).all()
+    assert statuses == [TaskStatus.PENDING] * 2
@@ -0,0 +1,50 @@
+"""
+태스크 단위 재시도 / dead-letter 테스트 (services.task_retry, workers.tasks._record_failure).
+"""
+from sqlalchemy import select
+
+import connectors.base
+import workers.tasks as tasks
+from connectors import KBTransactionHistoryConnector
+from connectors.base import NetworkError
+from core.config import settings
+from models import CrawlRun, CrawlTask, RunStatus, TaskStatus, TaskType
+
+
+def test_history_task_retries_through_broker_then_dead_letters(db, make_run, eager_celery, monkeypatch):
+    run_id, _ = make_run([], total_tasks=1)
+    fetches = []
+
+    def failing_fetch(self, **kwargs):
+        fetches.append(kwargs)
+        raise NetworkError("connection reset")
+
+    def no_sleep(seconds):
+        raise AssertionError("connector must not sleep between retries inside the worker")
+
+    monkeypatch.setattr(KBTransactionHistoryConnector, "fetch", failing_fetch)
+    monkeypatch.setattr(KBTransactionHistoryConnector, "_wait_for_rate_limit", lambda self: None)
+    monkeypatch.setattr(connectors.base.time, "sleep", no_sleep)
+    sent = []
+    apply_async = tasks.collect_task_chunk.apply_async
+    monkeypatch.setattr(
+        tasks.collect_task_chunk, "apply_async", lambda **kw: sent.append(kw) or apply_async(**kw),
+    )
+
+    tasks.collect_kb_transaction_history_task.apply(kwargs={"run_id": run_id, "complex_id": 1, "area_id": 1}).get()
+
+    # 커넥터 내부 재시도 없이 실행마다 한 번 요청, 재시도는 countdown을 건 묶음 메시지로
+    max_retries = settings.collection_task_max_retries
+    assert len(fetches) == max_retries + 1
+    assert len(sent) == max_retries
+    assert all(message["countdown"] > 0 for message in sent)
+
+    db.expire_all()
+    task = db.scalars(select(CrawlTask).where(CrawlTask.run_id == run_id)).one()
+    assert task.task_type == TaskType.KB_TRANSACTION_HISTORY
+    assert task.status == TaskStatus.FAILED
+    assert task.retry_count == max_retries
+    assert task.dead_lettered_at is not None
+    run = db.get(CrawlRun, run_id)
+    assert run.status == RunStatus.FAILED
+    assert run.failed_count == 1
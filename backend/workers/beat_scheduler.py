@@ -0,0 +1,94 @@
+"""
+DB 기반 celery beat 스케줄러.
+
+celery_app.conf.beat_schedule의 고정 항목에 더해, ACTIVE CrawlJob의 cron_schedule을
+run_scheduled_job 항목으로 등록합니다.
+
+- beat_reload_seconds마다 DB를 다시 읽어 추가/수정/일시중지/삭제를 반영 (beat 재시작 불필요)
+- 변경 없는 항목은 기존 항목을 그대로 유지 (마지막 실행 시각 보존)
+- 작업별 시작 지연(stagger)은 countdown으로 적용
+"""
+import logging
+import time
+
+from celery.beat import Scheduler
+
+from core.config import settings
+from core.database import SessionLocal
+from services.job_schedule import load_scheduled_jobs, stagger_offset_seconds
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_PREFIX = "crawl-job-"
+_SCHEDULED_JOB_TASK = "workers.tasks.run_scheduled_job"
+
+
+class DatabaseScheduler(Scheduler):
+    """CrawlJob.cron_schedule을 주기적으로 다시 읽는 beat 스케줄러"""
+
+    def __init__(self, *args, **kwargs):
+        self._last_reload = None
+        self._job_schedules = {}
+        super().__init__(*args, **kwargs)
+        # 스케줄 변경이 늦어도 reload 주기 안에 반영되도록
+        self.max_interval = min(self.max_interval, settings.beat_reload_seconds)
+
+    def setup_schedule(self):
+        super().setup_schedule()
+        self._reload()
+
+    def get_schedule(self):
+        # 최초 로드는 setup_schedule에서 (고정 항목 merge가 DB 항목을 지우지 않도록)
+        if (
+            self._last_reload is not None
+            and time.monotonic() - self._last_reload >= settings.beat_reload_seconds
+        ):
+            self._reload()
+        return self.data
+
+    schedule = property(get_schedule, Scheduler.set_schedule)
+
+    def _reload(self):
+        self._last_reload = time.monotonic()
+        db = SessionLocal()
+        try:
+            jobs = load_scheduled_jobs(db)
+        except Exception as e:
+            # DB 장애 시 기존 스케줄 유지
+            logger.warning(f"Beat schedule reload failed, keeping previous schedule: {e}")
+            return
+        finally:
+            db.close()
+
+        current = {f"{_ENTRY_PREFIX}{job_id}": (job_id, expr, cron) for job_id, expr, cron in jobs}
+        if current.keys() == self._job_schedules.keys() and all(
+            self._job_schedules[name] == expr and name in self.data
+            for name, (_, expr, _) in current.items()
+        ):
+            return
+
+        for name in list(self.data):
+            if name.startswith(_ENTRY_PREFIX) and name not in current:
+                del self.data[name]
+
+        for name, (job_id, expr, cron) in current.items():
+            if self._job_schedules.get(name) == expr and name in self.data:
+                continue
+            self.data[name] = self.Entry(
+                name=name,
+                task=_SCHEDULED_JOB_TASK,
+                schedule=cron,
+                kwargs={"job_id": job_id},
+                options={"countdown": stagger_offset_seconds(job_id)},
+                app=self.app,
+            )
+
+        self._job_schedules = {name: expr for name, (_, expr, _) in current.items()}
+        logger.info(
+            f"Beat schedule reloaded: {len(current)} scheduled jobs "
+            f"{sorted(job_id for job_id, _, _ in current.values())}"
+        )
+
+    @property
+    def info(self):
+        return f"    . db -> crawl_jobs.cron_schedule (reload {settings.beat_reload_seconds}s)"
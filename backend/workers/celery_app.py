@@ -13,7 +13,8 @@ celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
-    timezone="UTC",
+    # crontab(CrawlJob.cron_schedule) 해석 기준 시간대, 메시지 시각은 UTC 유지
+    timezone=settings.schedule_timezone,
     enable_utc=True,
     task_track_started=True,
     task_time_limit=3600,  # 1 hour
@@ -22,12 +23,57 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
+# 단지 우선순위별 수집 큐 (라우팅/소비 비율은 workers.priority 참고)
+#   celery -A workers.celery_app worker -Q kb_high,kb_normal,kb_low
+HIGH_QUEUE = "kb_high"
+NORMAL_QUEUE = "kb_normal"
+LOW_QUEUE = "kb_low"
+# broker 우선순위 단계 (Redis는 0이 가장 높음)
+CONTROL_PRIORITY = 0
+COLLECTION_PRIORITY = 5
+BACKFILL_PRIORITY = 9
+celery_app.conf.task_default_queue = NORMAL_QUEUE
+# 우선순위를 지정하지 않은 메시지는 수집 태스크 단계로
+celery_app.conf.task_default_priority = COLLECTION_PRIORITY
+celery_app.conf.broker_transport_options = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "workers.priority:weighted_cycle",
+}
+
+# 이력 backfill은 별도 큐로 분리 (일일 수집 워커와 요청 한도/슬롯을 나누지 않음)
+#   celery -A workers.celery_app worker -Q kb_backfill --concurrency=1
+BACKFILL_QUEUE = "kb_backfill"
+_CONTROL_ROUTE = {'queue': HIGH_QUEUE, 'priority': CONTROL_PRIORITY}
+_BACKFILL_ROUTE = {'queue': BACKFILL_QUEUE, 'priority': BACKFILL_PRIORITY}
+celery_app.conf.task_routes = {
+    'workers.tasks.backfill_price_history': _BACKFILL_ROUTE,
+    'workers.tasks.backfill_transaction_history': _BACKFILL_ROUTE,
+    'workers.tasks.collect_kb_transaction_history_task': _BACKFILL_ROUTE,
+    # Run 시작/집계 제어 태스크는 수집 태스크보다 먼저 처리
+    'workers.tasks.run_kb_collection': _CONTROL_ROUTE,
+    'workers.tasks.run_region_collection': _CONTROL_ROUTE,
+    'workers.tasks.run_scheduled_job': _CONTROL_ROUTE,
+    'workers.tasks.refresh_price_rollups_task': _CONTROL_ROUTE,
+    'workers.tasks.finalize_run_task': _CONTROL_ROUTE,
+    'workers.tasks.replay_dead_letters_task': _CONTROL_ROUTE,
+    'workers.tasks.resume_run_task': _CONTROL_ROUTE,
+    'workers.tasks.top_up_stalled_runs': _CONTROL_ROUTE,
+}
+
 # Beat schedule for periodic tasks
+# CrawlJob.cron_schedule(시/도 배치 포함)은 DB 스케줄러가 주기적으로 다시 읽어 추가
+#   celery -A workers.celery_app beat
+celery_app.conf.beat_scheduler = "workers.beat_scheduler:DatabaseScheduler"
 celery_app.conf.beat_schedule = {
     'collect-kb-data-daily': {
         'task': 'workers.tasks.run_kb_collection',
         'schedule': 86400.0,  # Daily (24 hours)
     },
+    'top-up-stalled-runs': {
+        'task': 'workers.tasks.top_up_stalled_runs',
+        'schedule': float(settings.collection_sweep_interval_seconds),
+    },
 }
 
 # Auto-discover tasks
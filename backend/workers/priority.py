@@ -0,0 +1,93 @@
+"""
+단지 우선순위 기반 큐 라우팅.
+
+- 수집 태스크는 Complex.priority에 따라 kb_high / kb_normal / kb_low 큐로 발행
+- 워커 하나가 세 큐를 함께 소비할 때 큐별 소비 비율은 settings.celery_queue_weights
+  (broker_transport_options.queue_order_strategy = weighted_cycle)
+  - 가중치 비율대로 번갈아 꺼내고, 비어 있는 큐의 몫은 다음 큐가 가져감
+  - 가중치 0인 큐(기본 kb_low)는 다른 큐가 모두 비었을 때만 소비 (남는 처리량만 사용)
+- broker 우선순위(workers.celery_app, Redis는 0이 가장 높음): 우선순위 단계가 큐 순서보다 먼저
+  적용되므로 단지 우선순위는 큐로만 구분하고, 단계는 태스크 종류로만 나눔
+  - CONTROL_PRIORITY: Run 시작/집계 같은 짧은 제어 태스크 (수집 태스크 뒤에서 기다리지 않도록)
+  - COLLECTION_PRIORITY: 단지별 수집 태스크 (기본값)
+  - BACKFILL_PRIORITY: 이력 backfill
+"""
+from typing import Dict, List, Optional
+
+from kombu.utils.scheduling import round_robin_cycle
+
+from core.config import settings
+from models import PriorityLevel
+from workers.celery_app import COLLECTION_PRIORITY, HIGH_QUEUE, LOW_QUEUE, NORMAL_QUEUE
+
+PRIORITY_QUEUES: Dict[PriorityLevel, str] = {
+    PriorityLevel.HIGH: HIGH_QUEUE,
+    PriorityLevel.NORMAL: NORMAL_QUEUE,
+    PriorityLevel.LOW: LOW_QUEUE,
+}
+
+
+def collection_options(priority: Optional[PriorityLevel]) -> dict:
+    """단지 수집 태스크 apply_async 옵션 (단지 우선순위별 큐, broker 우선순위)"""
+    return {
+        "queue": PRIORITY_QUEUES.get(priority, NORMAL_QUEUE),
+        "priority": COLLECTION_PRIORITY,
+    }
+
+
+def parse_queue_weights(spec: str) -> Dict[str, int]:
+    """'kb_high:8,kb_normal:2,kb_low:0' → {큐: 가중치} (순서 유지, 잘못된 항목은 무시)"""
+    weights: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition(":")
+        if not name:
+            continue
+        try:
+            weights[name] = max(int(weight or 1), 0)
+        except ValueError:
+            continue
+    return weights
+
+
+class weighted_cycle(round_robin_cycle):
+    """
+    가중치 기반 큐 순서 (smooth weighted round-robin).
+
+    kombu Redis 채널은 consume()이 돌려준 순서로 BRPOP 하고(처음으로 비어 있지 않은 큐에서 꺼냄),
+    꺼낸 큐를 rotate()로 알려줌. 꺼낼 때마다 모든 큐의 점수에 가중치를 더하고
+    꺼낸 큐에서 가중치 합을 빼서, 점수 높은 큐를 먼저 시도.
+    """
+
+    def __init__(self, it=None):
+        super().__init__(it)
+        self.weights = parse_queue_weights(settings.celery_queue_weights)
+        self._rank = {name: i for i, name in enumerate(self.weights)}
+        self.credits: Dict[str, float] = {}
+
+    def _weight(self, queue: str) -> int:
+        return self.weights.get(queue, 1)
+
+    def consume(self, n: int) -> List[str]:
+        items = self.items[:n]
+        position = {queue: i for i, queue in enumerate(items)}
+        return sorted(
+            items,
+            key=lambda q: (
+                self._weight(q) == 0,
+                -self.credits.get(q, 0.0),
+                self._rank.get(q, len(self._rank)),
+                position[q],
+            ),
+        )
+
+    def rotate(self, last_used: str):
+        total = sum(self._weight(q) for q in self.items)
+        if not total:
+            return last_used
+        for queue in self.items:
+            self.credits[queue] = self.credits.get(queue, 0.0) + self._weight(queue)
+        self.credits[last_used] = self.credits.get(last_used, 0.0) - total
+        # 한 큐만 오래 비어 있었을 때 점수가 한쪽으로 쌓이지 않도록 제한
+        for queue in self.items:
+            self.credits[queue] = max(-total, min(total, self.credits[queue]))
+        return last_used
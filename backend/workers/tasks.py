@@ -7,24 +7,52 @@ KB부동산 데이터 수집 태스크:
 - KB 매물 수집 (단지별)
 - 지역 기반 단지 발견
 - 지역 기반 전체 수집
+- 정기 실행 (CrawlJob.cron_schedule, beat → run_scheduled_job)
 """
 import asyncio
 import json
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import logging
 
 from celery import Task
+from celery.exceptions import SoftTimeLimitExceeded
 from sqlalchemy.orm import Session
 
-from workers.celery_app import celery_app
+from workers.celery_app import BACKFILL_PRIORITY, BACKFILL_QUEUE, celery_app
+from workers.priority import collection_options
+from core.config import settings
 from core.database import SessionLocal
 from models import (
-    CrawlRun, CrawlTask, Complex, Area,
+    CrawlJob, CrawlRun, CrawlTask, Complex, Area, JobStatus, JobType,
     KBPrice, Transaction, Listing, ListingStatus,
-    RunStatus, TaskStatus,
+    RunStatus, TaskStatus, TaskType,
+)
+from connectors import (
+    CollectionCancelled,
+    KBPriceConnector, KBTransactionConnector, KBListingConnector, KBTransactionHistoryConnector,
+)
+from services.collection_schedule import by_collection_priority, due_task_types, log_due_summary
+from services.collection_dedup import claim_collection, finish_collection, mark_covered
+from services.collection_state import CollectionStateBatch, record_task_state
+from services.run_dispatch import (
+    UNSUPPORTED_ERROR_TYPE, DispatchTarget, claim_dispatch_batch, estimate_task_seconds, plan_run_tasks, planned_task_types,
+    release_tasks, runs_with_stale_dispatch, skip_planned_task, split_by_duration, start_planned_task, task_key,
+)
+from services.job_limits import JobThrottle
+from services.job_schedule import SCHEDULE_TRIGGER
+from services.listing_probe import ListingProbe, record_requests_avoided, touch_active_listings
+from services.payload_fingerprint import PayloadFingerprint
+from services.payload_store import store_raw_payload
+from services.price_series import upsert_price_series
+from services.run_cancel import CANCELLED_ERROR_TYPE, raise_if_cancelled
+from services.run_progress import record_task_result, try_finalize_run
+from services.run_summary import summarize_run
+from services.task_retry import mark_dead_letter, retry_delay, take_dead_letters
+from services.transaction_history import (
+    BACKFILL_TRIGGER, daily_collection_active, insert_new_transactions,
 )
-from connectors import KBPriceConnector, KBTransactionConnector, KBListingConnector
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +147,7 @@ def _get_target_complexes(
     """
     target_config에서 대상 단지 목록을 결정.
     - complex_ids가 있으면 해당 단지만 (활성 여부 무관)
+    - sido_code가 있으면 해당 시/도의 활성 단지 (시/도 배치)
     - 없으면 모든 활성 단지
     """
     if target_config:
@@ -131,50 +160,219 @@ def _get_target_complexes(
         if complex_ids and isinstance(complex_ids, list):
             return db.query(Complex).filter(Complex.id.in_(complex_ids)).all()
 
+        sido_code = config.get("sido_code")
+        if sido_code:
+            return db.query(Complex).filter(
+                Complex.region_code.like(f"{sido_code}%"),
+                Complex.is_active == True,
+            ).all()
+
     return db.query(Complex).filter(Complex.is_active == True).all()
 
 
-def _finalize_run_if_complete(db: Session, run_id: int):
+def _on_run_finalized(run_id: int, finalized) -> None:
     """
-    Run에 속한 모든 태스크가 완료(success/failed/skipped)되었는지 확인하고,
-    모두 끝났으면 Run 상태를 성공/실패/부분성공으로 갱신.
+    Run 종료 직후 후속 처리.
+    종료 전환(조건부 UPDATE)에 성공한 호출에만 finalized가 있으므로 Run당 정확히 한 번 콜백 발행.
     """
-    run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
-    if not run or run.status not in (RunStatus.RUNNING,):
-        return
-
-    total = run.total_tasks or 0
-    if total == 0:
-        return
+    if finalized is not None:
+        finalize_run_task.delay(run_id=run_id, refresh_rollups=bool(finalized.success_count))
 
-    finished_statuses = {TaskStatus.SUCCESS, TaskStatus.FAILED, TaskStatus.SKIPPED}
-    tasks = db.query(CrawlTask).filter(CrawlTask.run_id == run_id).all()
-    finished = [t for t in tasks if t.status in finished_statuses]
 
-    if len(finished) < total:
-        return  # 아직 진행 중
+def _finalize_run_if_complete(db: Session, run_id: int, status: TaskStatus):
+    """
+    종료된 태스크 결과를 Run 카운터에 원자적으로 반영하고,
+    마지막 태스크였다면 Run을 성공/실패/부분성공으로 종료.
+    """
+    try:
+        _on_run_finalized(run_id, record_task_result(db, run_id, status))
+    except Exception as e:
+        logger.exception(f"Run {run_id}: progress update failed: {e}")
+        db.rollback()
 
-    success = sum(1 for t in finished if t.status == TaskStatus.SUCCESS)
-    failed = sum(1 for t in finished if t.status == TaskStatus.FAILED)
-    skipped = sum(1 for t in finished if t.status == TaskStatus.SKIPPED)
 
-    run.success_count = success
-    run.failed_count = failed
-    run.skipped_count = skipped
-    run.finished_at = datetime.utcnow()
+def _acquire_job_slot(task: Task, db: Session, job_id: Optional[int]) -> Optional[JobThrottle]:
+    """
+    작업(CrawlJob)별 동시 실행 슬롯 획득 (services.job_limits).
+    슬롯이 꽉 차 있으면 잠시 뒤 다시 실행 (대기 중에는 워커 슬롯을 잡지 않음, 재시도 횟수 제한 없음).
+    """
+    throttle = JobThrottle.for_job(db, job_id)
+    if throttle is not None and not throttle.acquire_slot():
+        delay = settings.job_slot_retry_seconds
+        # 횟수 제한은 태스크 데코레이터의 max_retries=None (retry(max_retries=None)은 기본값 3으로 해석됨)
+        raise task.retry(countdown=delay + random.uniform(0, delay))
+    return throttle
 
-    if failed == 0:
-        run.status = RunStatus.SUCCESS
-    elif success == 0:
-        run.status = RunStatus.FAILED
-    else:
-        run.status = RunStatus.PARTIAL
 
+def _backfill_throttle(task: Task, db: Session, run_id: int) -> Optional[JobThrottle]:
+    """
+    backfill Run의 태스크: 일일 수집 Run이 진행 중이면 요청하지 않고 settings.backfill_defer_seconds 후 재시도,
+    아니면 backfill 전체 요청 한도(settings.backfill_rate_limit_per_minute). backfill Run이 아니면 None.
+    """
+    triggered_by = db.query(CrawlRun.triggered_by).filter(CrawlRun.id == run_id).scalar()
+    if triggered_by != BACKFILL_TRIGGER:
+        return None
+    if daily_collection_active(db):
+        raise task.retry(countdown=settings.backfill_defer_seconds)
+    return JobThrottle.for_backfill()
+
+
+def _start_task(
+    db: Session, run_id: int, task_type: TaskType, complex_id: int, area_id: Optional[int] = None,
+) -> CrawlTask:
+    """단독 실행 태스크의 레코드 생성 (RUNNING)"""
+    task_record = CrawlTask(
+        run_id=run_id,
+        task_key=task_key(task_type, complex_id, area_id),
+        task_type=task_type,
+        complex_id=complex_id,
+        area_id=area_id,
+        status=TaskStatus.RUNNING,
+        started_at=datetime.utcnow(),
+    )
+    db.add(task_record)
     db.commit()
+    return task_record
+
+
+def _worker_connector(connector, run_id: int, throttle: Optional[JobThrottle]):
+    """
+    워커용 커넥터 설정.
+    커넥터 내부 재시도(sleep 대기)는 끄고 태스크 단위로 다시 발행 (_record_failure).
+    KB 요청 직전마다 Run 취소 확인 + 작업별 요청 제한.
+    """
+    connector.max_retries = 1
+
+    def request_gate():
+        raise_if_cancelled(run_id)
+        if throttle is not None:
+            throttle.wait_for_request()
+
+    connector.request_gate = request_gate
+    return connector
+
+
+def _hit_time_limit(error: Optional[BaseException]) -> bool:
+    """묶음 soft time limit 예외인지 (커넥터가 ConnectorError로 감싼 경우 포함)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, SoftTimeLimitExceeded):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _record_failure(task_record: CrawlTask, error: BaseException) -> Dict[str, Any]:
+    """
+    수집 실패 기록 (커밋은 호출 측).
+    재시도할 수 있는 오류면 RETRY + 다음 실행까지 대기 시간, 아니면 FAILED + dead-letter (services.task_retry).
+    묶음이 soft time limit에 걸렸으면 실패가 아니므로 PENDING으로 되돌림 (묶음이 다시 발행, collect_task_chunk).
+    """
+    task_record.error_type = type(error).__name__
+    task_record.error_message = str(error)[:500]
+    if _hit_time_limit(error):
+        task_record.status = TaskStatus.PENDING
+        return {"status": "requeued"}
+    if isinstance(error, CollectionCancelled):
+        # 취소된 Run: 실패가 아니라 시작 전 태스크와 같이 건너뜀 (재시도/dead-letter/수집 상태 반영 없음)
+        task_record.status = TaskStatus.SKIPPED
+        task_record.error_type = CANCELLED_ERROR_TYPE
+        return {"status": "skipped", "reason": "cancelled"}
+
+    retry_count = task_record.retry_count or 0
+    countdown = retry_delay(error, retry_count)
+    if countdown is None:
+        task_record.status = TaskStatus.FAILED
+        mark_dead_letter(task_record)
+        return {"status": "failed", "error": str(error)}
+
+    task_record.status = TaskStatus.RETRY
+    task_record.retry_count = retry_count + 1
+    # 재발행 시각 기준으로 in-flight window에 포함
+    task_record.dispatched_at = datetime.utcnow()
+    return {"status": "retry", "error": str(error), "countdown": countdown}
+
+
+def _dispatch_options(triggered_by: Optional[str], priority) -> Dict[str, Any]:
+    """묶음 발행 큐: backfill Run은 kb_backfill (재개/재시도 포함), 그 외는 단지 우선순위별 큐"""
+    if triggered_by == BACKFILL_TRIGGER:
+        return {"queue": BACKFILL_QUEUE, "priority": BACKFILL_PRIORITY}
+    return collection_options(priority)
+
+
+def _schedule_retry(db: Session, task_record: CrawlTask, countdown: float):
+    """RETRY 태스크를 countdown 뒤 단일 태스크 묶음으로 다시 발행 (원래 Run의 큐/작업 제한 유지)"""
     logger.info(
-        f"Run {run_id} finalized: {run.status.value} "
-        f"(success={success}, failed={failed}, skipped={skipped})"
+        f"Task {task_record.task_key}: {task_record.error_type}, "
+        f"retry {task_record.retry_count}/{settings.collection_task_max_retries} in {countdown:.0f}s"
     )
+    run = db.query(CrawlRun.job_id, CrawlRun.triggered_by).filter(CrawlRun.id == task_record.run_id).first()
+    triggered_by = run.triggered_by if run is not None else None
+    priority = None
+    if triggered_by != BACKFILL_TRIGGER:
+        priority = db.query(Complex.priority).filter(Complex.id == task_record.complex_id).scalar()
+    options = _dispatch_options(triggered_by, priority)
+    collect_task_chunk.apply_async(
+        kwargs={
+            "run_id": task_record.run_id,
+            "task_ids": [task_record.id],
+            "job_id": run.job_id if run is not None else None,
+        },
+        countdown=countdown,
+        **options,
+    )
+
+
+def _record_state(
+    db: Session, task_record: CrawlTask, states: Optional[CollectionStateBatch], payload_hash: Optional[str] = None,
+):
+    """수집 상태 반영: 묶음 실행이면 변경 없음 SKIPPED는 states에 모음, 단독 태스크는 바로 반영"""
+    if states is not None:
+        states.record(task_record, payload_hash=payload_hash)
+    else:
+        record_task_state(db, task_record, payload_hash=payload_hash)
+
+
+def _run_collector(
+    db: Session, collector, task_record: CrawlTask, throttle: Optional[JobThrottle],
+    states: Optional[CollectionStateBatch] = None,
+) -> Dict[str, Any]:
+    """
+    시작된 태스크를 수집기로 실행.
+    다른 Run이 같은 대상을 수집 중이거나 방금 수집했으면 KB 요청 없이 SKIPPED (services.collection_dedup).
+    states가 있으면 변경 없음 SKIPPED의 수집 상태 반영은 모아 두었다가 호출 측에서 flush (묶음 단위).
+    """
+    covering_run_id = claim_collection(task_record)
+    if covering_run_id is not None:
+        mark_covered(db, task_record, covering_run_id)
+        _finalize_run_if_complete(db, task_record.run_id, task_record.status)
+        return {"status": "skipped", "reason": "duplicate", "covered_by_run_id": covering_run_id}
+    try:
+        result = collector(db, task_record, throttle, states)
+    finally:
+        finish_collection(task_record)
+    if result.get("reason") == "cancelled":
+        # 취소 시점 요약에서 수집 중(unfinished)이던 태스크를 취소로 다시 집계 (summarize_run은 멱등)
+        try:
+            summarize_run(db, task_record.run_id)
+        except Exception as e:
+            logger.warning(f"Run {task_record.run_id}: summary refresh after cancel failed: {e}")
+            db.rollback()
+    if result["status"] == "retry":
+        try:
+            _schedule_retry(db, task_record, result["countdown"])
+        except Exception as e:
+            # 다시 발행하지 못하면 Run이 끝나지 않으므로 최종 실패로 기록
+            logger.exception(f"Task {task_record.task_key}: retry dispatch failed: {e}")
+            db.rollback()
+            task_record.status = TaskStatus.FAILED
+            mark_dead_letter(task_record)
+            db.commit()
+            record_task_state(db, task_record)
+            _finalize_run_if_complete(db, task_record.run_id, task_record.status)
+            return {"status": "failed", "error": str(e)}
+    return result
 
 
 class DatabaseTask(Task):
@@ -198,57 +396,49 @@ class DatabaseTask(Task):
 # KB 시세 수집
 # =============================================================================
 
-@celery_app.task(base=DatabaseTask, bind=True)
+@celery_app.task(base=DatabaseTask, bind=True, max_retries=None)
 def collect_kb_price_task(
     self,
     run_id: int,
     complex_id: int,
     area_id: int,
+    job_id: Optional[int] = None,
 ) -> Dict[str, Any]:
-    """단일 단지/면적에 대한 KB 시세 수집 태스크"""
+    """단일 단지/면적에 대한 KB 시세 수집 태스크 (backfill Run이면 일일 수집 중 대기 + backfill 요청 한도)"""
     db = self.db
-    task_key = f"kb_price_{complex_id}_{area_id}"
+    throttle = _backfill_throttle(self, db, run_id) or _acquire_job_slot(self, db, job_id)
+    task_record = _start_task(db, run_id, TaskType.KB_PRICE, complex_id, area_id)
+    try:
+        return _run_collector(db, _collect_price, task_record, throttle)
+    finally:
+        if throttle is not None:
+            throttle.release_slot()
 
-    task_record = CrawlTask(
-        run_id=run_id,
-        task_key=task_key,
-        status=TaskStatus.RUNNING,
-        started_at=datetime.utcnow(),
-    )
-    db.add(task_record)
-    db.commit()
 
-    try:
-        connector = KBPriceConnector(db_session=db)
-        result = connector.collect(complex_id=complex_id, area_id=area_id)
+def _collect_price(
+    db: Session, task_record: CrawlTask, throttle: Optional[JobThrottle],
+    states: Optional[CollectionStateBatch] = None,
+) -> Dict[str, Any]:
+    """KB 시세 수집 실행: 시작된 태스크 레코드 기준, 종료 상태/Run 카운터까지 반영"""
+    run_id = task_record.run_id
+    complex_id = task_record.complex_id
+    area_id = task_record.area_id
+    task_key = task_record.task_key
 
-        items_saved = 0
-        for item in result["items"]:
-            existing = db.query(KBPrice).filter(
-                KBPrice.complex_id == complex_id,
-                KBPrice.area_id == area_id,
-                KBPrice.as_of_date == item["as_of_date"],
-            ).first()
+    try:
+        connector = _worker_connector(KBPriceConnector(db_session=db), run_id, throttle)
+        fingerprint = PayloadFingerprint(db, TaskType.KB_PRICE, complex_id, area_id)
+        result = connector.collect(
+            complex_id=complex_id, area_id=area_id, skip_unchanged=fingerprint.matches,
+        )
+        store_raw_payload(db, task_record.id, result.get("raw"), connector)
+        if result["unchanged"]:
+            task_record.status = TaskStatus.SKIPPED
+            logger.info(f"Task {task_key} skipped: payload unchanged")
+            return {"status": "skipped", "reason": "unchanged"}
 
-            if existing:
-                existing.general_price = item["general_price"]
-                existing.high_avg_price = item["high_avg_price"]
-                existing.low_avg_price = item["low_avg_price"]
-                existing.fetched_at = datetime.utcnow()
-                existing.parser_version = item.get("parser_version")
-            else:
-                db.add(KBPrice(
-                    complex_id=complex_id,
-                    area_id=area_id,
-                    as_of_date=item["as_of_date"],
-                    general_price=item["general_price"],
-                    high_avg_price=item["high_avg_price"],
-                    low_avg_price=item["low_avg_price"],
-                    source=item["source"],
-                    fetched_at=datetime.utcnow(),
-                    parser_version=item.get("parser_version"),
-                ))
-            items_saved += 1
+        # 응답에 담긴 시세 이력 전체 upsert
+        items_saved = upsert_price_series(db, complex_id, area_id, result["items"], fingerprint.digest)
 
         # 최근실거래가 추출 (BasePrcInfoNew 응답에 포함)
         raw_data = result.get("raw")
@@ -277,6 +467,7 @@ def collect_kb_price_task(
                     items_saved += 1
 
         db.commit()
+        fingerprint.remember()
         task_record.status = TaskStatus.SUCCESS
         task_record.items_collected = len(result["items"])
         task_record.items_saved = items_saved
@@ -289,10 +480,7 @@ def collect_kb_price_task(
             db.rollback()
         except Exception:
             pass
-        task_record.status = TaskStatus.FAILED
-        task_record.error_type = type(e).__name__
-        task_record.error_message = str(e)[:500]
-        return {"status": "failed", "error": str(e)}
+        return _record_failure(task_record, e)
 
     finally:
         task_record.finished_at = datetime.utcnow()
@@ -300,35 +488,51 @@ def collect_kb_price_task(
             db.commit()
         except Exception:
             pass
-        _finalize_run_if_complete(db, run_id)
+        _record_state(db, task_record, states)
+        _finalize_run_if_complete(db, run_id, task_record.status)
 
 
 # =============================================================================
 # KB 실거래가 수집
 # =============================================================================
 
-@celery_app.task(base=DatabaseTask, bind=True)
+@celery_app.task(base=DatabaseTask, bind=True, max_retries=None)
 def collect_kb_transaction_task(
     self,
     run_id: int,
     complex_id: int,
+    job_id: Optional[int] = None,
 ) -> Dict[str, Any]:
     """단일 단지에 대한 KB 실거래가 수집 태스크"""
     db = self.db
-    task_key = f"kb_transaction_{complex_id}"
+    throttle = _acquire_job_slot(self, db, job_id)
+    task_record = _start_task(db, run_id, TaskType.KB_TRANSACTION, complex_id)
+    try:
+        return _run_collector(db, _collect_transaction, task_record, throttle)
+    finally:
+        if throttle is not None:
+            throttle.release_slot()
 
-    task_record = CrawlTask(
-        run_id=run_id,
-        task_key=task_key,
-        status=TaskStatus.RUNNING,
-        started_at=datetime.utcnow(),
-    )
-    db.add(task_record)
-    db.commit()
+
+def _collect_transaction(
+    db: Session, task_record: CrawlTask, throttle: Optional[JobThrottle],
+    states: Optional[CollectionStateBatch] = None,
+) -> Dict[str, Any]:
+    """KB 실거래가 수집 실행: 시작된 태스크 레코드 기준, 종료 상태/Run 카운터까지 반영"""
+    run_id = task_record.run_id
+    complex_id = task_record.complex_id
+    task_key = task_record.task_key
+    saved_hash = None
 
     try:
-        connector = KBTransactionConnector(db_session=db)
-        result = connector.collect(complex_id=complex_id)
+        connector = _worker_connector(KBTransactionConnector(db_session=db), run_id, throttle)
+        fingerprint = PayloadFingerprint(db, TaskType.KB_TRANSACTION, complex_id)
+        result = connector.collect(complex_id=complex_id, skip_unchanged=fingerprint.matches)
+        store_raw_payload(db, task_record.id, result.get("raw"), connector)
+        if result["unchanged"]:
+            task_record.status = TaskStatus.SKIPPED
+            logger.info(f"Task {task_key} skipped: payload unchanged")
+            return {"status": "skipped", "reason": "unchanged"}
 
         saved_count = 0
         for item in result["items"]:
@@ -346,6 +550,8 @@ def collect_kb_transaction_task(
             saved_count += 1
 
         db.commit()
+        fingerprint.remember()
+        saved_hash = fingerprint.digest
         task_record.status = TaskStatus.SUCCESS
         task_record.items_collected = len(result["items"])
         task_record.items_saved = saved_count
@@ -358,10 +564,7 @@ def collect_kb_transaction_task(
             db.rollback()
         except Exception:
             pass
-        task_record.status = TaskStatus.FAILED
-        task_record.error_type = type(e).__name__
-        task_record.error_message = str(e)[:500]
-        return {"status": "failed", "error": str(e)}
+        return _record_failure(task_record, e)
 
     finally:
         task_record.finished_at = datetime.utcnow()
@@ -369,35 +572,62 @@ def collect_kb_transaction_task(
             db.commit()
         except Exception:
             pass
-        _finalize_run_if_complete(db, run_id)
+        _record_state(db, task_record, states, payload_hash=saved_hash)
+        _finalize_run_if_complete(db, run_id, task_record.status)
 
 
 # =============================================================================
 # KB 매물 수집
 # =============================================================================
 
-@celery_app.task(base=DatabaseTask, bind=True)
+@celery_app.task(base=DatabaseTask, bind=True, max_retries=None)
 def collect_kb_listing_task(
     self,
     run_id: int,
     complex_id: int,
+    job_id: Optional[int] = None,
 ) -> Dict[str, Any]:
     """단일 단지에 대한 KB 매물 수집 태스크"""
     db = self.db
-    task_key = f"kb_listing_{complex_id}"
+    throttle = _acquire_job_slot(self, db, job_id)
+    task_record = _start_task(db, run_id, TaskType.KB_LISTING, complex_id)
+    try:
+        return _run_collector(db, _collect_listing, task_record, throttle)
+    finally:
+        if throttle is not None:
+            throttle.release_slot()
 
-    task_record = CrawlTask(
-        run_id=run_id,
-        task_key=task_key,
-        status=TaskStatus.RUNNING,
-        started_at=datetime.utcnow(),
-    )
-    db.add(task_record)
-    db.commit()
+
+def _collect_listing(
+    db: Session, task_record: CrawlTask, throttle: Optional[JobThrottle],
+    states: Optional[CollectionStateBatch] = None,
+) -> Dict[str, Any]:
+    """KB 매물 수집 실행: 시작된 태스크 레코드 기준, 종료 상태/Run 카운터까지 반영"""
+    run_id = task_record.run_id
+    complex_id = task_record.complex_id
+    task_key = task_record.task_key
+    saved_hash = None
 
     try:
-        connector = KBListingConnector(db_session=db)
-        result = connector.collect(complex_id=complex_id)
+        connector = _worker_connector(KBListingConnector(db_session=db), run_id, throttle)
+        fingerprint = PayloadFingerprint(db, TaskType.KB_LISTING, complex_id)
+        probe = ListingProbe(db, complex_id)
+        result = connector.collect(complex_id=complex_id, skip_unchanged=fingerprint.matches, probe=probe)
+        # 증분 수집 원문은 일부 페이지만 담김 (재파싱 시 매물 제거 판단에서 제외)
+        store_raw_payload(
+            db, task_record.id, result.get("raw"), connector, partial=not probe.complete,
+        )
+        record_requests_avoided(db, run_id, probe.requests_avoided)
+        if result["unchanged"]:
+            task_record.status = TaskStatus.SKIPPED
+            # 파싱은 건너뛰어도 매물이 그대로 게시 중임은 확인됨 (커밋은 finally에서)
+            touch_active_listings(db, complex_id)
+            if result["metadata"].get("probe") == "unchanged":
+                logger.info(f"Task {task_key} skipped: listing probe unchanged")
+                return {"status": "skipped", "reason": "probe_unchanged"}
+            probe.remember()
+            logger.info(f"Task {task_key} skipped: payload unchanged")
+            return {"status": "skipped", "reason": "unchanged"}
 
         saved_count = 0
         seen_ids = set()
@@ -431,8 +661,8 @@ def collect_kb_listing_task(
                 db.add(listing)
             saved_count += 1
 
-        # 이번에 안 보인 기존 ACTIVE 매물 → REMOVED
-        if seen_ids:
+        # 이번에 안 보인 기존 ACTIVE 매물 → REMOVED (전체 수집일 때만)
+        if seen_ids and probe.complete:
             stale_listings = db.query(Listing).filter(
                 Listing.complex_id == complex_id,
                 Listing.status == ListingStatus.ACTIVE,
@@ -441,8 +671,18 @@ def collect_kb_listing_task(
             for stale in stale_listings:
                 stale.status = ListingStatus.REMOVED
                 stale.status_updated_at = datetime.utcnow()
+        elif seen_ids:
+            # 증분 수집: 건수 대조로 삭제가 없음이 확인됨 → 나머지 ACTIVE 매물도 확인 시각 갱신
+            db.query(Listing).filter(
+                Listing.complex_id == complex_id,
+                Listing.status == ListingStatus.ACTIVE,
+                Listing.source_listing_id.notin_(seen_ids),
+            ).update({Listing.last_seen_at: datetime.utcnow()}, synchronize_session=False)
 
         db.commit()
+        fingerprint.remember()
+        probe.remember()
+        saved_hash = fingerprint.digest
         task_record.status = TaskStatus.SUCCESS
         task_record.items_collected = len(result["items"])
         task_record.items_saved = saved_count
@@ -455,10 +695,81 @@ def collect_kb_listing_task(
             db.rollback()
         except Exception:
             pass
-        task_record.status = TaskStatus.FAILED
-        task_record.error_type = type(e).__name__
-        task_record.error_message = str(e)[:500]
-        return {"status": "failed", "error": str(e)}
+        return _record_failure(task_record, e)
+
+    finally:
+        task_record.finished_at = datetime.utcnow()
+        try:
+            db.commit()
+        except Exception:
+            pass
+        _record_state(db, task_record, states, payload_hash=saved_hash)
+        _finalize_run_if_complete(db, run_id, task_record.status)
+
+
+# =============================================================================
+# KB 과거 실거래 수집 (연도별, backfill)
+# =============================================================================
+
+def _collect_transaction_history(
+    db: Session, task_record: CrawlTask, throttle: Optional[JobThrottle],
+    states: Optional[CollectionStateBatch] = None,
+) -> Dict[str, Any]:
+    """KB 연도별 과거 실거래 수집 실행: 시작된 태스크 레코드 기준, 종료 상태/Run 카운터까지 반영"""
+    run_id = task_record.run_id
+    complex_id = task_record.complex_id
+    area_id = task_record.area_id
+    task_key = task_record.task_key
+    saved_hash = None
+
+    try:
+        connector = _worker_connector(KBTransactionHistoryConnector(db_session=db), run_id, throttle)
+        fingerprint = PayloadFingerprint(db, TaskType.KB_TRANSACTION_HISTORY, complex_id, area_id)
+        result = connector.collect(complex_id=complex_id, area_id=area_id, skip_unchanged=fingerprint.matches)
+        store_raw_payload(db, task_record.id, result.get("raw"), connector)
+        if result["unchanged"]:
+            task_record.status = TaskStatus.SKIPPED
+            logger.info(f"Task {task_key} skipped: payload unchanged")
+            return {"status": "skipped", "reason": "unchanged"}
+
+        # 전용면적이 없는 과거 거래는 요청한 면적 기준
+        area_obj = db.get(Area, area_id)
+        area_m2 = area_obj.exclusive_m2 if area_obj else None
+        now = datetime.utcnow()
+        rows = {}
+        for item in result["items"]:
+            exclusive_m2 = item.get("exclusive_m2") or area_m2
+            if not exclusive_m2:
+                continue
+            key = (complex_id, item["contract_date"], item["price"], exclusive_m2, item.get("floor"))
+            rows[key] = {
+                "complex_id": complex_id,
+                "contract_date": item["contract_date"],
+                "price": item["price"],
+                "exclusive_m2": exclusive_m2,
+                "floor": item.get("floor"),
+                "is_cancelled": item.get("is_cancelled", False),
+                "source": "kb",
+                "fetched_at": now,
+            }
+        saved_count = insert_new_transactions(db, list(rows.values()))
+
+        db.commit()
+        fingerprint.remember()
+        saved_hash = fingerprint.digest
+        task_record.status = TaskStatus.SUCCESS
+        task_record.items_collected = len(result["items"])
+        task_record.items_saved = saved_count
+        logger.info(f"Task {task_key} completed: {len(result['items'])} deals, {saved_count} new")
+        return {"status": "success", "items_collected": len(result["items"]), "items_saved": saved_count}
+
+    except BaseException as e:
+        logger.exception(f"Task {task_key} failed: {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        return _record_failure(task_record, e)
 
     finally:
         task_record.finished_at = datetime.utcnow()
@@ -466,25 +777,184 @@ def collect_kb_listing_task(
             db.commit()
         except Exception:
             pass
-        _finalize_run_if_complete(db, run_id)
+        _record_state(db, task_record, states, payload_hash=saved_hash)
+        _finalize_run_if_complete(db, run_id, task_record.status)
 
 
 # =============================================================================
 # KB 통합 수집 (시세 + 최근실거래가)
 # =============================================================================
 
+def _dispatch_due_collections(
+    db: Session, run: CrawlRun, complexes: List[Complex], force: bool, scope: str,
+) -> int:
+    """
+    수집 예정 시각이 지난 (단지, 유형)을 PENDING 태스크로 기록하고 첫 window만큼 발행.
+    나머지는 묶음이 끝날 때마다 보충 (services.run_dispatch). 전체 태스크 수를 반환.
+    """
+    due = due_task_types(
+        db, [c.id for c in complexes], (TaskType.KB_PRICE, TaskType.KB_LISTING), force=force,
+    )
+    log_due_summary(scope, len(complexes), due, force)
+
+    # 단지 우선순위 순으로 기록 → 태스크 id 순서대로 발행
+    targets = []
+    for complex_obj in by_collection_priority(complexes):
+        task_types = due.get(complex_obj.id)
+        if not task_types:
+            continue
+
+        if TaskType.KB_PRICE in task_types:
+            # 면적이 없으면 KB API에서 자동 조회
+            areas = complex_obj.areas or ensure_complex_areas(db, complex_obj)
+
+            # 시세 (면적별) — BasePrcInfoNew에서 시세 + 최근실거래가 동시 추출
+            targets.extend((TaskType.KB_PRICE, complex_obj.id, area.id) for area in areas)
+
+        # 매물 수집 (단지별)
+        if TaskType.KB_LISTING in task_types:
+            targets.append((TaskType.KB_LISTING, complex_obj.id, None))
+
+    db.commit()
+    total_tasks = plan_run_tasks(db, run.id, targets)
+    run.total_tasks = total_tasks
+    if total_tasks == 0:
+        # 수집할 대상이 없으면 바로 종료
+        run.status = RunStatus.SUCCESS
+        run.finished_at = datetime.utcnow()
+    db.commit()
+
+    _top_up_run(db, run.id)
+    return total_tasks
+
+
+def _top_up_run(db: Session, run_id: int) -> int:
+    """in-flight window의 빈 자리만큼 PENDING 태스크를 묶음 메시지로 발행하고 발행한 태스크 수를 반환"""
+    try:
+        job_id, claimed = claim_dispatch_batch(db, run_id)
+    except Exception as e:
+        logger.exception(f"Run {run_id}: dispatch top-up failed: {e}")
+        db.rollback()
+        return 0
+    if not claimed:
+        return 0
+
+    # 단지 우선순위별 큐로 나눠 묶음 발행 (backfill Run은 전부 kb_backfill)
+    triggered_by = db.query(CrawlRun.triggered_by).filter(CrawlRun.id == run_id).scalar()
+    if triggered_by == BACKFILL_TRIGGER:
+        priorities = {}
+    else:
+        priorities = dict(
+            db.query(Complex.id, Complex.priority)
+            .filter(Complex.id.in_({row.complex_id for row in claimed}))
+            .all()
+        )
+    by_priority: Dict[Any, List[int]] = {}
+    for row in claimed:
+        by_priority.setdefault(priorities.get(row.complex_id), []).append(row.id)
+
+    # 묶음마다 예상 소요 시간이 soft time limit보다 충분히 짧도록 나눔
+    backfill_rate = settings.backfill_rate_limit_per_minute if triggered_by == BACKFILL_TRIGGER else None
+    estimates = estimate_task_seconds(db, job_id, claimed, backfill_rate)
+    for priority, task_ids in by_priority.items():
+        options = _dispatch_options(triggered_by, priority)
+        for chunk in split_by_duration(task_ids, estimates):
+            collect_task_chunk.apply_async(
+                kwargs={"run_id": run_id, "task_ids": chunk, "job_id": job_id},
+                **options,
+            )
+    logger.info(f"Run {run_id}: dispatched {len(claimed)} tasks")
+    return len(claimed)
+
+
+_CHUNK_COLLECTORS = {
+    TaskType.KB_PRICE: _collect_price,
+    TaskType.KB_TRANSACTION: _collect_transaction,
+    TaskType.KB_LISTING: _collect_listing,
+    TaskType.KB_TRANSACTION_HISTORY: _collect_transaction_history,
+}
+
+
+@celery_app.task(base=DatabaseTask, bind=True, max_retries=None)
+def collect_task_chunk(
+    self, run_id: int, task_ids: List[int], job_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    미리 기록된 PENDING 태스크 묶음(재시도면 RETRY 태스크 하나)을 순서대로 실행.
+    작업 슬롯은 묶음 단위로 하나만 사용, 끝나면 window 보충.
+    원문 변경 없음(SKIPPED) 태스크의 수집 상태 반영은 묶음 끝에 여러 행 upsert 한 번으로.
+    이미 시작/종료된 태스크는 건너뜀 (메시지 중복 전달 대비).
+    묶음 수집기가 없는 유형의 태스크는 시작하지 않고 SKIPPED로 종료 (Run 카운터 반영, Run이 멈추지 않도록).
+    soft time limit에 걸리면 실행 중이던 태스크와 남은 태스크를 발행 전 상태로 되돌리고 보충에서 새 묶음으로 발행.
+    backfill Run의 재시도 묶음은 단독 시세 태스크와 같이 일일 수집 중 대기 + backfill 요청 한도.
+    """
+    db = self.db
+    throttle = _backfill_throttle(self, db, run_id) or _acquire_job_slot(self, db, job_id)
+    states = CollectionStateBatch(db)
+    statuses: Dict[str, int] = {}
+    index = 0
+    running_id = None
+    try:
+        task_types = planned_task_types(db, task_ids)
+        for index, task_id in enumerate(task_ids):
+            # 수집기부터 확인: RUNNING으로 바꾼 뒤 실행하지 못하면 Run이 끝나지 않음
+            collector = _CHUNK_COLLECTORS.get(task_types.get(task_id))
+            if collector is None:
+                task_type = task_types.get(task_id)
+                if skip_planned_task(db, task_id, UNSUPPORTED_ERROR_TYPE, f"unsupported task type {task_type}"):
+                    logger.warning(f"Task {task_id}: unsupported task type {task_type}, skipped")
+                    _finalize_run_if_complete(db, run_id, TaskStatus.SKIPPED)
+                    statuses["skipped"] = statuses.get("skipped", 0) + 1
+                else:
+                    statuses["not_started"] = statuses.get("not_started", 0) + 1
+                continue
+            task_record = start_planned_task(db, task_id)
+            if task_record is None:
+                # 이미 시작/종료됨 (중복 전달, 취소로 SKIPPED)
+                statuses["not_started"] = statuses.get("not_started", 0) + 1
+                continue
+            running_id = task_id
+            result = _run_collector(db, collector, task_record, throttle, states)
+            if result["status"] == "requeued":
+                raise SoftTimeLimitExceeded()
+            running_id = None
+            status = "cancelled" if result.get("reason") == "cancelled" else result["status"]
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "cancelled":
+                # 남은 태스크는 취소 시 SKIPPED로 정리됨 (cancel_run)
+                statuses["not_started"] = statuses.get("not_started", 0) + len(task_ids) - index - 1
+                break
+    except SoftTimeLimitExceeded:
+        db.rollback()
+        released = release_tasks(db, task_ids[index:], running_task_id=running_id)
+        logger.warning(f"Run {run_id}: chunk hit soft time limit, released {released} tasks for re-dispatch")
+        statuses["released"] = released
+    finally:
+        # 변경 없음 SKIPPED의 확인 시각은 묶음 단위로 한 번에 반영
+        states.flush()
+        if throttle is not None:
+            throttle.release_slot()
+        _top_up_run(db, run_id)
+
+    return {"run_id": run_id, "tasks": len(task_ids), **statuses}
+
+
 @celery_app.task(base=DatabaseTask, bind=True)
 def run_kb_collection(
-    self, job_id: int = None, run_id: int = None, target_config: str = None,
+    self, job_id: int = None, run_id: int = None, target_config: str = None, force: bool = False,
 ) -> Dict[str, Any]:
     """
     KB 데이터 통합 수집.
     각 단지마다 시세(면적별) 수집 — BasePrcInfoNew에서 시세 + 최근실거래가 동시 추출.
+    수집 예정 시각이 지난 (단지, 유형)만 수집 (force=True면 전체).
     """
     db = self.db
 
     if run_id:
         run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+        if run.status == RunStatus.CANCELLED:
+            # 시작 전에 취소된 Run
+            return {"run_id": run.id, "status": "cancelled"}
         run.status = RunStatus.RUNNING
         run.started_at = datetime.utcnow()
     else:
@@ -498,38 +968,15 @@ def run_kb_collection(
 
     # target_config가 없으면 job에서 가져오기
     if not target_config and job_id:
-        from models import CrawlJob
         j = db.query(CrawlJob).filter(CrawlJob.id == job_id).first()
         if j:
             target_config = j.target_config
 
     try:
         complexes = _get_target_complexes(db, target_config)
-
-        total_tasks = 0
-        for complex_obj in complexes:
-            # 면적이 없으면 KB API에서 자동 조회
-            areas = complex_obj.areas or ensure_complex_areas(db, complex_obj)
-
-            # 시세 (면적별) — BasePrcInfoNew에서 시세 + 최근실거래가 동시 추출
-            for area in areas:
-                collect_kb_price_task.delay(
-                    run_id=run.id,
-                    complex_id=complex_obj.id,
-                    area_id=area.id,
-                )
-                total_tasks += 1
-
-            # 매물 수집 (단지별)
-            collect_kb_listing_task.delay(
-                run_id=run.id,
-                complex_id=complex_obj.id,
-            )
-            total_tasks += 1
-
-        db.commit()
-        run.total_tasks = total_tasks
-        db.commit()
+        total_tasks = _dispatch_due_collections(db, run, complexes, force, f"Run {run.id}")
+        # total 설정 전에 모든 태스크가 끝난 경우 대비
+        _on_run_finalized(run.id, try_finalize_run(db, run.id))
 
         logger.info(f"Run {run.id}: Launched {total_tasks} tasks for {len(complexes)} complexes")
         return {"run_id": run.id, "total_tasks": total_tasks, "complexes_count": len(complexes)}
@@ -542,6 +989,214 @@ def run_kb_collection(
         raise
 
 
+@celery_app.task(base=DatabaseTask, bind=True)
+def resume_run_task(self, run_id: int) -> Dict[str, Any]:
+    """재개한 Run(services.run_dispatch.reset_for_resume)의 PENDING 태스크 발행"""
+    db = self.db
+    dispatched = _top_up_run(db, run_id)
+    _on_run_finalized(run_id, try_finalize_run(db, run_id))
+    return {"run_id": run_id, "dispatched": dispatched}
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def top_up_stalled_runs(self) -> Dict[str, Any]:
+    """
+    발행 후 시작되지 않은 채 멈춘 PENDING 태스크가 있는 Run 보충 (beat).
+    강제 종료된 묶음이 Run의 마지막 in-flight 묶음이면 window 보충을 호출할 묶음이 남지 않음.
+    """
+    db = self.db
+    dispatched = {}
+    for run_id in runs_with_stale_dispatch(db):
+        dispatched[run_id] = _top_up_run(db, run_id)
+    if dispatched:
+        logger.info(f"Re-dispatched stalled tasks: {dispatched}")
+    return {"runs": dispatched}
+
+
+# =============================================================================
+# dead-letter 재실행
+# =============================================================================
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def replay_dead_letters_task(self, run_id: int, task_ids: List[int]) -> Dict[str, Any]:
+    """dead-letter 태스크의 대상을 새 Run의 PENDING 태스크로 기록하고 발행 (재시도 횟수는 0부터)"""
+    db = self.db
+    run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+    if run is None:
+        # 발행 후 Run이 삭제됨 (dead-letter는 그대로 유지)
+        logger.warning(f"Run {run_id} not found, skip dead-letter replay")
+        return {"run_id": run_id, "status": "not_found"}
+    if run.status == RunStatus.CANCELLED:
+        # 시작 전에 취소된 Run (dead-letter는 그대로 유지)
+        return {"run_id": run.id, "status": "cancelled"}
+    run.status = RunStatus.RUNNING
+    run.started_at = datetime.utcnow()
+
+    targets = take_dead_letters(db, task_ids)
+    total_tasks = plan_run_tasks(db, run.id, targets)
+    run.total_tasks = total_tasks
+    if total_tasks == 0:
+        # 다른 요청이 먼저 재실행한 경우
+        run.status = RunStatus.SUCCESS
+        run.finished_at = datetime.utcnow()
+    db.commit()
+
+    _top_up_run(db, run.id)
+    _on_run_finalized(run.id, try_finalize_run(db, run.id))
+    logger.info(f"Run {run.id}: replaying {total_tasks} dead-lettered tasks")
+    return {"run_id": run.id, "total_tasks": total_tasks}
+
+
+# =============================================================================
+# 시세 이력 backfill
+# =============================================================================
+
+def _dispatch_backfill(db: Session, targets: List[DispatchTarget]) -> CrawlRun:
+    """
+    backfill 대상을 새 Run의 PENDING 태스크로 기록하고 첫 window만큼 kb_backfill 큐로 발행.
+    일반 Run과 같이 나머지는 묶음이 끝날 때마다 보충 (broker 메시지 수가 대상 수와 무관).
+    """
+    run = CrawlRun(status=RunStatus.RUNNING, started_at=datetime.utcnow(), triggered_by=BACKFILL_TRIGGER)
+    db.add(run)
+    db.commit()
+
+    run.total_tasks = plan_run_tasks(db, run.id, targets)
+    if run.total_tasks == 0:
+        run.status = RunStatus.SUCCESS
+        run.finished_at = datetime.utcnow()
+    db.commit()
+
+    _top_up_run(db, run.id)
+    _on_run_finalized(run.id, try_finalize_run(db, run.id))
+    return run
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def backfill_price_history(
+    self, complex_ids: Optional[List[int]] = None, region_code: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    시세 이력이 없는 면적만 골라 면적당 시세 요청 1회로 이력 전체를 채움.
+    (BasePrcInfoNew 응답의 시세 배열 전체를 저장하므로 추가 요청 없음)
+    면적별 태스크를 기록하고 묶음으로 발행 (_dispatch_backfill).
+    대상: complex_ids 또는 region_code 지역의 활성 단지, 둘 다 없으면 전체 활성 단지.
+    """
+    db = self.db
+
+    complex_query = db.query(Complex).filter(Complex.is_active.is_(True))
+    if complex_ids:
+        complex_query = complex_query.filter(Complex.id.in_(complex_ids))
+    if region_code:
+        complex_query = complex_query.filter(Complex.region_code.like(f"{region_code[:5]}%"))
+
+    # 새로 발견된 단지는 면적이 없으므로 먼저 KB API에서 조회
+    for complex_obj in complex_query.filter(~Complex.areas.any()).all():
+        ensure_complex_areas(db, complex_obj)
+
+    areas = (
+        db.query(Area)
+        .filter(Area.complex_id.in_(complex_query.with_entities(Complex.id)))
+        .filter(~db.query(KBPrice.id).filter(KBPrice.area_id == Area.id).exists())
+        .all()
+    )
+
+    run = _dispatch_backfill(db, [(TaskType.KB_PRICE, area.complex_id, area.id) for area in areas])
+
+    logger.info(f"Price history backfill run {run.id}: {len(areas)} areas without history")
+    return {"run_id": run.id, "total_tasks": len(areas)}
+
+
+# =============================================================================
+# 실거래 이력 backfill (kb_backfill 큐)
+# =============================================================================
+
+@celery_app.task(base=DatabaseTask, bind=True, max_retries=None)
+def collect_kb_transaction_history_task(
+    self,
+    run_id: int,
+    complex_id: int,
+    area_id: int,
+) -> Dict[str, Any]:
+    """
+    단일 단지/면적의 연도별 과거 실거래 backfill.
+    일일 수집 Run이 진행 중이면 요청하지 않고 settings.backfill_defer_seconds 후 재시도 + backfill 요청 한도.
+    """
+    db = self.db
+    throttle = _backfill_throttle(self, db, run_id)
+    task_record = _start_task(db, run_id, TaskType.KB_TRANSACTION_HISTORY, complex_id, area_id)
+    try:
+        return _run_collector(db, _collect_transaction_history, task_record, throttle)
+    finally:
+        if throttle is not None:
+            throttle.release_slot()
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def backfill_transaction_history(
+    self, complex_ids: Optional[List[int]] = None, region_code: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    실거래 이력 backfill이 끝나지 않은 면적마다 연도별 실거래 태스크를 기록하고 묶음으로 발행 (_dispatch_backfill).
+    대상: complex_ids 또는 region_code 지역의 활성 단지, 둘 다 없으면 전체 활성 단지.
+    이미 성공(SUCCESS/SKIPPED)한 이력 태스크가 있는 면적은 제외.
+    """
+    db = self.db
+
+    complex_query = db.query(Complex).filter(Complex.is_active.is_(True))
+    if complex_ids:
+        complex_query = complex_query.filter(Complex.id.in_(complex_ids))
+    if region_code:
+        complex_query = complex_query.filter(Complex.region_code.like(f"{region_code[:5]}%"))
+
+    # 새로 발견된 단지는 면적이 없으므로 먼저 KB API에서 조회
+    for complex_obj in complex_query.filter(~Complex.areas.any()).all():
+        ensure_complex_areas(db, complex_obj)
+
+    done_areas = db.query(CrawlTask.area_id).filter(
+        CrawlTask.task_type == TaskType.KB_TRANSACTION_HISTORY,
+        CrawlTask.status.in_([TaskStatus.SUCCESS, TaskStatus.SKIPPED]),
+        CrawlTask.area_id.isnot(None),
+    )
+    targets = (
+        db.query(Area.complex_id, Area.id)
+        .filter(Area.complex_id.in_(complex_query.with_entities(Complex.id)))
+        .filter(Area.id.notin_(done_areas))
+        .all()
+    )
+
+    run = _dispatch_backfill(
+        db, [(TaskType.KB_TRANSACTION_HISTORY, complex_id, area_id) for complex_id, area_id in targets],
+    )
+
+    logger.info(f"Transaction history backfill run {run.id}: {len(targets)} areas")
+    return {"run_id": run.id, "total_tasks": len(targets)}
+
+
+# =============================================================================
+# 평단가 집계 갱신
+# =============================================================================
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def finalize_run_task(self, run_id: int, refresh_rollups: bool = False) -> Dict[str, Any]:
+    """
+    Run 종료 콜백: 태스크 결과를 한 번의 집계 쿼리로 error_summary / quality_warnings에 기록하고,
+    성공 태스크가 있으면 이번 Run에서 갱신된 (단지, 월) 버킷만 평단가 집계 재계산.
+    """
+    summary = summarize_run(self.db, run_id)
+    if refresh_rollups:
+        refresh_price_rollups_task.delay(run_id=run_id)
+    return {"run_id": run_id, **summary}
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def refresh_price_rollups_task(self, run_id: int) -> Dict[str, Any]:
+    """Run 완료 후 영향받은 월별 평단가 집계 버킷 재계산"""
+    from services.price_rollup import refresh_rollups_for_run
+
+    refreshed = refresh_rollups_for_run(self.db, run_id)
+    return {"run_id": run_id, "buckets_refreshed": refreshed}
+
+
 # =============================================================================
 # 지역 기반 단지 발견 / 전체 수집
 # =============================================================================
@@ -559,6 +1214,10 @@ def discover_complexes_task(self, region_code: str) -> Dict[str, Any]:
         f"Discovery for region {region_code}: "
         f"{result['new_registered']} new, {result['already_exists']} existing"
     )
+    # 새로 등록된 단지는 시세/실거래 이력 backfill
+    if result.get("new_registered"):
+        backfill_price_history.delay(region_code=region_code)
+        backfill_transaction_history.delay(region_code=region_code)
     return result
 
 
@@ -568,17 +1227,22 @@ def run_region_collection(
     region_code: str,
     job_id: int = None,
     run_id: int = None,
+    force: bool = False,
 ) -> Dict[str, Any]:
     """
     지역 기반 전체 수집:
     1. 단지 발견 (미등록 단지 자동 추가)
     2. 시세 수집 (단지별/면적별) — BasePrcInfoNew에서 시세 + 최근실거래가 동시 추출
+       수집 예정 시각이 지난 (단지, 유형)만 수집 (force=True면 전체)
     """
     db = self.db
 
     # 기존 run 사용 또는 신규 생성
     if run_id:
         run = db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+        if run.status == RunStatus.CANCELLED:
+            # 시작 전에 취소된 Run
+            return {"run_id": run.id, "status": "cancelled"}
         run.status = RunStatus.RUNNING
     else:
         run = CrawlRun(
@@ -614,28 +1278,11 @@ def run_region_collection(
         }
 
     # Step 3: 태스크 실행
-    total_tasks = 0
-    for complex_obj in complexes:
-        # 면적이 없으면 KB API에서 자동 조회
-        areas = complex_obj.areas or ensure_complex_areas(db, complex_obj)
-
-        for area in areas:
-            collect_kb_price_task.delay(
-                run_id=run.id,
-                complex_id=complex_obj.id,
-                area_id=area.id,
-            )
-            total_tasks += 1
-
-        # 매물 수집 (단지별)
-        collect_kb_listing_task.delay(
-            run_id=run.id,
-            complex_id=complex_obj.id,
-        )
-        total_tasks += 1
-
-    run.total_tasks = total_tasks
-    db.commit()
+    total_tasks = _dispatch_due_collections(
+        db, run, complexes, force, f"Region {region_code} run {run.id}",
+    )
+    # total 설정 전에 모든 태스크가 끝난 경우 대비
+    _on_run_finalized(run.id, try_finalize_run(db, run.id))
 
     logger.info(
         f"Region collection for {region_code}: "
@@ -648,3 +1295,61 @@ def run_region_collection(
         "total_tasks": total_tasks,
         "complexes_count": len(complexes),
     }
+
+
+# =============================================================================
+# 정기 실행 (beat)
+# =============================================================================
+
+# 이 시간 안에 시작해 아직 RUNNING인 Run이 있으면 이번 정기 실행은 건너뜀
+_SCHEDULED_OVERLAP_HOURS = 6
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def run_scheduled_job(self, job_id: int) -> Dict[str, Any]:
+    """
+    beat(DatabaseScheduler)가 cron_schedule에 맞춰 호출.
+    작업 상태를 다시 확인하고 Run을 만든 뒤 유형에 맞는 수집 태스크 실행.
+    - region_all + region_code: run_region_collection (단지 발견 포함)
+    - 그 외 (시/도 배치 sido_code, complex_ids, 전체): run_kb_collection
+    """
+    db = self.db
+    job = db.query(CrawlJob).filter(CrawlJob.id == job_id).first()
+    if not job or job.status != JobStatus.ACTIVE or not job.cron_schedule:
+        logger.info(f"Scheduled job {job_id}: not active or unscheduled, skip")
+        return {"job_id": job_id, "skipped": "inactive"}
+
+    since = datetime.utcnow() - timedelta(hours=_SCHEDULED_OVERLAP_HOURS)
+    running = db.query(CrawlRun.id).filter(
+        CrawlRun.job_id == job.id,
+        CrawlRun.status.in_([RunStatus.PENDING, RunStatus.RUNNING]),
+        CrawlRun.started_at >= since,
+    ).first()
+    if running:
+        logger.info(f"Scheduled job {job_id}: run {running.id} still in progress, skip")
+        return {"job_id": job_id, "skipped": "in_progress", "run_id": running.id}
+
+    run = CrawlRun(
+        job_id=job.id,
+        status=RunStatus.PENDING,
+        started_at=datetime.utcnow(),
+        triggered_by=SCHEDULE_TRIGGER,
+    )
+    db.add(run)
+    db.commit()
+
+    config = {}
+    if job.target_config:
+        try:
+            config = json.loads(job.target_config)
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    region_code = config.get("region_code")
+    if job.job_type == JobType.REGION_ALL and region_code:
+        task = run_region_collection.delay(region_code=region_code, job_id=job.id, run_id=run.id)
+    else:
+        task = run_kb_collection.delay(job_id=job.id, run_id=run.id, target_config=job.target_config)
+
+    logger.info(f"Scheduled job {job_id} ({job.name}): run {run.id} started")
+    return {"job_id": job_id, "run_id": run.id, "task_id": task.id}
@@ -0,0 +1,4 @@
+#!/bin/sh
+# primary 최초 기동 시 스트리밍 복제 허용 (postgres-replica 서비스용)
+set -e
+echo "host replication all all md5" >> "$PGDATA/pg_hba.conf"